@@ -1,10 +1,11 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from core.admin import ScalableAdminMixin
 from .models import User
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(ScalableAdminMixin, BaseUserAdmin):
     """
     Administration personnalisée pour le modèle User
     """
@@ -21,6 +22,9 @@ class UserAdmin(BaseUserAdmin):
     
     list_display = ('username', 'email', 'first_name', 'last_name', 'age', 'is_staff')
     list_filter = BaseUserAdmin.list_filter + ('can_be_contacted', 'can_data_be_shared')
+    # Recherche par préfixe du nom d'utilisateur (index unique), aussi utilisée
+    # par les champs d'autocomplétion des autres administrations
+    search_fields = ('^username',)
     
     def age(self, obj):
         return obj.age
@@ -0,0 +1,107 @@
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from core.db import delete_in_chunks
+from core.routers import on_shard
+from core.sharding import fan_out
+from projects.models import (
+    Project, Contributor, Issue, Comment, ArchivedIssue, ArchivedComment, IssueSimilarityBucket, ProjectLocation,
+)
+from projects.sharding import invalidate_location, shard_aliases
+from projects.stats import invalidate_project_stats
+from .models import User
+
+
+def count_user_issues(user):
+    """Issues de l'utilisateur ou de ses projets, toutes partitions confondues"""
+    owned = Q(author=user) | Q(project__author=user)
+    return sum(fan_out(lambda alias: Issue.objects.using(alias).filter(owned).count(), shard_aliases()).values())
+
+
+def erase_user(user, chunk_size=None, progress=None, atomic=True):
+    """
+    Supprime un utilisateur et toutes ses données (droit à l'oubli RGPD).
+
+    Le périmètre de la cascade est calculé par des requêtes ensemblistes puis
+    supprimé par lots bornés, dans une transaction (sauf atomic=False, où
+    chaque lot est validé séparément) : commentaires, issues,
+    contributions et projets de l'utilisateur (ou rattachés à ses projets),
+    archives comprises. Les issues qui lui sont seulement assignées sont
+    conservées et désassignées en un seul UPDATE. Avec des partitions, chacune
+    est traitée dans sa propre transaction, puis l'annuaire et l'utilisateur
+    sur la base principale. progress(étape, nombre) est appelé après chaque étape.
+
+    Retourne le nombre de lignes supprimées ou modifiées par étape.
+    """
+    chunk_size = chunk_size or settings.DELETION_CHUNK_SIZE
+    report = {}
+
+    def step(name, count):
+        # Cumulé sur les partitions
+        report[name] = report.get(name, 0) + count
+        if progress is not None:
+            progress(name, report[name])
+
+    touched_projects, authored_projects = set(), []
+
+    # Données de projets : sur chaque partition (la base principale seule sans partitionnement)
+    for alias in shard_aliases():
+        with on_shard(alias), transaction.atomic(using=alias) if atomic else nullcontext():
+            # Projets d'autres auteurs touchés par la suppression (cache des statistiques)
+            touched_projects |= set(
+                Issue.objects.filter(Q(author=user) | Q(assignee=user))
+                .exclude(project__author=user)
+                .values_list('project_id', flat=True).distinct()
+            ) | set(
+                Comment.objects.filter(author=user)
+                .exclude(issue__project__author=user)
+                .values_list('issue__project_id', flat=True).distinct()
+            )
+
+            step('unassigned_issues', Issue.objects.filter(assignee=user).exclude(
+                Q(author=user) | Q(project__author=user)
+            ).update(assignee=None))
+
+            step('comments', delete_in_chunks(Comment.objects.filter(
+                Q(author=user) | Q(issue__author=user) | Q(issue__project__author=user)
+            ), chunk_size))
+            step('similarity_buckets', delete_in_chunks(IssueSimilarityBucket.objects.filter(
+                Q(issue__author=user) | Q(project__author=user)
+            ), chunk_size))
+            step('issues', delete_in_chunks(Issue.objects.filter(
+                Q(author=user) | Q(project__author=user)
+            ), chunk_size))
+
+            ArchivedIssue.objects.filter(assignee=user).exclude(
+                Q(author=user) | Q(project__author=user)
+            ).update(assignee=None)
+            step('archived_comments', delete_in_chunks(ArchivedComment.objects.filter(
+                Q(author=user) | Q(issue__author=user) | Q(issue__project__author=user)
+            ), chunk_size))
+            step('archived_issues', delete_in_chunks(ArchivedIssue.objects.filter(
+                Q(author=user) | Q(project__author=user)
+            ), chunk_size))
+            step('contributors', delete_in_chunks(Contributor.objects.filter(
+                Q(user=user) | Q(project__author=user)
+            ), chunk_size))
+
+            authored_projects += Project.objects.filter(author=user).values_list('id', flat=True)
+            step('projects', delete_in_chunks(Project.objects.filter(author=user), chunk_size))
+            if alias != 'default':
+                # Copie de l'utilisateur (recopiée pour les clés étrangères)
+                User.objects.using(alias).filter(pk=user.pk)._raw_delete(alias)
+
+    # Projets supprimés : retirés de l'annuaire (avec leurs appartenances)
+    ProjectLocation.objects.filter(pk__in=authored_projects).delete()
+    invalidate_location(*authored_projects)
+
+    with transaction.atomic() if atomic else nullcontext():
+        # Il ne reste que les relations légères (groupes, permissions, journal d'administration)
+        user.delete()
+        step('user', 1)
+
+    invalidate_project_stats(*touched_projects, *authored_projects)
+    return report
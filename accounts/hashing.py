@@ -0,0 +1,68 @@
+from functools import lru_cache
+from threading import BoundedSemaphore
+
+from django.conf import settings
+from django.contrib.auth.hashers import identify_hasher, get_hasher, make_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingUnavailable(APIException):
+    """Trop de calculs de mots de passe en attente : la requête est refusée rapidement"""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Service momentanément surchargé, veuillez réessayer."
+    default_code = 'hashing_unavailable'
+
+
+@lru_cache(maxsize=None)
+def _get_limits():
+    """(places admises, calculs simultanés) du processus"""
+    workers = settings.PASSWORD_HASHING_WORKERS
+    return BoundedSemaphore(workers + settings.PASSWORD_HASHING_MAX_PENDING), BoundedSemaphore(workers)
+
+
+def run_hashing(func, *args):
+    """
+    Exécute un calcul de hachage dans le thread appelant, sous un limiteur de
+    concurrence propre au processus (aucun calcul n'est déporté ailleurs).
+
+    Les fonctions de hachage (PBKDF2, scrypt, Argon2) relâchent le GIL : au
+    plus PASSWORD_HASHING_WORKERS calculs s'exécutent à la fois (le nombre de
+    cœurs alloués), PASSWORD_HASHING_MAX_PENDING autres attendent leur tour, et
+    au-delà, après PASSWORD_HASHING_WAIT secondes, la requête est refusée (503)
+    au lieu de saturer les workers.
+    """
+    admitted, running = _get_limits()
+    if not admitted.acquire(timeout=settings.PASSWORD_HASHING_WAIT):
+        raise HashingUnavailable()
+    try:
+        with running:
+            return func(*args)
+    finally:
+        admitted.release()
+
+
+def hash_password(raw_password):
+    """Équivalent de make_password() sous le limiteur"""
+    return run_hashing(make_password, raw_password)
+
+
+def verify_password(user, raw_password):
+    """
+    Vérifie le mot de passe d'un utilisateur sous le limiteur, et le rehache
+    avec le hacheur et les paramètres actuels s'ils ont changé
+    """
+    try:
+        hasher = identify_hasher(user.password)
+    except ValueError:
+        # Mot de passe inutilisable ou format inconnu
+        return False
+
+    if not run_hashing(hasher.verify, raw_password, user.password):
+        return False
+
+    preferred = get_hasher('default')
+    if hasher.algorithm != preferred.algorithm or preferred.must_update(user.password):
+        user.password = hash_password(raw_password)
+        user.save(update_fields=['password'])
+    return True
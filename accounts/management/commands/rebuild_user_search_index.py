@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruit l'index de recherche des utilisateurs (après un import ou une mise à jour en masse)"
+
+    def handle(self, *args, **options):
+        created = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Index de recherche reconstruit ({created} termes)."))
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_search_index(apps, schema_editor):
+    """Indexe les utilisateurs existants"""
+    from accounts.search import rebuild_index
+    rebuild_index(
+        user_model=apps.get_model('accounts', 'User'),
+        token_model=apps.get_model('accounts', 'UserSearchToken'),
+        using=schema_editor.connection.alias,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=255, verbose_name='Terme')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to=settings.AUTH_USER_MODEL, verbose_name='Utilisateur')),
+            ],
+            options={
+                'verbose_name': 'Terme de recherche',
+                'verbose_name_plural': 'Termes de recherche',
+                'indexes': [models.Index(fields=['user', 'token'], name='user_search_user_token_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='usersearchtoken',
+            constraint=models.UniqueConstraint(fields=('token', 'user'), name='user_search_token_uniq'),
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
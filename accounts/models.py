@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 from django.core.validators import MinValueValidator
 from datetime import date
 
@@ -34,6 +35,10 @@ class User(AbstractUser):
         verbose_name = "Utilisateur"
         verbose_name_plural = "Utilisateurs"
         ordering = ['-created_time']
+        indexes = [
+            # Recherche par préfixe sans casse de l'administration
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+        ]
     
     def __str__(self):
         return self.username
@@ -58,3 +63,37 @@ class User(AbstractUser):
         """Appelle clean() avant de sauvegarder"""
         self.clean()
         super().save(*args, **kwargs)
+
+
+class UserSearchToken(models.Model):
+    """
+    Index de recherche des utilisateurs : un terme normalisé (minuscules,
+    sans accents) par nom d'utilisateur, e-mail, prénom, nom et nom complet.
+    Seuls les comptes actifs ayant consenti au partage de leurs données y
+    figurent (voir accounts/search.py).
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='search_tokens',
+        verbose_name="Utilisateur"
+    )
+    token = models.CharField(
+        max_length=255,
+        verbose_name="Terme"
+    )
+
+    class Meta:
+        verbose_name = "Terme de recherche"
+        verbose_name_plural = "Termes de recherche"
+        constraints = [
+            # Recherche par préfixe et pagination sur (terme, utilisateur)
+            models.UniqueConstraint(fields=['token', 'user'], name='user_search_token_uniq'),
+        ]
+        indexes = [
+            # Premier terme correspondant de chaque utilisateur (dédoublonnage)
+            models.Index(fields=['user', 'token'], name='user_search_user_token_idx'),
+        ]
+
+    def __str__(self):
+        return self.token
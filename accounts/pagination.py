@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class SearchTokenCursorPagination(CursorPagination):
+    """
+    Pagination par curseur (keyset) des résultats de recherche d'utilisateurs,
+    dans l'ordre de l'index (terme, utilisateur)
+    """
+    ordering = ('token', 'user_id')
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
@@ -0,0 +1,75 @@
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .models import User, UserSearchToken
+
+
+MIN_QUERY_LENGTH = 2
+# Champs dont dépend l'index : les autres sauvegardes (last_login...) ne le touchent pas
+INDEXED_FIELDS = {'username', 'email', 'first_name', 'last_name', 'is_active', 'can_data_be_shared'}
+
+
+def normalize(value):
+    """Minuscules, sans accents ni espaces superflus"""
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return ' '.join(value.lower().split())[:255]
+
+
+def user_tokens(user):
+    """Termes indexés d'un utilisateur ; aucun sans consentement au partage des données"""
+    if not (user.is_active and user.can_data_be_shared):
+        return set()
+    values = [
+        user.username, user.email, user.first_name, user.last_name,
+        f'{user.first_name} {user.last_name}',
+    ]
+    return {token for token in map(normalize, values) if token}
+
+
+def index_user(user):
+    """Met à jour les termes de recherche d'un utilisateur"""
+    with transaction.atomic():
+        UserSearchToken.objects.filter(user=user).delete()
+        UserSearchToken.objects.bulk_create([
+            UserSearchToken(user=user, token=token) for token in user_tokens(user)
+        ])
+
+
+def rebuild_index(batch_size=5000, user_model=User, token_model=UserSearchToken, using='default'):
+    """
+    Reconstruit l'index de tous les utilisateurs, par lots, en une transaction
+    (les recherches concurrentes voient l'ancien index jusqu'au bout) ;
+    retourne le nombre de termes. Les modèles sont ceux de la migration quand
+    elle l'appelle.
+    """
+    created = 0
+    users = user_model.objects.using(using).filter(is_active=True, can_data_be_shared=True).order_by('pk')
+    last_pk = 0
+    with transaction.atomic(using=using):
+        token_model.objects.using(using).all().delete()
+        while True:
+            batch = list(users.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return created
+            tokens = [token_model(user=user, token=token) for user in batch for token in user_tokens(user)]
+            token_model.objects.using(using).bulk_create(tokens, batch_size=batch_size)
+            created += len(tokens)
+            last_pk = batch[-1].pk
+
+
+def search_queryset(query):
+    """
+    Termes commençant par query, un seul par utilisateur (le plus petit),
+    avec l'utilisateur. La condition de préfixe est un intervalle sur
+    l'index (terme, utilisateur), qui sert aussi le tri de la pagination ;
+    le dédoublonnage est une sonde par ligne sur l'index (utilisateur, terme).
+    """
+    query = normalize(query)
+    matching = UserSearchToken.objects.filter(token__gte=query, token__lt=query + '\U0010ffff')
+    smaller_match = matching.filter(user_id=OuterRef('user_id'), token__lt=OuterRef('token'))
+    return matching.filter(~Exists(smaller_match)).select_related('user').only(
+        'token', 'user__username', 'user__first_name', 'user__last_name'
+    )
@@ -1,8 +1,13 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
+from drf_spectacular.utils import extend_schema_field
 from datetime import date
+from functools import lru_cache
 from .models import User
+from .hashing import hash_password
+from .summaries import user_summaries
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -50,7 +55,13 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         """Crée un nouvel utilisateur"""
         validated_data.pop('password_confirm')
         password = validated_data.pop('password')
-        user = User.objects.create_user(password=password, **validated_data)
+        # Mêmes normalisations que UserManager.create_user (NFKC du nom, domaine de l'e-mail)
+        validated_data['username'] = User.normalize_username(validated_data['username'])
+        validated_data['email'] = User.objects.normalize_email(validated_data.get('email'))
+        user = User(**validated_data)
+        # Hachage sous le limiteur de concurrence (voir accounts/hashing.py)
+        user.password = hash_password(password)
+        user.save()
         return user
 
 
@@ -81,6 +92,83 @@ class UserSerializer(serializers.ModelSerializer):
         return value
 
 
+@lru_cache(maxsize=None)
+def summary_serializer():
+    """Une seule instance : construire les champs coûte plus que le rendu lui-même"""
+    return UserSerializer()
+
+
+def user_summary(user):
+    """Représentation UserSerializer d'un utilisateur chargé, depuis le cache si à jour"""
+    summary = user_summaries.get(user.pk, user.updated_time)
+    if summary is None:
+        summary = summary_serializer().to_representation(user)
+        user_summaries.set(user.pk, user.updated_time, summary)
+    return summary
+
+
+def load_user_summaries(user_ids):
+    """Charge en une requête les utilisateurs absents du cache"""
+    missing = user_summaries.missing(set(user_ids))
+    for user in User.objects.filter(id__in=missing):
+        user_summary(user)
+
+
+@extend_schema_field(UserSerializer)
+class UserSummaryField(serializers.Field):
+    """
+    Utilisateur imbriqué en lecture seule (auteur, assigné, contributeur),
+    rendu comme UserSerializer mais depuis le cache des résumés. Si la
+    relation n'a pas été chargée (select_related), seul l'identifiant est
+    lu ; UserSummaryListSerializer charge alors les absents en une requête
+    pour toute la liste.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        field = instance._meta.get_field(self.source)
+        if field.is_cached(instance):
+            return getattr(instance, self.source)
+        return getattr(instance, field.attname)
+
+    def to_representation(self, value):
+        if isinstance(value, User):
+            return user_summary(value)
+        summary = user_summaries.get(value)
+        if summary is None:
+            load_user_summaries([value])
+            summary = user_summaries.get(value)
+        return summary
+
+
+class UserSummaryListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer des serializers qui imbriquent des UserSummaryField :
+    précharge en une seule requête id__in les utilisateurs de toute la page
+    absents du cache, au lieu d'une requête par ligne
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        user_fields = [
+            self.child.fields[name].source for name in self.child.fields
+            if isinstance(self.child.fields[name], UserSummaryField)
+        ]
+        user_ids = set()
+        for item in items:
+            for source in user_fields:
+                field = item._meta.get_field(source)
+                if not field.is_cached(item):
+                    user_ids.add(getattr(item, field.attname))
+        user_ids.discard(None)
+        if user_ids:
+            load_user_summaries(user_ids)
+        return super().to_representation(items)
+
+
 class UserDeleteSerializer(serializers.Serializer):
     """
     Serializer pour la suppression d'un utilisateur (Droit à l'oubli RGPD)
@@ -96,3 +184,14 @@ class UserDeleteSerializer(serializers.Serializer):
                 "Vous devez confirmer la suppression pour procéder."
             )
         return value
+
+
+class UserSearchResultSerializer(serializers.Serializer):
+    """
+    Serializer des résultats de recherche d'utilisateurs (un terme d'index
+    par utilisateur) : identité publique uniquement, sans e-mail
+    """
+    id = serializers.IntegerField(source='user.id')
+    username = serializers.CharField(source='user.username')
+    first_name = serializers.CharField(source='user.first_name')
+    last_name = serializers.CharField(source='user.last_name')
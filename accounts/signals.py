@@ -0,0 +1,20 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import User
+from .search import INDEXED_FIELDS, index_user
+from .summaries import user_summaries
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    """Réindexe l'utilisateur pour la recherche lorsque ses champs indexés changent"""
+    if update_fields is not None and not INDEXED_FIELDS.intersection(update_fields):
+        return
+    index_user(instance)
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Retire l'utilisateur du cache des résumés de ce processus"""
+    user_summaries.invalidate(instance.pk)
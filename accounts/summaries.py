@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+from django.conf import settings
+
+
+class UserSummaryCache:
+    """
+    Cache LRU, propre au processus, des utilisateurs déjà rendus par
+    UserSerializer (résumés imbriqués dans les projets, issues, commentaires
+    et contributeurs). Une entrée est indexée par l'identifiant et porte la
+    date de modification de l'utilisateur : quand la ligne est chargée, une
+    date différente invalide l'entrée. Sans la ligne, l'entrée vaut au plus
+    USER_SUMMARY_CACHE_TTL secondes (modifications faites par un autre
+    processus). Les entrées rendues un autre jour sont ignorées (âge).
+
+    Les résumés retournés sont partagés : ne pas les modifier.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, user_id, updated_time=None):
+        """Résumé en cache, ou None si absent ou périmé"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                entry_updated_time, rendered_on, stored_at, summary = entry
+                fresh = rendered_on == date.today() and (
+                    entry_updated_time == updated_time if updated_time is not None
+                    else time.monotonic() - stored_at < self.ttl
+                )
+                if fresh:
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return summary
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def set(self, user_id, updated_time, summary):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (updated_time, date.today(), time.monotonic(), summary)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def missing(self, user_ids):
+        """Identifiants absents ou expirés (sans compter d'échec : préchargement)"""
+        today, now = date.today(), time.monotonic()
+        with self._lock:
+            return {
+                user_id for user_id in user_ids
+                if (entry := self._entries.get(user_id)) is None
+                or entry[1] != today or now - entry[2] >= self.ttl
+            }
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Métriques du processus : taille, succès, échecs, évictions et taux de succès"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else None,
+            }
+
+
+user_summaries = UserSummaryCache(settings.USER_SUMMARY_CACHE_SIZE, settings.USER_SUMMARY_CACHE_TTL)
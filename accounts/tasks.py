@@ -0,0 +1,16 @@
+from jobs.registry import task
+from .deletion import erase_user
+from .models import User
+
+
+@task('accounts.erase_user')
+def erase_user_task(job, user_id):
+    """
+    Efface en arrière-plan un compte et toutes ses données. Les lots sont
+    validés au fur et à mesure : l'avancement est visible et une nouvelle
+    tentative reprend là où la précédente s'est arrêtée.
+    """
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return {}
+    return erase_user(user, progress=job.report_progress, atomic=False)
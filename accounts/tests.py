@@ -1,3 +1,63 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+from .models import User, UserSearchToken
+from .search import rebuild_index
+from .serializers import UserRegistrationSerializer
+
+
+class UserRegistrationTests(TestCase):
+    """Inscription : normalisations identiques à UserManager.create_user"""
+
+    def register(self, **data):
+        serializer = UserRegistrationSerializer(data=dict({
+            'username': 'alice',
+            'email': 'alice@example.com',
+            'password': 'Sup3r-secret-42',
+            'password_confirm': 'Sup3r-secret-42',
+            'birth_date': date(1990, 1, 1),
+        }, **data))
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_username_and_email_are_normalized(self):
+        user = self.register(username='ﬁlou', email='Alice@EXAMPLE.Com')
+        self.assertEqual(user.username, 'filou')
+        self.assertEqual(user.email, 'Alice@example.com')
+
+    def test_password_is_hashed(self):
+        user = self.register()
+        self.assertTrue(user.check_password('Sup3r-secret-42'))
+
+
+class UserSearchIndexTests(TransactionTestCase):
+    """Index de recherche : rempli par la migration, reconstruit d'un bloc"""
+
+    def test_migration_indexes_existing_users(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([('accounts', '0001_initial')])
+        old_apps = executor.loader.project_state([('accounts', '0001_initial')]).apps
+        old_apps.get_model('accounts', 'User').objects.create(
+            username='Dupont', email='jean@example.com', birth_date=date(1990, 1, 1), can_data_be_shared=True
+        )
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+        self.assertIn('dupont', UserSearchToken.objects.values_list('token', flat=True))
+
+    def test_rebuild_index(self):
+        user = User.objects.create_user(
+            username='Dupont', password=None, email='jean@example.com', birth_date=date(1990, 1, 1),
+            can_data_be_shared=True
+        )
+        UserSearchToken.objects.all().delete()
+        UserSearchToken.objects.create(user=user, token='obsolète')
+
+        self.assertEqual(rebuild_index(), 2)
+        self.assertEqual(
+            set(UserSearchToken.objects.values_list('token', flat=True)), {'dupont', 'jean@example.com'}
+        )
@@ -1,7 +1,8 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
+from core.compression import no_compression
 from .views import (
-    UserRegistrationView, UserProfileView, 
+    UserRegistrationView, UserProfileView, UserSearchView,
     delete_user_account, CustomTokenObtainPairView
 )
 
@@ -10,10 +11,14 @@ app_name = 'accounts'
 urlpatterns = [
     # Authentification
     path('auth/register/', UserRegistrationView.as_view(), name='register'),
-    path('auth/login/', CustomTokenObtainPairView.as_view(), name='login'),
-    path('auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    # Réponses contenant des jetons : jamais compressées (BREACH)
+    path('auth/login/', no_compression(CustomTokenObtainPairView.as_view()), name='login'),
+    path('auth/refresh/', no_compression(TokenRefreshView.as_view()), name='token_refresh'),
     
     # Profil utilisateur (RGPD)
     path('profile/', UserProfileView.as_view(), name='profile'),
     path('delete-account/', delete_user_account, name='delete_account'),
+
+    # Recherche d'utilisateurs (contributeurs, assignés)
+    path('users/search/', UserSearchView.as_view(), name='user_search'),
 ]
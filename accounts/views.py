@@ -3,9 +3,20 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+from rest_framework.exceptions import ValidationError
 from .models import User
-from .serializers import UserRegistrationSerializer, UserSerializer, UserDeleteSerializer
+from .serializers import (
+    UserRegistrationSerializer, UserSerializer, UserDeleteSerializer, UserSearchResultSerializer
+)
+from .pagination import SearchTokenCursorPagination
+from .search import MIN_QUERY_LENGTH, normalize, search_queryset
+from django.conf import settings
+from django.urls import reverse
+from jobs.registry import enqueue
+from .deletion import count_user_issues, erase_user
+from core.idempotency import idempotent
+from core.throttling import IPTokenBucketThrottle, UserTokenBucketThrottle
 
 
 @extend_schema_view(
@@ -22,7 +33,10 @@ class UserRegistrationView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserRegistrationSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = 'register'
 
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -67,6 +81,36 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         return self.request.user
 
 
+@extend_schema_view(
+    get=extend_schema(
+        summary="Recherche d'utilisateurs",
+        description=(
+            "Recherche par préfixe du nom d'utilisateur, de l'e-mail, du prénom ou du nom "
+            "(sans accents ni casse), pour choisir un contributeur ou un assigné. "
+            "Seuls les comptes ayant consenti au partage de leurs données apparaissent."
+        ),
+        parameters=[
+            OpenApiParameter('q', str, required=True,
+                             description=f"Début du terme recherché ({MIN_QUERY_LENGTH} caractères minimum)"),
+        ],
+        tags=["Utilisateurs"]
+    )
+)
+class UserSearchView(generics.ListAPIView):
+    """
+    Vue de recherche d'utilisateurs, servie par l'index UserSearchToken
+    """
+    serializer_class = UserSearchResultSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = SearchTokenCursorPagination
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '')
+        if len(normalize(query)) < MIN_QUERY_LENGTH:
+            raise ValidationError({'q': f"Au moins {MIN_QUERY_LENGTH} caractères."})
+        return search_queryset(query)
+
+
 @extend_schema(
     summary="Suppression du compte utilisateur",
     description="Supprimer définitivement le compte utilisateur et toutes ses données (droit à l'oubli RGPD)",
@@ -81,13 +125,27 @@ def delete_user_account(request):
     """
     serializer = UserDeleteSerializer(data=request.data)
     if serializer.is_valid():
-        # Supprimer l'utilisateur et toutes ses données associées
         user = request.user
         username = user.username
-        user.delete()
+
+        # Compte volumineux : désactivation immédiate puis effacement en arrière-plan
+        threshold = settings.ASYNC_DELETION_THRESHOLD
+        if threshold and count_user_issues(user) >= threshold:
+            user.is_active = False
+            user.save(update_fields=['is_active', 'updated_time'])
+            job = enqueue('accounts.erase_user', user_id=user.id)
+            return Response({
+                'message': f'Le compte {username} est désactivé ; ses données sont en cours de suppression.',
+                'job': job.id,
+                'status_url': reverse('jobs:job-detail', args=[job.id])
+            }, status=status.HTTP_202_ACCEPTED)
+
+        # Supprimer l'utilisateur et toutes ses données associées, par lots
+        report = erase_user(user)
         
         return Response({
-            'message': f'Le compte {username} et toutes ses données ont été supprimés définitivement.'
+            'message': f'Le compte {username} et toutes ses données ont été supprimés définitivement.',
+            'deleted': report
         }, status=status.HTTP_200_OK)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -97,7 +155,9 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     """
     Vue personnalisée pour l'authentification JWT
     """
-    
+    throttle_classes = [IPTokenBucketThrottle, UserTokenBucketThrottle]
+    throttle_scope = 'login'
+
     @extend_schema(
         summary="Connexion utilisateur",
         description="Authentifier un utilisateur et obtenir des tokens JWT",
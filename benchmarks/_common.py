@@ -0,0 +1,71 @@
+"""
+Outils communs aux scripts de benchmark.
+
+Les benchmarks tournent sur une base de test créée à la volée (migrations
+comprises) pour ne jamais toucher à db.sqlite3.
+"""
+import os
+import sys
+from datetime import date
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'softdesk_api.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+
+def setup_test_database():
+    """Crée la base de test et retourne son nom"""
+    setup_test_environment()
+    return connection.creation.create_test_db(verbosity=0)
+
+
+def teardown_test_database(old_name):
+    connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def seed(projects=5, users=20, issues_per_project=50, comments_per_issue=3):
+    """
+    Crée un jeu de données : chaque utilisateur contribue à tous les projets,
+    les issues sont assignées et commentées de façon tournante.
+    """
+    from accounts.models import User
+    from projects.models import Project, Contributor, Issue, Comment
+
+    user_objs = User.objects.bulk_create([
+        User(
+            username=f'user{i}', email=f'user{i}@example.com',
+            first_name=f'Prénom{i}', last_name=f'Nom{i}',
+            birth_date=date(1990, 1, 1), password='!'
+        )
+        for i in range(users)
+    ])
+    project_objs = Project.objects.bulk_create([
+        Project(name=f'Projet {p}', description='Description ' * 10, type='BACKEND', author=user_objs[p % users])
+        for p in range(projects)
+    ])
+    Contributor.objects.bulk_create([
+        Contributor(user=user, project=project)
+        for project in project_objs for user in user_objs
+    ])
+    issue_objs = Issue.objects.bulk_create([
+        Issue(
+            name=f'Issue {p}-{i}', description='Texte de description détaillé. ' * 20,
+            project=project, author=user_objs[i % users], assignee=user_objs[(i + 1) % users],
+            tag=('BUG', 'FEATURE', 'TASK')[i % 3],
+            status=('TO_DO', 'IN_PROGRESS', 'FINISHED')[i % 3],
+            priority=('LOW', 'MEDIUM', 'HIGH')[i % 3],
+        )
+        for p, project in enumerate(project_objs) for i in range(issues_per_project)
+    ])
+    Comment.objects.bulk_create([
+        Comment(description=f'Commentaire {c}', issue=issue, author=user_objs[c % users])
+        for issue in issue_objs for c in range(comments_per_issue)
+    ])
+    return user_objs, project_objs, issue_objs
@@ -0,0 +1,106 @@
+"""
+Coût des pages de l'administration (listes, recherche, formulaire) sur un
+grand volume : nombre de requêtes SQL et temps de réponse.
+
+Usage : python benchmarks/admin_changelist.py [--issues 1000000] [--users 1000]
+"""
+import argparse
+import time
+from datetime import date
+
+from _common import setup_test_database, teardown_test_database
+
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+BATCH_SIZE = 5000
+
+
+def seed_large(issues, users, projects=100):
+    """Une issue et un commentaire par ligne, répartis sur projects projets"""
+    from accounts.models import User
+    from projects.models import Project, Contributor, Issue, Comment
+
+    user_objs = User.objects.bulk_create([
+        User(username=f'user{i}', email=f'user{i}@example.com', birth_date=date(1990, 1, 1), password='!')
+        for i in range(users)
+    ], batch_size=BATCH_SIZE)
+    project_objs = Project.objects.bulk_create([
+        Project(name=f'Projet {p}', description='Description', type='BACKEND', author=user_objs[p % users])
+        for p in range(projects)
+    ])
+    Contributor.objects.bulk_create([
+        Contributor(user=user_objs[(p + i) % users], project=project)
+        for p, project in enumerate(project_objs) for i in range(min(users, 50))
+    ], batch_size=BATCH_SIZE)
+
+    for start in range(0, issues, BATCH_SIZE):
+        created = Issue.objects.bulk_create([
+            Issue(
+                name=f'Issue {i}', description='Texte de description.',
+                project=project_objs[i % projects], author=user_objs[i % users],
+                assignee=user_objs[(i + 1) % users], tag='BUG', status=('TO_DO', 'FINISHED')[i % 2],
+                priority='LOW',
+            )
+            for i in range(start, min(start + BATCH_SIZE, issues))
+        ])
+        Comment.objects.bulk_create([
+            Comment(description='Commentaire', issue=issue, author=user_objs[n % users])
+            for n, issue in enumerate(created)
+        ])
+    return Issue.objects.order_by('-pk').values_list('pk', flat=True).first()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--issues', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    old_name = setup_test_database()
+    # Les pages lentes de la version non optimisée déclencheraient le délestage
+    override_settings(LOAD_SHEDDING_ENABLED=False).enable()
+    try:
+        from accounts.models import User
+
+        started = time.perf_counter()
+        last_issue = seed_large(args.issues, args.users)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        print(f"Jeu de données : {args.issues} issues et commentaires, {args.users} utilisateurs "
+              f"({time.perf_counter() - started:.0f} s)")
+
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'x', birth_date=date(1990, 1, 1))
+        client = Client()
+        client.force_login(admin)
+
+        pages = [
+            '/admin/projects/issue/',
+            '/admin/projects/issue/?status__exact=TO_DO',
+            '/admin/projects/issue/?q=Issue 4242',
+            '/admin/projects/issue/?p=100',
+            f'/admin/projects/issue/{last_issue}/change/',
+            '/admin/projects/comment/',
+            '/admin/projects/contributor/',
+            '/admin/projects/project/',
+            '/admin/accounts/user/?q=user42',
+        ]
+        print(f"{'Page':<48} {'Statut':>6} {'Requêtes':>9} {'Temps (ms)':>11}")
+        for url in pages:
+            timings = []
+            for _ in range(args.repeat):
+                connection.queries_log.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    timings.append((time.perf_counter() - start) * 1000)
+            print(f'{url:<48} {response.status_code:>6} {len(queries):>9} {min(timings):>11.0f}')
+    finally:
+        teardown_test_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Insertion et lecture par plage sur une grande table de commentaires,
+avec des identifiants UUIDv4 aléatoires puis UUIDv7 ordonnés dans le temps
+(COMMENT_TIME_ORDERED_IDS). Base SQLite fichier, pour que la localité des
+pages de l'index de clé primaire compte. Les temps d'insertion ne comptent
+que l'exécution SQL, pas la construction des objets par l'ORM.
+
+Usage : python benchmarks/comment_ids.py [--comments 1000000] [--inserts 20000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from _common import seed
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+
+BATCH_SIZE = 10000
+RANGE_SIZE = 10000
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def sql_timed(func):
+    """Comme timed(), mais ne compte que le temps passé dans la base (sans l'ORM)"""
+    spent = [0.0]
+
+    def wrapper(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            spent[0] += time.perf_counter() - start
+
+    with connection.execute_wrapper(wrapper):
+        func()
+    return spent[0] * 1000
+
+
+def run(comments, inserts, time_ordered):
+    from core.uuids import uuid7_from_time
+    from projects.models import Comment
+
+    settings.COMMENT_TIME_ORDERED_IDS = time_ordered
+    connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        users, projects, issues = seed(projects=10, users=20, issues_per_project=100, comments_per_issue=0)
+        results = {}
+
+        def fill():
+            for start in range(0, comments, BATCH_SIZE):
+                Comment.objects.bulk_create([
+                    Comment(description='Commentaire', issue=issues[i % len(issues)], author=users[i % len(users)])
+                    for i in range(start, min(start + BATCH_SIZE, comments))
+                ])
+        results['bulk'] = sql_timed(fill)
+
+        # Insertions unitaires sur la table déjà remplie, validées par 1000
+        since = timezone.now()
+
+        def insert():
+            for start in range(0, inserts, 1000):
+                with transaction.atomic():
+                    for i in range(start, min(start + 1000, inserts)):
+                        Comment.objects.create(description='Nouveau', issue=issues[i % len(issues)], author=users[0])
+        results['insert'] = sql_timed(insert)
+
+        # Lecture des derniers commentaires : index (created_time, id) ou plage de clé primaire
+        connection.close()
+        recent = Comment.objects.filter(created_time__gte=since).order_by('created_time', 'id')
+        results['by_time'], count = timed(lambda: len(list(recent.values_list('id', 'description')[:RANGE_SIZE])))
+        if time_ordered:
+            connection.close()
+            by_pk = Comment.objects.filter(pk__gte=uuid7_from_time(since)).order_by('pk')
+            results['by_pk'], count_pk = timed(lambda: len(list(by_pk.values_list('id', 'description')[:RANGE_SIZE])))
+            assert count_pk == count
+
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA page_count')
+            results['pages'] = cursor.fetchone()[0]
+        return results
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--comments', type=int, default=1000000)
+    parser.add_argument('--inserts', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{args.comments} commentaires, puis {args.inserts} insertions unitaires")
+    print(f"{'identifiants':<14}{'remplissage':>14}{'insertions':>14}{'ins/s':>10}"
+          f"{'plage date':>13}{'plage pk':>11}{'pages':>10}")
+    for label, time_ordered in (('UUIDv4', False), ('UUIDv7', True)):
+        r = run(args.comments, args.inserts, time_ordered)
+        by_pk = f"{r['by_pk']:.1f} ms" if 'by_pk' in r else '-'
+        print(f"{label:<14}{r['bulk'] / 1000:>12.1f} s{r['insert'] / 1000:>12.2f} s"
+              f"{args.inserts / r['insert'] * 1000:>10.0f}{r['by_time']:>10.1f} ms{by_pk:>11}{r['pages']:>10}")
+
+
+if __name__ == '__main__':
+    main()
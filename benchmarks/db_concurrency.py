@@ -0,0 +1,86 @@
+"""
+Lectures et écritures concurrentes sur une base SQLite fichier, avec et
+sans les réglages de connexion (WAL, synchronous=NORMAL, busy_timeout, mmap).
+
+Usage : python benchmarks/db_concurrency.py [--readers 8] [--writers 2] [--seconds 5]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from _common import seed
+
+from django.conf import settings
+from django.db import connection, connections, OperationalError
+
+TUNED_PRAGMAS = dict(settings.SQLITE_PRAGMAS)
+
+
+def run(readers, writers, seconds, tuned):
+    from projects.models import Issue, Comment
+
+    settings.SQLITE_PRAGMAS = TUNED_PRAGMAS if tuned else {}
+    connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        users, projects, issues = seed(projects=4, users=20, issues_per_project=250, comments_per_issue=2)
+        connections.close_all()
+        counters = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + seconds
+
+        def reader(index):
+            project = projects[index % len(projects)]
+            while time.monotonic() < deadline:
+                try:
+                    list(Issue.objects.filter(project=project).select_related('author')[:50])
+                    key = 'reads'
+                except OperationalError:
+                    key = 'errors'
+                with lock:
+                    counters[key] += 1
+            connection.close()
+
+        def writer(index):
+            while time.monotonic() < deadline:
+                try:
+                    issue = issues[(index * 7 + counters['writes']) % len(issues)]
+                    Comment.objects.create(description='bench', issue=issue, author=users[index])
+                    key = 'writes'
+                except OperationalError:
+                    key = 'errors'
+                with lock:
+                    counters[key] += 1
+            connection.close()
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return counters
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"{'Profil':<10} {'lectures/s':>11} {'écritures/s':>12} {'erreurs':>8}")
+    for label, tuned in (('défaut', False), ('optimisé', True)):
+        result = run(args.readers, args.writers, args.seconds, tuned)
+        print(
+            f"{label:<10} {result['reads'] / args.seconds:>11.0f} "
+            f"{result['writes'] / args.seconds:>12.0f} {result['errors']:>8}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Temps d'import au démarrage des processus (WSGI, et WSGI + URLconf).
+
+Chaque cible est importée dans un interpréteur neuf avec -X importtime ;
+on affiche le meilleur temps et la médiane de plusieurs exécutions, ainsi
+que les paquets les plus coûteux. Le meilleur temps, moins sensible au
+bruit de la machine, est comparé au budget de benchmarks/import_budget.json
+(code de sortie 1 en cas de dépassement, pour la CI).
+
+Usage : python benchmarks/import_time.py [--runs 5] [--top 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).resolve().parent / 'import_budget.json'
+
+TARGETS = {
+    'wsgi': 'import softdesk_api.wsgi',
+    'wsgi+urls': 'import softdesk_api.wsgi; from django.urls import get_resolver; get_resolver().url_patterns',
+}
+
+
+def run_once(code, env):
+    """Retourne (total en ms, {paquet de premier niveau: ms propres cumulées})"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    total = 0
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        name = name[1:]
+        # Seuls les imports de premier niveau (non indentés) s'additionnent au total
+        if name == name.lstrip():
+            total += int(cumulative)
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + int(own)
+    return total / 1000, {name: us / 1000 for name, us in packages.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'softdesk_api.settings'}
+    budget = json.loads(BUDGET_FILE.read_text()) if BUDGET_FILE.exists() else {}
+    over_budget = False
+
+    for target, code in TARGETS.items():
+        runs = [run_once(code, env) for _ in range(args.runs)]
+        best, packages = min(runs, key=lambda run: run[0])
+        median = statistics.median(total for total, _ in runs)
+        limit = budget.get(target)
+        status = '' if limit is None else (' OK' if best <= limit else ' DÉPASSEMENT')
+        over_budget |= limit is not None and best > limit
+        print(f"{target}: {best:.0f} ms (médiane {median:.0f} ms sur {args.runs}, budget {limit or '-'} ms){status}")
+
+        for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {name:<28} {ms:7.1f} ms")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Détection des doublons (projects/similarity.py) dans un grand projet :
+construction de l'index, puis temps de recherche des issues proches d'un
+texte (médiane et p95) et rappel, pour des variantes d'issues existantes
+(mots modifiés, ajoutés ou supprimés).
+
+Usage : python benchmarks/issue_similarity.py [--issues 100000] [--queries 200]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from _common import seed, setup_test_database, teardown_test_database
+
+
+VOCABULARY = [
+    f'{prefix}{suffix}'
+    for prefix in ('connexion', 'export', 'page', 'bouton', 'filtre', 'compte', 'rapport', 'session',
+                   'fichier', 'menu', 'profil', 'tableau', 'recherche', 'image', 'lien', 'mail')
+    for suffix in ('', 's', 'age', 'eur', 'ement', 'ique', 'ion', 'al', 'ure', 'ette')
+] + ['ne', 'pas', 'le', 'la', 'les', 'de', 'des', 'sur', 'dans', 'quand', 'avec', 'erreur', 'vide', 'lent']
+
+
+def random_text(rng, length):
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(length))
+
+
+def variant(rng, text, edits):
+    """Copie du texte avec edits mots remplacés, insérés ou supprimés"""
+    words = text.split()
+    for _ in range(edits):
+        position = rng.randrange(len(words))
+        operation = rng.choice(('replace', 'insert', 'delete'))
+        if operation == 'replace':
+            words[position] = rng.choice(VOCABULARY)
+        elif operation == 'insert':
+            words.insert(position, rng.choice(VOCABULARY))
+        elif len(words) > 1:
+            del words[position]
+    return ' '.join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--issues', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    old_name = setup_test_database()
+    try:
+        from projects.models import Issue, IssueSimilarityBucket
+        from projects.similarity import find_similar, fingerprint, rebuild_index
+
+        rng = random.Random(42)
+        users, projects, _ = seed(projects=1, users=5, issues_per_project=0, comments_per_issue=0)
+        project = projects[0]
+        texts = [(random_text(rng, 8), random_text(rng, 40)) for _ in range(args.issues)]
+        Issue.objects.bulk_create([
+            Issue(name=name, description=description, project=project, author=users[0], tag='BUG', status='TO_DO')
+            for name, description in texts
+        ], batch_size=5000)
+
+        start = time.perf_counter()
+        indexed = rebuild_index(batch_size=5000)
+        print(f"Index : {indexed} issues, {IssueSimilarityBucket.objects.count()} seaux, "
+              f"{time.perf_counter() - start:.1f} s")
+
+        ids = list(Issue.objects.order_by('pk').values_list('pk', flat=True))
+        for edits in (2, 5, 10):
+            timings, found = [], 0
+            for _ in range(args.queries):
+                position = rng.randrange(len(texts))
+                name, description = texts[position]
+                query = fingerprint(variant(rng, name, 1), variant(rng, description, edits))
+                start = time.perf_counter()
+                matches = find_similar(project.pk, query)
+                timings.append((time.perf_counter() - start) * 1000)
+                found += any(issue.pk == ids[position] for issue in matches)
+            timings.sort()
+            print(f"{edits:>2} mots modifiés : médiane {statistics.median(timings):.2f} ms, "
+                  f"p95 {timings[int(len(timings) * 0.95)]:.2f} ms, rappel {found / args.queries:.0%}")
+
+        name, description = texts[0]
+        start = time.perf_counter()
+        for _ in range(args.queries):
+            fingerprint(name, description)
+        print(f"Empreinte d'un texte de 48 mots : {(time.perf_counter() - start) * 1000 / args.queries:.2f} ms")
+    finally:
+        teardown_test_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Connexions par seconde et par cœur selon le hacheur de mots de passe.
+
+Chaque configuration crée un utilisateur puis authentifie en boucle depuis
+autant de threads que de cœurs, via le backend et le limiteur de hachage.
+
+Usage : python benchmarks/login_throughput.py [--seconds 3]
+"""
+import argparse
+import os
+import threading
+import time
+from datetime import date
+
+from _common import setup_test_database, teardown_test_database
+
+from django.contrib.auth import authenticate
+from django.db import connection
+from django.test import override_settings
+
+
+CONFIGURATIONS = [
+    ('pbkdf2 600k (défaut Django)', 'accounts.hashers.TunedPBKDF2PasswordHasher', {}),
+    ('pbkdf2 210k', 'accounts.hashers.TunedPBKDF2PasswordHasher', {'PASSWORD_PBKDF2_ITERATIONS': 210000}),
+    ('scrypt N=2^14 r=8 p=1', 'accounts.hashers.TunedScryptPasswordHasher', {}),
+    ('argon2id t=2 m=19MiB p=1', 'accounts.hashers.TunedArgon2PasswordHasher', {}),
+]
+
+
+def measure(index, seconds, threads):
+    from accounts.models import User
+
+    username = f'bench{index}'
+    User.objects.create_user(username=username, password='Bench!pass42', birth_date=date(1990, 1, 1))
+    count = 0
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def worker():
+        nonlocal count
+        while time.monotonic() < deadline:
+            assert authenticate(username=username, password='Bench!pass42') is not None
+            with lock:
+                count += 1
+        connection.close()
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return count / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seconds', type=float, default=3)
+    args = parser.parse_args()
+    cores = os.cpu_count() or 1
+
+    old_name = setup_test_database()
+    try:
+        print(f"{cores} cœur(s)")
+        print(f"{'Hacheur':<28} {'connexions/s':>13} {'par cœur':>9}")
+        for index, (label, hasher, params) in enumerate(CONFIGURATIONS):
+            if 'Argon2' in hasher:
+                try:
+                    import argon2  # noqa: F401
+                except ImportError:
+                    print(f"{label:<28} {'argon2-cffi non installé':>23}")
+                    continue
+            with override_settings(PASSWORD_HASHERS=[hasher], **params):
+                rate = measure(index, args.seconds, cores)
+            print(f"{label:<28} {rate:>13.1f} {rate / cores:>9.1f}")
+    finally:
+        teardown_test_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
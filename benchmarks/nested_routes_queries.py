@@ -0,0 +1,56 @@
+"""
+Nombre de requêtes SQL par requête HTTP sur les routes imbriquées
+issues / commentaires, sur la lecture groupée des issues et sur
+l'instantané d'un projet (à comparer aux routes qu'il remplace).
+
+Usage : python benchmarks/nested_routes_queries.py
+"""
+from _common import setup_test_database, teardown_test_database, seed
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def main():
+    old_name = setup_test_database()
+    try:
+        users, projects, issues = seed(projects=2, users=10, issues_per_project=40, comments_per_issue=5)
+        from projects.models import Comment
+
+        project = projects[0]
+        issue = issues[0]
+        comment = Comment.objects.filter(issue=issue).first()
+        client = APIClient()
+        client.force_authenticate(users[0])
+
+        base = f'/api/projects/{project.id}/issues/'
+        routes = [
+            ('GET', base),
+            ('GET', f'{base}{issue.id}/'),
+            ('GET', f'{base}{issue.id}/comments/'),
+            ('GET', f'{base}{issue.id}/comments/{comment.id}/'),
+            ('POST', f'{base}{issue.id}/comments/'),
+            # 30 issues de plusieurs projets : à comparer à 30 GET de détail
+            ('GET', '/api/issues/batch/?ids=' + ','.join(str(i.id) for i in issues[::3][:30])),
+            # Ouverture d'un projet : détail + contributeurs + issues + statistiques...
+            ('GET', f'/api/projects/{project.id}/'),
+            ('GET', f'/api/projects/{project.id}/contributors/'),
+            ('GET', f'/api/projects/{project.id}/stats/'),
+            # ... ou tout en une fois
+            ('GET', f'/api/projects/{project.id}/snapshot/'),
+        ]
+        print(f"{'Méthode':<8} {'Route':<70} {'Statut':>6} {'Requêtes':>9}")
+        for method, url in routes:
+            with CaptureQueriesContext(connection) as queries:
+                if method == 'GET':
+                    response = client.get(url)
+                else:
+                    response = client.post(url, {'description': 'Nouveau commentaire'})
+            print(f'{method:<8} {url[:70]:<70} {response.status_code:>6} {len(queries):>9}')
+    finally:
+        teardown_test_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Envoi des résumés par e-mail (notifications/digests.py) : durée et nombre
+de requêtes SQL d'un passage de send_digests sur une file d'événements
+déjà remplie, avec le backend e-mail en mémoire (locmem).
+
+Usage : python benchmarks/notification_digests.py [--users 20000] [--events 200000]
+"""
+import argparse
+import time
+from datetime import date
+
+from _common import seed, setup_test_database, teardown_test_database
+
+from django.core import mail
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--events', type=int, default=200000)
+    parser.add_argument('--batch-size', type=int, default=None)
+    args = parser.parse_args()
+
+    old_name = setup_test_database()
+    try:
+        from accounts.models import User
+        from notifications.digests import send_digests
+        from notifications.models import Notification
+
+        users, projects, issues = seed(projects=1, users=20, issues_per_project=200, comments_per_issue=1)
+        comments = list(issues[0].comments.values_list('pk', flat=True))
+        recipients = User.objects.bulk_create([
+            User(username=f'dest{i}', email=f'dest{i}@example.com', password='!', birth_date=date(1990, 1, 1),
+                 can_be_contacted=i % 10 != 0)
+            for i in range(args.users)
+        ])
+        Notification.objects.bulk_create([
+            Notification(
+                recipient=recipients[i % args.users], kind=('ISSUE_ASSIGNED', 'COMMENT_ADDED')[i % 2],
+                project_id=projects[0].pk, issue_id=issues[i % len(issues)].pk,
+                comment_id=comments[0] if i % 2 else None, actor=users[i % len(users)],
+            )
+            for i in range(args.events)
+        ], batch_size=5000)
+
+        with override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'):
+            mail.outbox = []
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                report = send_digests(batch_size=args.batch_size)
+            elapsed = time.perf_counter() - start
+        print(f"{args.events} événements, {args.users} destinataires : {elapsed:.1f} s, "
+              f"{len(queries.captured_queries)} requêtes, {len(mail.outbox)} e-mails")
+        print(f"  {report}")
+        assert not Notification.objects.exists()
+    finally:
+        teardown_test_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
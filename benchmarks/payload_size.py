@@ -0,0 +1,44 @@
+"""
+Octets transmis par endpoint selon l'encodage négocié (Accept-Encoding).
+
+Usage : python benchmarks/payload_size.py
+"""
+from _common import setup_test_database, teardown_test_database, seed
+
+from rest_framework.test import APIClient
+
+from core.compression import available_encodings
+
+
+def main():
+    old_name = setup_test_database()
+    try:
+        users, projects, issues = seed(projects=5, users=20, issues_per_project=50, comments_per_issue=3)
+        project, issue = projects[0], issues[0]
+        client = APIClient()
+        client.force_authenticate(users[0])
+
+        routes = [
+            '/api/projects/',
+            f'/api/projects/{project.id}/',
+            f'/api/projects/{project.id}/issues/',
+            f'/api/projects/{project.id}/issues/{issue.id}/comments/',
+            '/api/me/issues/',
+            f'/api/projects/{project.id}/stats/',
+        ]
+        encodings = ['identity', *available_encodings()]
+        print(f"{'Route':<45}" + ''.join(f'{encoding:>10}' for encoding in encodings) + f"{'gain':>8}")
+        for url in routes:
+            sizes = []
+            for encoding in encodings:
+                response = client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+                assert response.get('Content-Encoding', 'identity') == encoding or response.status_code != 200
+                sizes.append(len(response.content))
+            gain = 1 - min(sizes) / sizes[0]
+            print(f'{url:<45}' + ''.join(f'{size:>10}' for size in sizes) + f'{gain:>8.0%}')
+    finally:
+        teardown_test_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Banc d'essai du routage vers les réplicas avec des fichiers SQLite locaux :
+la base principale est copiée dans deux fichiers qui jouent le rôle de
+réplicas (la copie simule la réplication).
+
+Vérifie que les lectures partent sur un réplica, que les écritures vont
+sur la principale, et qu'un utilisateur qui vient d'écrire relit sa
+propre écriture alors que les réplicas sont en retard.
+
+Usage : python benchmarks/replica_routing.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+WORK_DIR = tempfile.mkdtemp()
+PRIMARY = os.path.join(WORK_DIR, 'primary.sqlite3')
+REPLICAS = [os.path.join(WORK_DIR, f'replica{i}.sqlite3') for i in (1, 2)]
+os.environ['DB_NAME'] = PRIMARY
+os.environ['DB_REPLICAS'] = ','.join(REPLICAS)
+# Pas de WAL : la copie de fichier doit contenir toutes les écritures
+os.environ['SQLITE_TUNING'] = 'False'
+
+from _common import seed  # noqa: E402
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_test_environment  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+
+def replicate():
+    connections.close_all()
+    for replica in REPLICAS:
+        shutil.copyfile(PRIMARY, replica)
+
+
+def client_for(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+    return client
+
+
+def queries_by_alias(func):
+    """Exécute func et retourne (résultat, {alias: nombre de requêtes})"""
+    contexts = {alias: CaptureQueriesContext(connections[alias]) for alias in connections}
+    for context in contexts.values():
+        context.__enter__()
+    try:
+        result = func()
+    finally:
+        for context in contexts.values():
+            context.__exit__(None, None, None)
+    return result, {alias: len(context) for alias, context in contexts.items() if len(context)}
+
+
+def check(label, condition):
+    print(f"[{'OK' if condition else 'ÉCHEC'}] {label}")
+    return condition
+
+
+def main():
+    setup_test_environment()
+    # Un seul processus : le cache local suffit, la vérification core.E001 est ignorée
+    call_command('migrate', verbosity=0, skip_checks=True)
+    users, projects, issues = seed(projects=1, users=3, issues_per_project=5, comments_per_issue=1)
+    replicate()
+
+    url = f'/api/projects/{projects[0].id}/issues/{issues[0].id}/comments/'
+    writer, other = client_for(users[0]), client_for(users[1])
+    results = []
+
+    response, used = queries_by_alias(lambda: other.get(url))
+    results.append(check(f'lecture routée sur un réplica {used}', 'default' not in used))
+
+    response, used = queries_by_alias(lambda: writer.post(url, {'description': 'Tout juste publié'}))
+    results.append(check(f'écriture sur la principale {used}', response.status_code == 201 and set(used) == {'default'}))
+
+    response = writer.get(url)
+    results.append(check('l\'auteur relit son commentaire (collant)', response.data['count'] == 2))
+    response = other.get(url)
+    results.append(check('un autre utilisateur lit le réplica en retard', response.data['count'] == 1))
+
+    replicate()
+    response = other.get(url)
+    results.append(check('après réplication, tout le monde le voit', response.data['count'] == 2))
+
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Latence de la recherche d'utilisateurs (/api/users/search/) sur un grand
+nombre de comptes, dont la moitié consent au partage de ses données.
+
+Usage : python benchmarks/user_search.py [--users 1000000]
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import date
+
+from _common import setup_test_database, teardown_test_database
+
+from rest_framework.test import APIClient
+
+
+BATCH_SIZE = 10000
+FIRST_NAMES = ['Marie', 'Jean', 'Élodie', 'Lucas', 'Chloé', 'Hugo', 'Léa', 'Louis', 'Camille', 'Nathan']
+LAST_NAMES = ['Martin', 'Bernard', 'Dubois', 'Thomas', 'Robert', 'Richard', 'Petit', 'Durand', 'Leroy', 'Moreau']
+
+
+def seed_users(count):
+    from accounts.models import User
+    from accounts.search import rebuild_index
+
+    rng = random.Random(42)
+    for start in range(0, count, BATCH_SIZE):
+        User.objects.bulk_create([
+            User(
+                username=f'{rng.choice(FIRST_NAMES).lower()}{i}', email=f'user{i}@example.com',
+                first_name=rng.choice(FIRST_NAMES), last_name=f'{rng.choice(LAST_NAMES)}{i % 997}',
+                birth_date=date(1990, 1, 1), password='!', can_data_be_shared=i % 2 == 0,
+            )
+            for i in range(start, min(start + BATCH_SIZE, count))
+        ])
+    return rebuild_index(batch_size=BATCH_SIZE)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    old_name = setup_test_database()
+    try:
+        from django.db import connection
+        from accounts.models import User
+
+        started = time.perf_counter()
+        tokens = seed_users(args.users)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        print(f"{args.users} utilisateurs, {tokens} termes indexés ({time.perf_counter() - started:.0f} s)")
+
+        client = APIClient()
+        client.force_authenticate(User.objects.first())
+        queries = ['ma', 'marie1', 'eLoD', 'durand12', 'user12345@', 'chloe moreau', 'zz']
+        print(f"{'Recherche':<16} {'Résultats':>9} {'Médiane (ms)':>13} {'p95 (ms)':>9} {'Page 2 (ms)':>12}")
+        for query in queries:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                response = client.get('/api/users/search/', {'q': query})
+                timings.append((time.perf_counter() - start) * 1000)
+            data = response.json()
+            next_timing = ''
+            if data['next']:
+                start = time.perf_counter()
+                client.get(data['next'])
+                next_timing = f'{(time.perf_counter() - start) * 1000:.1f}'
+            timings.sort()
+            print(f"{query:<16} {len(data['results']):>9} {statistics.median(timings):>13.1f} "
+                  f"{timings[int(len(timings) * 0.95) - 1]:>9.1f} {next_timing:>12}")
+    finally:
+        teardown_test_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
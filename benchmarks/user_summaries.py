@@ -0,0 +1,75 @@
+"""
+Rendu des utilisateurs imbriqués (auteur, assigné, contributeur) avec et
+sans le cache des résumés (accounts/summaries.py) : temps de sérialisation
+d'une page d'issues déjà chargée, et requêtes de la liste des contributeurs.
+
+Usage : python benchmarks/user_summaries.py [--issues 100] [--repeat 200]
+"""
+import argparse
+import statistics
+import time
+
+from _common import seed, setup_test_database, teardown_test_database
+
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--issues', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    old_name = setup_test_database()
+    try:
+        from accounts.summaries import user_summaries
+        from projects.models import Issue
+        from projects.serializers import IssueSerializer
+
+        users, projects, issues = seed(projects=1, users=200, issues_per_project=args.issues, comments_per_issue=0)
+        page = list(
+            Issue.objects.select_related('project', 'author', 'assignee')
+            .annotate(num_comments=Count('comments'))
+        )
+
+        def render():
+            return IssueSerializer(page, many=True).data
+
+        max_size = user_summaries.max_size
+        user_summaries.max_size = 0
+        disabled = median_ms(render, args.repeat)
+        user_summaries.max_size = max_size
+        user_summaries.clear()
+        render()
+        enabled = median_ms(render, args.repeat)
+        print(f"Sérialisation de {args.issues} issues (auteur + assigné) : "
+              f"sans cache {disabled:.2f} ms, avec cache {enabled:.2f} ms ({disabled / enabled:.1f}x)")
+        print(f"  {user_summaries.stats()}")
+
+        client = APIClient()
+        client.force_authenticate(users[0])
+        url = f'/api/projects/{projects[0].id}/contributors/'
+        user_summaries.clear()
+        for label in ('froid', 'chaud'):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+            assert response.status_code == 200
+            print(f"Contributeurs ({len(response.data)}), cache {label} : {len(queries.captured_queries)} requêtes")
+    finally:
+        teardown_test_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
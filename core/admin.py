@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils.functional import cached_property
+
+from .db import estimate_row_count
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginateur de l'administration pour les grandes tables : le COUNT(*) est
+    borné à ADMIN_EXACT_COUNT_LIMIT lignes. Au-delà, une liste non filtrée
+    affiche l'estimation des statistiques du SGBD, une liste filtrée
+    s'arrête à la limite.
+    """
+
+    @cached_property
+    def count(self):
+        limit = settings.ADMIN_EXACT_COUNT_LIMIT
+        queryset = self.object_list
+        count = queryset.order_by()[:limit + 1].count()
+        if count <= limit:
+            return count
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate:
+                return max(estimate, count)
+        return count
+
+
+class ScalableAdminMixin:
+    """
+    Réglages de l'administration pour les tables de plusieurs millions de
+    lignes : nombre de résultats estimé et pas de second COUNT(*) du total.
+
+    Les search_fields sont recherchés par préfixe sans casse (notés '^champ'
+    comme dans Django), mais en intervalles (LOWER(champ) >= terme et
+    < terme + U+10FFFF, terme en minuscules) que les index B-tree sur
+    LOWER(champ) servent sous tous les SGBD, au lieu de LIKE. Un terme
+    numérique recherche aussi la clé primaire.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        search_fields = self.get_search_fields(request)
+        if not term or not search_fields:
+            return super().get_search_results(request, queryset, search_term)
+
+        lowered = term.lower()
+        condition = Q()
+        for index, field in enumerate(search_fields):
+            alias = f'_search_{index}'
+            queryset = queryset.alias(**{alias: Lower(field.lstrip('^'))})
+            condition |= Q(**{f'{alias}__gte': lowered, f'{alias}__lt': lowered + '\U0010ffff'})
+        if term.isdigit() and self.model._meta.pk.get_internal_type() in ('AutoField', 'BigAutoField'):
+            condition |= Q(pk=int(term))
+        return queryset.filter(condition), False
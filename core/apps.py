@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        # Réglages appliqués à chaque nouvelle connexion à la base
+        from django.db.backends.signals import connection_created
+        from .db import configure_connection
+        connection_created.connect(configure_connection, dispatch_uid='core.configure_connection')
+        # Vérifications de configuration (manage.py check, runserver, migrate)
+        from . import checks  # noqa: F401
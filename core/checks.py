@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+# Caches propres à chaque processus : une écriture n'y est pas visible des autres workers
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@register()
+def replica_sticky_cache_check(app_configs, **kwargs):
+    """
+    La lecture de ses propres écritures (core/routers.py) repose sur un
+    marqueur dans le cache : avec des réplicas, il doit être partagé par
+    tous les workers, sinon la requête suivante d'un utilisateur, servie par
+    un autre worker, lit un réplica en retard
+    """
+    if settings.DATABASE_REPLICAS and settings.CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHES:
+        return [Error(
+            "DB_REPLICAS est défini sans cache partagé : la lecture de ses propres "
+            "écritures ne vaut qu'au sein d'un même processus.",
+            hint="Définir REDIS_URL, ou ajouter core.E001 à SILENCED_SYSTEM_CHECKS pour un seul processus.",
+            id='core.E001',
+        )]
+    return []
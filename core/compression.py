@@ -0,0 +1,173 @@
+import re
+import zlib
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # dépendance optionnelle
+    zstandard = None
+
+
+# Types de contenu déjà compressés ou binaires : inutile de les recompresser
+COMPRESSIBLE_TYPES = re.compile(
+    r'^(text/|application/(json|.*\+json|javascript|xml|.*\+xml|vnd\.oai\.openapi))'
+)
+ACCEPT_ENCODING_RE = re.compile(r'^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*$')
+
+
+def _gzip_compressor():
+    # wbits=31 : en-tête et somme de contrôle gzip
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return (
+        compressor.compress,
+        lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush,
+    )
+
+
+def _brotli_compressor():
+    compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return compressor.process, compressor.flush, compressor.finish
+
+
+def _zstd_compressor():
+    compressor = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+    return (
+        compressor.compress,
+        lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+        compressor.flush,
+    )
+
+
+# Encodage -> fabrique de (compress, flush, finish) ; None si la bibliothèque manque
+CODECS = {
+    'br': _brotli_compressor if brotli is not None else None,
+    'zstd': _zstd_compressor if zstandard is not None else None,
+    'gzip': _gzip_compressor,
+}
+
+
+def available_encodings():
+    """Encodages activés (COMPRESSION_ENCODINGS) et disponibles, par ordre de préférence"""
+    return [name for name in settings.COMPRESSION_ENCODINGS if CODECS.get(name) is not None]
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Choisit l'encodage à partir de l'en-tête Accept-Encoding : les valeurs q
+    du client priment, l'ordre de COMPRESSION_ENCODINGS départage les ex aequo.
+    Retourne None si aucun encodage commun n'est accepté.
+    """
+    weights = {}
+    for part in accept_encoding.split(','):
+        match = ACCEPT_ENCODING_RE.match(part)
+        if match:
+            try:
+                weights[match[1].lower()] = float(match[2]) if match[2] else 1.0
+            except ValueError:
+                continue
+
+    best, best_weight = None, 0
+    for name in available_encodings():
+        weight = weights.get(name, weights.get('*', 0))
+        if weight > best_weight:
+            best, best_weight = name, weight
+    return best
+
+
+def compress(encoding, content):
+    """Compresse un contenu complet avec l'encodage donné"""
+    compress_chunk, _, finish = CODECS[encoding]()
+    return compress_chunk(content) + finish()
+
+
+def compress_stream(encoding, chunks):
+    """Compresse un flux morceau par morceau, chaque morceau étant envoyé aussitôt"""
+    compress_chunk, flush, finish = CODECS[encoding]()
+    for chunk in chunks:
+        data = compress_chunk(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+
+async def compress_async_stream(encoding, chunks):
+    """Variante de compress_stream pour les réponses en streaming asynchrones"""
+    compress_chunk, flush, finish = CODECS[encoding]()
+    async for chunk in chunks:
+        data = compress_chunk(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+
+def no_compression(view_func):
+    """
+    Désactive la compression des réponses d'une vue, pour celles qui renvoient
+    des secrets (jetons) à côté de données contrôlées par le client (BREACH)
+    """
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        return view_func(*args, **kwargs)
+
+    wrapper.compress_response = False
+    return wrapper
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compression négociée des réponses : brotli et zstd si les bibliothèques
+    sont installées, gzip sinon. Comme GZipMiddleware de Django, elle ignore
+    les réponses déjà encodées et, en plus, celles sous COMPRESSION_MIN_SIZE
+    ou d'un type non compressible. Les réponses en streaming sont compressées
+    au fil de l'eau, sans être mises en mémoire.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not getattr(view_func, 'compress_response', True):
+            request._compression_disabled = True
+
+    def process_response(self, request, response):
+        if getattr(request, '_compression_disabled', False) or response.has_header('Content-Encoding'):
+            return response
+        if not COMPRESSIBLE_TYPES.match(response.get('Content-Type', '')):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        # La représentation dépend de Accept-Encoding, même si l'on ne compresse pas
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_stream(encoding, response.streaming_content)
+            else:
+                response.streaming_content = compress_stream(encoding, response.streaming_content)
+            del response['Content-Length']
+        else:
+            compressed = compress(encoding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # Un ETag fort désigne la représentation non compressée
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,147 @@
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Value
+
+
+def configure_connection(sender, connection, **kwargs):
+    """
+    Applique les PRAGMA SQLite configurés (SQLITE_PRAGMAS) à l'ouverture
+    d'une connexion : WAL pour que les lectures ne soient plus bloquées
+    par les écritures, synchronous=NORMAL, busy_timeout et mmap_size.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def delete_in_chunks(queryset, chunk_size):
+    """
+    Supprime les lignes du queryset par lots de chunk_size clés primaires,
+    sans passer par le collecteur de Django (pas de chargement des objets
+    ni de signaux par ligne). Les dépendances doivent avoir été supprimées avant.
+    """
+    model = queryset.model
+    deleted = 0
+    while True:
+        pks = list(queryset.values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            return deleted
+        deleted += model.objects.using(queryset.db).filter(pk__in=pks)._raw_delete(queryset.db)
+
+
+def estimate_row_count(model, using='default'):
+    """
+    Nombre de lignes estimé d'une table à partir des statistiques du SGBD
+    (pg_class.reltuples sous PostgreSQL, sqlite_stat1 après ANALYZE sous
+    SQLite), sans la parcourir. Retourne None si aucune statistique n'existe.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+            row = cursor.fetchone()
+            return row[0] if row and row[0] > 0 else None
+        if connection.vendor == 'sqlite':
+            # sqlite_stat1 n'existe qu'après le premier ANALYZE
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s', [table])
+            counts = [int(stat.split()[0]) for stat, in cursor.fetchall()]
+            return max(counts) if counts else None
+    return None
+
+
+def copy_rows(queryset, target_model, **values):
+    """
+    Copie les lignes du queryset dans la table de target_model en un seul
+    INSERT ... SELECT, sans passer par Python : les colonnes communes aux
+    deux modèles sont recopiées telles quelles (identifiants et dates
+    compris) ; values fixe les autres champs de la cible. Retourne le
+    nombre de lignes copiées.
+    """
+    target_fields = {field.column: field for field in target_model._meta.concrete_fields}
+    source_fields = [
+        field for field in queryset.model._meta.concrete_fields
+        if field.column in target_fields and field.name not in values
+    ]
+    columns = [field.column for field in source_fields]
+    names = [field.attname for field in source_fields]
+    for name, value in values.items():
+        columns.append(target_model._meta.get_field(name).column)
+        names.append(f'_copy_{name}')
+        queryset = queryset.annotate(**{
+            f'_copy_{name}': Value(value, output_field=target_model._meta.get_field(name))
+        })
+
+    connection = connections[queryset.db]
+    select_sql, params = queryset.order_by().values_list(*names).query.sql_with_params()
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) {}'.format(
+        quote(target_model._meta.db_table), ', '.join(map(quote, columns)), select_sql
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def insert_select(queryset, target_model, **columns):
+    """
+    Insère dans la table de target_model une ligne par ligne du queryset, en
+    un seul INSERT ... SELECT sur la base d'écriture de target_model :
+    columns associe chaque champ de la cible à une expression (F, Value...)
+    évaluée sur le queryset. Retourne le nombre de lignes insérées.
+    """
+    using = router.db_for_write(target_model)
+    queryset = queryset.using(using).order_by().annotate(**{
+        f'_insert_{name}': expression for name, expression in columns.items()
+    })
+    connection = connections[using]
+    select_sql, params = queryset.values_list(*[f'_insert_{name}' for name in columns]).query.sql_with_params()
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) {}'.format(
+        quote(target_model._meta.db_table),
+        ', '.join(quote(target_model._meta.get_field(name).column) for name in columns),
+        select_sql,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def copy_rows_to(queryset, using, batch_size):
+    """
+    Copie les lignes du queryset, toutes colonnes comprises (identifiants et
+    dates inchangés), vers la même table d'une autre base, par lots de
+    batch_size. Contrairement à bulk_create, les champs auto_now ne sont
+    pas recalculés. Retourne le nombre de lignes copiées.
+    """
+    model = queryset.model
+    fields = model._meta.concrete_fields
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(model._meta.db_table),
+        ', '.join(quote(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)),
+    )
+    rows = queryset.order_by('pk').values_list(*[field.attname for field in fields]).iterator(chunk_size=batch_size)
+    copied = 0
+    batch = []
+    with connection.cursor() as cursor:
+        for row in rows:
+            batch.append([field.get_db_prep_save(value, connection) for field, value in zip(fields, row)])
+            if len(batch) >= batch_size:
+                cursor.executemany(sql, batch)
+                copied += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+            copied += len(batch)
+    return copied
@@ -0,0 +1,169 @@
+import hashlib
+import hmac
+import json
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+from .models import IdempotencyKey
+from .routers import current_shard
+
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "Cette clé d'idempotence a déjà été utilisée pour une autre requête."
+    default_code = 'idempotency_key_reused'
+
+
+class IdempotencyKeyInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Une requête avec cette clé d'idempotence est encore en cours."
+    default_code = 'idempotency_key_in_progress'
+
+    def __init__(self, wait):
+        super().__init__()
+        # Repris dans l'en-tête Retry-After par le gestionnaire d'exceptions de DRF
+        self.wait = wait
+
+
+def keyed_digest(value):
+    """
+    HMAC-SHA256 (clé SECRET_KEY) : les données des requêtes (dont le mot de
+    passe à l'inscription) ne sont pas retrouvables par force brute à partir
+    de la table des clés
+    """
+    return hmac.new(settings.SECRET_KEY.encode(), value.encode(), hashlib.sha256).hexdigest()
+
+
+def request_fingerprint(request):
+    """Empreinte de la requête (méthode, chemin, données) : une clé ne sert qu'à une requête"""
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    payload = json.dumps([request.method, request.get_full_path(), data], sort_keys=True, default=str)
+    return keyed_digest(payload)
+
+
+def request_scope(request):
+    """
+    Espace de noms des clés : l'utilisateur, ou pour un client anonyme son
+    adresse IP (X-Forwarded-For selon NUM_PROXIES), pour qu'un client ne
+    puisse ni rejouer ni bloquer la clé d'un autre
+    """
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f'anonymous:{keyed_digest(BaseThrottle().get_ident(request))[:40]}'
+
+
+def claim_key(scope, key, fingerprint):
+    """
+    Réserve la clé pour cette requête. Retourne (enregistrement, réservée) ;
+    réservée vaut False si la clé appartient déjà à une requête en cours ou
+    terminée. Une clé expirée, ou en cours depuis plus de
+    IDEMPOTENCY_LOCK_TIMEOUT (processus interrompu), est reprise par un
+    UPDATE conditionnel : une seule requête concurrente l'obtient.
+    """
+    now = timezone.now()
+    values = {
+        'fingerprint': fingerprint, 'status': 'PENDING', 'response_status': None, 'response_body': None,
+        'created_time': now, 'expires_at': now + timedelta(seconds=settings.IDEMPOTENCY_TTL),
+    }
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(scope=scope, key=key, **values), True
+    except IntegrityError:
+        record = IdempotencyKey.objects.get(scope=scope, key=key)
+
+    abandoned = (
+        record.status == 'PENDING'
+        and record.created_time < now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+    )
+    if record.expires_at <= now or abandoned:
+        claimed = IdempotencyKey.objects.filter(pk=record.pk, created_time=record.created_time).update(**values)
+        record.refresh_from_db()
+        if claimed:
+            return record, True
+    return record, False
+
+
+def wait_for_completion(record):
+    """Attend (au plus IDEMPOTENCY_WAIT secondes) la fin de la requête qui détient la clé"""
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT
+    delay = 0.05
+    while record.status == 'PENDING' and time.monotonic() < deadline:
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+        try:
+            record.refresh_from_db()
+        except IdempotencyKey.DoesNotExist:
+            # La requête d'origine a échoué et libéré la clé
+            return None
+    return record
+
+
+def idempotent(handler):
+    """
+    Rend une méthode de vue DRF (create, action POST) idempotente lorsque le
+    client envoie un en-tête Idempotency-Key.
+
+    La première requête s'exécute normalement ; sa réponse (2xx) est
+    enregistrée dans la même transaction que ses écritures. Les requêtes
+    suivantes avec la même clé reçoivent cette réponse sans revalidation ni
+    écriture ; une requête concurrente attend la fin de la première. Les
+    erreurs libèrent la clé, pour que le client puisse réessayer.
+    L'authentification et les permissions restent vérifiées à chaque fois.
+    """
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return handler(self, request, *args, **kwargs)
+        if len(key) > 255:
+            raise ValidationError({IDEMPOTENCY_HEADER: "Clé trop longue (255 caractères au plus)."})
+
+        scope = request_scope(request)
+        fingerprint = request_fingerprint(request)
+        record, claimed = claim_key(scope, key, fingerprint)
+
+        if not claimed:
+            if record.fingerprint != fingerprint:
+                raise IdempotencyKeyReused()
+            record = wait_for_completion(record)
+            if record is None:
+                return wrapper(self, request, *args, **kwargs)
+            if record.status == 'PENDING':
+                raise IdempotencyKeyInProgress(wait=settings.IDEMPOTENCY_WAIT)
+            return Response(
+                record.response_body, status=record.response_status, headers={REPLAYED_HEADER: 'true'}
+            )
+
+        try:
+            # La réponse est enregistrée sur la base principale, les écritures sur la partition du projet
+            with transaction.atomic(), transaction.atomic(using=current_shard()):
+                response = handler(self, request, *args, **kwargs)
+                if status.is_success(response.status_code):
+                    IdempotencyKey.objects.filter(pk=record.pk).update(
+                        status='COMPLETED', response_status=response.status_code, response_body=response.data
+                    )
+                    return response
+        except BaseException:
+            IdempotencyKey.objects.filter(pk=record.pk, status='PENDING').delete()
+            raise
+
+        # Réponse d'erreur renvoyée sans exception : la clé est libérée
+        IdempotencyKey.objects.filter(pk=record.pk, status='PENDING').delete()
+        return response
+
+    return wrapper
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.schema import build_schema_files
+
+
+class Command(BaseCommand):
+    help = "Précalcule le schéma OpenAPI (YAML/JSON, gzip) pour la version courante du code"
+
+    def handle(self, *args, **options):
+        version = build_schema_files()
+        self.stdout.write(self.style.SUCCESS(f"Schéma OpenAPI généré (version {version})."))
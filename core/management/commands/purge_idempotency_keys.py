@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.db import delete_in_chunks
+from core.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Supprime les clés d'idempotence expirées (à planifier, ex. une fois par heure)"
+
+    def handle(self, *args, **options):
+        deleted = delete_in_chunks(
+            IdempotencyKey.objects.filter(expires_at__lte=timezone.now()),
+            settings.DELETION_CHUNK_SIZE
+        )
+        self.stdout.write(self.style.SUCCESS(f"{deleted} clé(s) d'idempotence supprimée(s)."))
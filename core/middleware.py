@@ -0,0 +1,136 @@
+import random
+import threading
+import time
+from contextlib import ExitStack
+from functools import partial
+
+from django.conf import settings
+from django.db import connections
+from django.http import JsonResponse
+from .routers import route_reads_to, reset_reads, choose_replica, mark_recent_write, has_recent_write
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def get_request_user_id(request):
+    """
+    Identifiant de l'utilisateur de la requête sans requête SQL : lu dans le
+    jeton JWT (l'authentification DRF n'a lieu qu'au niveau de la vue),
+    sinon dans la session (administration)
+    """
+    # Import local : Simple JWT n'est chargé que si des réplicas sont configurés
+    from rest_framework.exceptions import AuthenticationFailed
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+    from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is not None:
+        raw_token = authentication.get_raw_token(header)
+        if raw_token is not None:
+            try:
+                token = authentication.get_validated_token(raw_token)
+            except (InvalidToken, TokenError, AuthenticationFailed):
+                return None
+            return token.get(jwt_settings.USER_ID_CLAIM)
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    return None
+
+
+class ReplicaPinningMiddleware:
+    """
+    Choisit la base de lecture de la requête : un réplica, ou la base
+    principale pour les requêtes d'écriture et pour un utilisateur qui vient
+    d'écrire (lecture de ses propres écritures pendant REPLICA_STICKY_SECONDS)
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        user_id = get_request_user_id(request)
+        is_write = request.method not in SAFE_METHODS
+        pinned = is_write or (user_id is not None and has_recent_write(user_id))
+
+        token = route_reads_to('default' if pinned else choose_replica())
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_reads(token)
+
+        if is_write and user_id is not None and response.status_code < 400:
+            mark_recent_write(user_id)
+        return response
+
+
+class LoadSheddingMiddleware:
+    """
+    Délestage adaptatif : répond 503 avec Retry-After quand le processus a
+    trop de requêtes en cours (LOAD_SHEDDING_MAX_IN_FLIGHT) ou quand la
+    latence moyenne des requêtes SQL (moyenne mobile exponentielle, une par
+    base : principale, réplicas, partitions) dépasse
+    LOAD_SHEDDING_MAX_DB_LATENCY_MS sur l'une d'elles. Dans ce second cas,
+    une part des requêtes, proportionnelle au dépassement, est refusée ; au
+    moins 10 % passent toujours pour continuer à mesurer la latence.
+
+    Seules les requêtes SQL exécutées dans le thread de la requête sont
+    mesurées : celles des threads de core.sharding.fan_out ne le sont pas.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.db_latency_ms = {}
+
+    def _record_query(self, alias, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self.lock:
+                latency = self.db_latency_ms.get(alias, 0.0)
+                self.db_latency_ms[alias] = latency + 0.1 * (elapsed - latency)
+
+    def _should_shed(self):
+        if self.in_flight >= settings.LOAD_SHEDDING_MAX_IN_FLIGHT:
+            return True
+        threshold = settings.LOAD_SHEDDING_MAX_DB_LATENCY_MS
+        latency = max(self.db_latency_ms.values(), default=0.0)
+        if latency > threshold:
+            overload = (latency - threshold) / threshold
+            return random.random() < min(0.9, overload)
+        return False
+
+    def __call__(self, request):
+        if not settings.LOAD_SHEDDING_ENABLED:
+            return self.get_response(request)
+
+        with self.lock:
+            shed = self._should_shed()
+            if not shed:
+                self.in_flight += 1
+        if shed:
+            response = JsonResponse(
+                {'detail': "Service momentanément surchargé, veuillez réessayer."},
+                status=503
+            )
+            response['Retry-After'] = str(settings.LOAD_SHEDDING_RETRY_AFTER)
+            return response
+
+        try:
+            with ExitStack() as stack:
+                for alias in settings.DATABASES:
+                    stack.enter_context(connections[alias].execute_wrapper(partial(self._record_query, alias)))
+                return self.get_response(request)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-19 04:59
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=64, verbose_name='Portée')),
+                ('key', models.CharField(max_length=255, verbose_name='Clé')),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='Empreinte de la requête')),
+                ('status', models.CharField(choices=[('PENDING', 'En cours'), ('COMPLETED', 'Terminée')], default='PENDING', max_length=10, verbose_name='Statut')),
+                ('response_status', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Code de la réponse')),
+                ('response_body', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='Corps de la réponse')),
+                ('created_time', models.DateTimeField(default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField(verbose_name='Expire le')),
+            ],
+            options={
+                'verbose_name': "Clé d'idempotence",
+                'verbose_name_plural': "Clés d'idempotence",
+                'indexes': [models.Index(fields=['expires_at'], name='idempotency_expires_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='idempotencykey',
+            constraint=models.UniqueConstraint(fields=('scope', 'key'), name='idempotency_scope_key_uniq'),
+        ),
+    ]
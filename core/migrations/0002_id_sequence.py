@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdSequence',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Nom')),
+                ('next_id', models.BigIntegerField(verbose_name='Prochain identifiant libre')),
+            ],
+            options={
+                'verbose_name': "Séquence d'identifiants",
+                'verbose_name_plural': "Séquences d'identifiants",
+            },
+        ),
+    ]
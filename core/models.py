@@ -0,0 +1,81 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class IdempotencyKey(models.Model):
+    """
+    Clé d'idempotence (en-tête Idempotency-Key) d'une requête d'écriture et
+    réponse enregistrée, rejouée telle quelle aux nouvelles tentatives du client
+    (voir core/idempotency.py)
+    """
+
+    STATUS_CHOICES = [
+        ('PENDING', 'En cours'),
+        ('COMPLETED', 'Terminée'),
+    ]
+
+    scope = models.CharField(
+        max_length=64,
+        verbose_name="Portée"
+    )
+    key = models.CharField(
+        max_length=255,
+        verbose_name="Clé"
+    )
+    fingerprint = models.CharField(
+        max_length=64,
+        verbose_name="Empreinte de la requête"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='PENDING',
+        verbose_name="Statut"
+    )
+    response_status = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Code de la réponse"
+    )
+    response_body = models.JSONField(
+        null=True,
+        blank=True,
+        encoder=DjangoJSONEncoder,
+        verbose_name="Corps de la réponse"
+    )
+    # Remis à jour lorsqu'une clé expirée ou abandonnée est reprise
+    created_time = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(verbose_name="Expire le")
+
+    class Meta:
+        verbose_name = "Clé d'idempotence"
+        verbose_name_plural = "Clés d'idempotence"
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='idempotency_scope_key_uniq'),
+        ]
+        indexes = [
+            # Purge des clés expirées
+            models.Index(fields=['expires_at'], name='idempotency_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.key} ({self.status})"
+
+
+class IdSequence(models.Model):
+    """
+    Séquence d'identifiants commune à toutes les partitions (voir
+    core/sharding.py) : chaque processus en réserve des blocs, pour que les
+    identifiants restent uniques quand un projet change de base
+    """
+    name = models.CharField(
+        max_length=100,
+        primary_key=True,
+        verbose_name="Nom"
+    )
+    next_id = models.BigIntegerField(verbose_name="Prochain identifiant libre")
+
+    class Meta:
+        verbose_name = "Séquence d'identifiants"
+        verbose_name_plural = "Séquences d'identifiants"
@@ -0,0 +1,147 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+ROUTED_APP_LABELS = {'accounts', 'projects'}
+STICKY_CACHE_PREFIX = 'replica-sticky'
+
+# Modèles partitionnés par projet, et annuaire qui reste sur la base principale
+SHARDED_APP_LABELS = {'projects'}
+DIRECTORY_MODELS = {'projectlocation', 'membership'}
+
+# Base de lecture choisie pour la requête en cours (None hors requête)
+_read_alias = ContextVar('read_alias', default=None)
+
+# Partition du projet traité (None : base principale)
+_shard_alias = ContextVar('shard_alias', default=None)
+
+
+def route_reads_to(alias):
+    """Envoie toutes les lectures sur alias jusqu'à reset_reads(token)"""
+    return _read_alias.set(alias)
+
+
+def reset_reads(token):
+    _read_alias.reset(token)
+
+
+def use_shard(alias):
+    """Envoie les requêtes des modèles partitionnés sur alias jusqu'à reset_shard(token)"""
+    return _shard_alias.set(alias)
+
+
+def reset_shard(token):
+    _shard_alias.reset(token)
+
+
+@contextmanager
+def on_shard(alias):
+    token = use_shard(alias)
+    try:
+        yield alias
+    finally:
+        reset_shard(token)
+
+
+def current_shard():
+    """Base des modèles partitionnés dans le contexte courant"""
+    return _shard_alias.get() or 'default'
+
+
+def choose_replica():
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+def sticky_cache_key(user_id):
+    return f'{STICKY_CACHE_PREFIX}:{user_id}'
+
+
+def mark_recent_write(user_id):
+    """Lecture de ses propres écritures : l'utilisateur lit sur la base principale pendant REPLICA_STICKY_SECONDS"""
+    cache.set(sticky_cache_key(user_id), time.time(), timeout=settings.REPLICA_STICKY_SECONDS)
+
+
+def has_recent_write(user_id):
+    return cache.get(sticky_cache_key(user_id)) is not None
+
+
+class ReplicaRouter:
+    """
+    Routeur de bases de données : les lectures des modèles des applications
+    accounts et projects partent sur un réplica (DATABASE_REPLICAS), les
+    écritures sur la base principale. Pendant une requête, toutes les lectures
+    utilisent la même base, choisie par ReplicaPinningMiddleware. Hors requête
+    (worker, commandes de gestion), les lectures restent sur la base
+    principale : effacement, archivage ou rééquilibrage ne doivent pas agir
+    sur des données en retard.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in ROUTED_APP_LABELS:
+            return None
+        return _read_alias.get() or 'default'
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in ROUTED_APP_LABELS:
+            return None
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Principale et réplicas contiennent les mêmes données
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Les réplicas reçoivent leur schéma par réplication
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ShardRouter:
+    """
+    Routeur du partitionnement horizontal (DATABASE_SHARDS) : les modèles de
+    l'application projects vont sur la partition du contexte courant
+    (on_shard(), posé par les vues d'après le projet de l'URL) ou sur celle
+    de l'objet manipulé ; l'annuaire reste sur la base principale. Sans
+    partitions, le routeur s'efface devant ReplicaRouter.
+    """
+
+    def _is_sharded(self, model):
+        return bool(settings.DATABASE_SHARDS) and model._meta.app_label in SHARDED_APP_LABELS
+
+    def _db(self, model, **hints):
+        if not self._is_sharded(model):
+            return None
+        if model._meta.model_name in DIRECTORY_MODELS:
+            return 'default'
+        # Un objet partitionné déjà chargé reste sur sa base (pas un utilisateur lié)
+        instance = hints.get('instance')
+        if (
+            instance is not None and instance._state.db in settings.DATABASE_SHARDS
+            and self._is_sharded(type(instance)) and instance._meta.model_name not in DIRECTORY_MODELS
+        ):
+            return instance._state.db
+        return current_shard()
+
+    db_for_read = _db
+    db_for_write = _db
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Les utilisateurs sont recopiés sur les partitions où ils contribuent
+        if settings.DATABASE_SHARDS and 'accounts' in (obj1._meta.app_label, obj2._meta.app_label):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Toutes les bases ont le même schéma, sauf l'annuaire (base principale seule)
+        if db in settings.DATABASE_SHARDS and app_label in SHARDED_APP_LABELS and model_name in DIRECTORY_MODELS:
+            return db == 'default'
+        return None
@@ -0,0 +1,136 @@
+import gzip
+import hashlib
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from django.views import View
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+from .compression import negotiate_encoding
+
+
+# Applications dont le code décrit l'API (et donc le schéma)
+SCHEMA_SOURCE_PACKAGES = ('softdesk_api', 'core', 'accounts', 'projects', 'jobs')
+
+FORMATS = {
+    'yaml': ('application/vnd.oai.openapi', OpenApiYamlRenderer),
+    'json': ('application/vnd.oai.openapi+json', OpenApiJsonRenderer),
+}
+
+_lock = threading.Lock()
+_artifacts = {}
+
+
+def schema_version():
+    """
+    Version du code servant de clé au schéma : SCHEMA_CODE_VERSION si défini
+    (ex. le commit déployé), sinon une empreinte des sources Python de l'API
+    """
+    if settings.SCHEMA_CODE_VERSION:
+        return settings.SCHEMA_CODE_VERSION
+    digest = hashlib.sha1(spectacular_settings.VERSION.encode())
+    for package in SCHEMA_SOURCE_PACKAGES:
+        for path in sorted((Path(settings.BASE_DIR) / package).rglob('*.py')):
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _cache_path(version, fmt, compressed=False):
+    return Path(settings.SCHEMA_CACHE_DIR) / f"schema-{version}.{fmt}{'.gz' if compressed else ''}"
+
+
+def render_schema():
+    """Génère le schéma et retourne {(format, compressé): contenu}"""
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    contents = {}
+    for fmt, (media_type, renderer_class) in FORMATS.items():
+        content = renderer_class().render(schema, media_type, renderer_context={})
+        contents[(fmt, False)] = content
+        contents[(fmt, True)] = gzip.compress(content, compresslevel=9)
+    return contents
+
+
+def build_schema_files(version=None, contents=None):
+    """Écrit le schéma sur disque (YAML et JSON, bruts et gzip) et retourne la version"""
+    version = version or schema_version()
+    contents = contents or render_schema()
+    cache_dir = Path(settings.SCHEMA_CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for (fmt, compressed), content in contents.items():
+        _cache_path(version, fmt, compressed).write_bytes(content)
+
+    # Les schémas des versions précédentes ne servent plus
+    for old in cache_dir.glob('schema-*'):
+        if not old.name.startswith(f'schema-{version}.'):
+            old.unlink()
+    return version
+
+
+def get_schema_artifacts():
+    """
+    Schéma précalculé en mémoire pour la version courante du code : lu sur
+    disque s'il a été construit (commande build_schema), sinon généré une fois
+    et écrit sur disque si possible
+    """
+    with _lock:
+        if not _artifacts:
+            version = schema_version()
+            if _cache_path(version, 'json').exists():
+                contents = {
+                    (fmt, compressed): _cache_path(version, fmt, compressed).read_bytes()
+                    for fmt in FORMATS for compressed in (False, True)
+                }
+            else:
+                contents = render_schema()
+                try:
+                    build_schema_files(version, contents)
+                except OSError:
+                    pass
+            for fmt in FORMATS:
+                # Un ETag fort par représentation (identité, gzip)
+                _artifacts[fmt] = {
+                    'etag': f'"{version}-{fmt}"',
+                    'gzip_etag': f'"{version}-{fmt}-gzip"',
+                    'raw': contents[(fmt, False)],
+                    'gzip': contents[(fmt, True)],
+                }
+        return _artifacts
+
+
+class CachedSchemaView(View):
+    """
+    Sert le schéma OpenAPI précalculé (YAML par défaut, JSON avec ?format=json
+    ou Accept JSON), avec ETag, réponse 304 et version gzip précompressée
+    """
+
+    def get(self, request, *args, **kwargs):
+        accept = request.META.get('HTTP_ACCEPT', '')
+        fmt = request.GET.get('format')
+        if fmt not in FORMATS:
+            fmt = 'json' if 'json' in accept else 'yaml'
+        artifact = get_schema_artifacts()[fmt]
+
+        # Négociation commune au middleware de compression (valeurs q comprises) ;
+        # sans gzip précompressé, le middleware peut encore compresser (br, zstd)
+        gzipped = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', '')) == 'gzip'
+        etag = artifact['gzip_etag'] if gzipped else artifact['etag']
+
+        # Comparaison faible (If-None-Match) : W/ ajouté par le middleware ignoré
+        client_etags = {tag.removeprefix('W/') for tag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))}
+        if etag in client_etags or '*' in client_etags:
+            response = HttpResponseNotModified()
+        elif gzipped:
+            response = HttpResponse(artifact['gzip'], content_type=FORMATS[fmt][0])
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(artifact['raw'], content_type=FORMATS[fmt][0])
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, max-age=300'
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+        return response
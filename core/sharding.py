@@ -0,0 +1,112 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Max
+
+from .models import IdSequence
+
+
+_blocks = {}
+_blocks_lock = threading.Lock()
+
+
+def sharding_enabled():
+    return bool(settings.DATABASE_SHARDS)
+
+
+def _reserve_block(model, shared_with):
+    """Réserve SHARD_ID_BLOCK_SIZE identifiants par un UPDATE conditionnel sur la base principale"""
+    name = model._meta.label_lower
+    size = settings.SHARD_ID_BLOCK_SIZE
+    while True:
+        start = IdSequence.objects.filter(pk=name).values_list('next_id', flat=True).first()
+        if start is None:
+            # Première réservation : au-delà des identifiants déjà présents sur toutes les bases
+            start = max(
+                other.objects.using(alias).aggregate(max_id=Max('pk'))['max_id'] or 0
+                for other in (model, *shared_with)
+                for alias in settings.DATABASE_SHARDS
+            ) + 1
+            try:
+                with transaction.atomic(using='default'):
+                    IdSequence.objects.create(name=name, next_id=start + size)
+                return start, start + size
+            except IntegrityError:
+                continue
+        if IdSequence.objects.filter(pk=name, next_id=start).update(next_id=start + size):
+            return start, start + size
+
+
+def allocate_id(model, shared_with=()):
+    """
+    Identifiant unique sur toutes les partitions pour un nouvel objet de
+    model, tiré d'un bloc réservé par ce processus (une écriture sur la base
+    principale tous les SHARD_ID_BLOCK_SIZE objets). shared_with : modèles
+    qui partagent ses identifiants (tables d'archive).
+    """
+    with _blocks_lock:
+        next_id, end = _blocks.get(model, (0, 0))
+        if next_id >= end:
+            next_id, end = _reserve_block(model, shared_with)
+        _blocks[model] = (next_id + 1, end)
+        return next_id
+
+
+def fan_out(func, aliases):
+    """
+    Appelle func(alias) sur chaque base en parallèle (au plus
+    SHARD_FANOUT_WORKERS à la fois) et retourne {alias: résultat}. Chaque
+    fil ferme ses connexions en terminant.
+    """
+    aliases = list(aliases)
+    if len(aliases) <= 1:
+        return {alias: func(alias) for alias in aliases}
+
+    def call(alias):
+        try:
+            return func(alias)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=min(len(aliases), settings.SHARD_FANOUT_WORKERS)) as executor:
+        return dict(zip(aliases, executor.map(call, aliases)))
+
+
+class MergedQuerySet:
+    """
+    Même requête sur plusieurs bases, lue comme une seule par la pagination
+    par curseur de DRF : order_by() et filter() s'appliquent à la requête de
+    chaque base ; une tranche [début:fin] lit au plus fin lignes par base, en
+    parallèle, puis les fusionne dans l'ordre demandé (départager les ex
+    aequo, par exemple par identifiant, pour un ordre stable).
+    """
+
+    def __init__(self, querysets, ordering=()):
+        # {alias: requête déjà liée à sa base (using)}
+        self.querysets = dict(querysets)
+        self.ordering = tuple(ordering)
+
+    def filter(self, *args, **kwargs):
+        return MergedQuerySet(
+            {alias: queryset.filter(*args, **kwargs) for alias, queryset in self.querysets.items()}, self.ordering
+        )
+
+    def order_by(self, *fields):
+        return MergedQuerySet(
+            {alias: queryset.order_by(*fields) for alias, queryset in self.querysets.items()}, fields
+        )
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.stop is None or key.step is not None:
+            raise TypeError("Seules les tranches bornées [début:fin] sont prises en charge.")
+        rows = [
+            row for shard_rows in fan_out(lambda alias: list(self.querysets[alias][:key.stop]), self.querysets).values()
+            for row in shard_rows
+        ]
+        # Tris stables du dernier critère au premier
+        for field in reversed(self.ordering):
+            rows.sort(key=attrgetter(field.lstrip('-')), reverse=field.startswith('-'))
+        return rows[key.start or 0:key.stop]
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.db import connections
+
+
+def preload():
+    """
+    Charge au démarrage du processus ce que la première requête chargerait :
+    URLconf (et donc vues, serializers, permissions) et schéma OpenAPI.
+    Avec gunicorn --preload, ce travail est fait une seule fois dans le
+    processus maître et partagé par les workers forkés.
+    """
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    resolver.reverse_dict  # noqa: B018 - remplit les tables de résolution
+
+    if settings.ENABLE_API_DOCS:
+        from .schema import get_schema_artifacts
+        get_schema_artifacts()
+
+    # Aucune connexion ne doit être héritée par les processus forkés
+    connections.close_all()
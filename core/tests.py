@@ -0,0 +1,274 @@
+import hashlib
+import json
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from core.models import IdempotencyKey
+from projects.models import Project, Contributor, Issue, Comment, new_comment_id
+from .checks import replica_sticky_cache_check
+from .middleware import LoadSheddingMiddleware
+from .routers import route_reads_to, reset_reads
+from .uuids import uuid7, uuid7_from_time, uuid7_time
+
+
+def queries_by_alias(func):
+    """Exécute func et retourne (résultat, {alias: nombre de requêtes})"""
+    contexts = {alias: CaptureQueriesContext(connections[alias]) for alias in ('default', 'replica_1')}
+    for context in contexts.values():
+        context.__enter__()
+    try:
+        result = func()
+    finally:
+        for context in contexts.values():
+            context.__exit__(None, None, None)
+    return result, {alias: len(context) for alias, context in contexts.items() if len(context)}
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Routage des lectures vers un réplica (miroir de la base de test
+    principale) : les requêtes SQL sont comptées par base
+    """
+    databases = {'default', 'replica_1'}
+
+    def setUp(self):
+        cache.clear()
+        self.author, self.reader = [
+            User.objects.create_user(
+                username=username, password='pw12345!', email=f'{username}@example.com',
+                birth_date=date(1990, 1, 1)
+            )
+            for username in ('author', 'reader')
+        ]
+        project = Project.objects.create(name='Projet', description='d', type='BACKEND', author=self.author)
+        Contributor.objects.create(user=self.reader, project=project)
+        issue = Issue.objects.create(
+            name='Issue', description='d', tag='BUG', priority='LOW', status='TO_DO',
+            project=project, author=self.author
+        )
+        Comment.objects.create(description='Premier', issue=issue, author=self.author)
+        self.url = f'/api/projects/{project.pk}/issues/{issue.pk}/comments/'
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(router.db_for_read(Issue), 'default')
+        self.assertEqual(router.db_for_read(User), 'default')
+        _, used = queries_by_alias(lambda: list(Comment.objects.all()))
+        self.assertEqual(set(used), {'default'})
+
+    def test_pinned_reads_use_chosen_alias(self):
+        token = route_reads_to('replica_1')
+        try:
+            self.assertEqual(router.db_for_read(Issue), 'replica_1')
+        finally:
+            reset_reads(token)
+        self.assertEqual(router.db_for_write(Issue), 'default')
+
+    def test_safe_request_reads_from_replica(self):
+        response, used = queries_by_alias(lambda: self.client_for(self.reader).get(self.url))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(used), {'replica_1'})
+
+    def test_write_goes_to_primary(self):
+        response, used = queries_by_alias(
+            lambda: self.client_for(self.reader).post(self.url, {'description': 'Tout juste publié'})
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(set(used), {'default'})
+
+    def test_writer_reads_own_writes_on_primary(self):
+        writer = self.client_for(self.reader)
+        self.assertEqual(writer.post(self.url, {'description': 'Tout juste publié'}).status_code, 201)
+
+        response, used = queries_by_alias(lambda: writer.get(self.url))
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(set(used), {'default'})
+
+        _, used = queries_by_alias(lambda: self.client_for(self.author).get(self.url))
+        self.assertEqual(set(used), {'replica_1'})
+
+    @override_settings(REPLICA_STICKY_SECONDS=0)
+    def test_stickiness_expires(self):
+        writer = self.client_for(self.reader)
+        self.assertEqual(writer.post(self.url, {'description': 'Tout juste publié'}).status_code, 201)
+        _, used = queries_by_alias(lambda: writer.get(self.url))
+        self.assertEqual(set(used), {'replica_1'})
+
+
+
+class ReplicaStickyCacheCheckTests(SimpleTestCase):
+    """Des réplicas sans cache partagé empêchent le démarrage (core.E001)"""
+
+    @override_settings(DATABASE_REPLICAS=['replica_1'])
+    def test_replicas_with_local_cache_fail(self):
+        errors = replica_sticky_cache_check(None)
+        self.assertEqual([error.id for error in errors], ['core.E001'])
+
+    @override_settings(DATABASE_REPLICAS=['replica_1'], CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://localhost:6379/0',
+    }})
+    def test_replicas_with_shared_cache_pass(self):
+        self.assertEqual(replica_sticky_cache_check(None), [])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_pass(self):
+        self.assertEqual(replica_sticky_cache_check(None), [])
+
+
+class LoadSheddingTests(TestCase):
+    """Latence SQL mesurée base par base"""
+    databases = {'default', 'shard_1'}
+
+    def test_latency_is_tracked_per_alias(self):
+        def view(request):
+            with connections['shard_1'].cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return HttpResponse()
+
+        middleware = LoadSheddingMiddleware(view)
+        middleware(RequestFactory().get('/'))
+        self.assertEqual(set(middleware.db_latency_ms), {'shard_1'})
+
+    @override_settings(LOAD_SHEDDING_MAX_DB_LATENCY_MS=1)
+    def test_slow_alias_sheds(self):
+        middleware = LoadSheddingMiddleware(lambda request: HttpResponse())
+        middleware.db_latency_ms = {'default': 0.0, 'shard_1': 100.0}
+        self.assertEqual(middleware(RequestFactory().get('/')).status_code, 503)
+
+
+class AdminSearchTests(TestCase):
+    """Recherche par préfixe de l'administration, sans casse comme '^' dans Django"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin', password=None, email='admin@example.com', birth_date=date(1990, 1, 1)
+        )
+        self.client.force_login(self.admin)
+        for username in ('Dupont', 'dupuis', 'martin'):
+            User.objects.create_user(username=username, password=None, birth_date=date(1990, 1, 1))
+
+    def search(self, term):
+        response = self.client.get('/admin/accounts/user/', {'q': term})
+        self.assertEqual(response.status_code, 200)
+        return sorted(user.username for user in response.context['cl'].result_list)
+
+    def test_prefix_search_ignores_case(self):
+        self.assertEqual(self.search('dupont'), ['Dupont'])
+        self.assertEqual(self.search('DUP'), ['Dupont', 'dupuis'])
+        self.assertEqual(self.search('tin'), [])
+
+class CachedSchemaViewTests(TestCase):
+    """Négociation de l'encodage du schéma précalculé et ETag par représentation"""
+    url = '/api/schema/?format=json'
+
+    def test_gzip_refused_with_zero_quality(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn(b'"openapi"', response.content)
+
+    def test_etag_differs_per_encoding(self):
+        gzipped = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        raw = self.client.get(self.url, HTTP_ACCEPT_ENCODING='identity')
+        self.assertEqual(gzipped['Content-Encoding'], 'gzip')
+        self.assertNotEqual(gzipped['ETag'], raw['ETag'])
+        self.assertIn('Accept-Encoding', gzipped['Vary'])
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=gzipped['ETag'])
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='identity', HTTP_IF_NONE_MATCH=gzipped['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+
+class IdempotencyTests(TestCase):
+    """Clés d'idempotence des clients anonymes (inscription)"""
+    url = '/api/auth/register/'
+    data = {
+        'username': 'zed', 'email': 'zed@example.com', 'password': 'Sup3r!secret',
+        'password_confirm': 'Sup3r!secret', 'birth_date': '1990-01-01',
+    }
+
+    def setUp(self):
+        cache.clear()
+
+    def register(self, address):
+        return self.client.post(
+            self.url, self.data, content_type='application/json',
+            HTTP_IDEMPOTENCY_KEY='inscription-1', REMOTE_ADDR=address
+        )
+
+    def test_replayed_for_same_client_only(self):
+        self.assertEqual(self.register('10.0.0.1').status_code, 201)
+        replayed = self.register('10.0.0.1')
+        self.assertEqual((replayed.status_code, replayed['Idempotent-Replayed']), (201, 'true'))
+
+        # Même clé depuis un autre client : requête exécutée pour lui (nom déjà pris)
+        other = self.register('10.0.0.2')
+        self.assertEqual(other.status_code, 400)
+        self.assertFalse(other.has_header('Idempotent-Replayed'))
+        self.assertEqual(User.objects.filter(username='zed').count(), 1)
+
+    def test_stored_fingerprint_does_not_expose_the_password(self):
+        self.register('10.0.0.1')
+        record = IdempotencyKey.objects.get()
+        self.assertTrue(record.scope.startswith('anonymous:'))
+        self.assertNotIn('10.0.0.1', record.scope)
+        plain = hashlib.sha256(json.dumps(
+            ['POST', self.url, self.data], sort_keys=True, default=str
+        ).encode()).hexdigest()
+        self.assertNotEqual(record.fingerprint, plain)
+
+
+class UUID7Tests(SimpleTestCase):
+    """Identifiants UUIDv7 ordonnés dans le temps"""
+
+    def test_monotonic_within_a_millisecond(self):
+        with mock.patch('core.uuids._last', 0), \
+                mock.patch('core.uuids.time.time_ns', return_value=1_700_000_000_000_000_000):
+            values = [uuid7() for _ in range(1000)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), len(values))
+        self.assertEqual({uuid7_time(value) for value in values}, {1_700_000_000_000})
+
+    def test_monotonic_when_clock_goes_back(self):
+        first = uuid7()
+        with mock.patch('core.uuids.time.time_ns', return_value=0):
+            self.assertGreater(uuid7(), first)
+
+    def test_version_and_variant_bits(self):
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+        for bound in (uuid7_from_time(timezone.now()), uuid7_from_time(timezone.now(), upper=True)):
+            self.assertEqual((bound.version, bound.variant), (7, uuid.RFC_4122))
+
+    def test_time_round_trip(self):
+        moment = datetime(2026, 10, 19, 12, 30, 15, 123000, tzinfo=dt_timezone.utc)
+        millis = int(moment.timestamp() * 1000)
+        lower, upper = uuid7_from_time(moment), uuid7_from_time(moment, upper=True)
+        self.assertEqual((uuid7_time(lower), uuid7_time(upper)), (millis, millis))
+        with mock.patch('core.uuids._last', 0), \
+                mock.patch('core.uuids.time.time_ns', return_value=millis * 1_000_000):
+            value = uuid7()
+        self.assertTrue(lower <= value <= upper)
+
+    def test_comment_ids_fall_back_to_uuid4(self):
+        self.assertEqual(new_comment_id().version, 7)
+        with override_settings(COMMENT_TIME_ORDERED_IDS=False):
+            self.assertEqual(new_comment_id().version, 4)
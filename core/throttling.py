@@ -0,0 +1,102 @@
+import logging
+import time
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+logger = logging.getLogger(__name__)
+
+# Utilisé si le cache partagé est indisponible (limites alors propres au processus)
+_fallback_cache = LocMemCache('throttle-fallback', {})
+
+
+def parse_rate(rate):
+    """'10/min' -> (capacité, jetons rechargés par seconde)"""
+    num, period = rate.split('/')
+    capacity = int(num)
+    seconds = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+    return capacity, capacity / seconds
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Limitation par seau à jetons : la capacité du taux ('10/min') absorbe les
+    rafales, puis les jetons se rechargent en continu. L'état est stocké dans
+    le cache partagé (repli en mémoire s'il est indisponible). Les méthodes
+    de lecture ne sont pas limitées.
+
+    La limite est approximative : l'état est lu, recalculé puis réécrit sans
+    opération atomique, si bien que des requêtes simultanées sur un même
+    seau peuvent lire le même solde et passer toutes, jusqu'à une requête de
+    plus par requête concurrente.
+
+    Le taux est lu dans DEFAULT_THROTTLE_RATES pour le throttle_scope de la vue.
+    """
+    kind = None
+
+    def get_ident_key(self, request, view):
+        """Identifiant limité (utilisateur, adresse IP...) ou None pour ne pas limiter"""
+        raise NotImplementedError
+
+    def _get(self, key):
+        try:
+            return cache.get(key)
+        except Exception:
+            logger.warning("Cache partagé indisponible, limitation en mémoire", exc_info=True)
+            return _fallback_cache.get(key)
+
+    def _set(self, key, value, timeout):
+        try:
+            cache.set(key, value, timeout)
+        except Exception:
+            _fallback_cache.set(key, value, timeout)
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+        scope = getattr(view, 'throttle_scope', None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        ident = self.get_ident_key(request, view)
+        if rate is None or ident is None:
+            return True
+
+        capacity, refill = parse_rate(rate)
+        key = f'throttle:{scope}:{self.kind}:{ident}'
+        now = time.time()
+        tokens, updated = self._get(key) or (capacity, now)
+        tokens = min(capacity, tokens + (now - updated) * refill)
+
+        if tokens < 1:
+            self.retry_after = (1 - tokens) / refill
+            return False
+        self._set(key, (tokens - 1, now), timeout=int(capacity / refill) + 1)
+        return True
+
+    def wait(self):
+        return getattr(self, 'retry_after', None)
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Seau par adresse IP (X-Forwarded-For selon NUM_PROXIES)"""
+    kind = 'ip'
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Seau par utilisateur : l'utilisateur authentifié, ou pour la connexion
+    le nom d'utilisateur visé (limite les essais sur un même compte)
+    """
+    kind = 'user'
+
+    def get_ident_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        return username.lower() if isinstance(username, str) and username else None
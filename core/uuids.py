@@ -0,0 +1,53 @@
+import os
+import threading
+import time
+import uuid
+
+
+_lock = threading.Lock()
+_last = 0
+
+_RANDOM_BITS = 74
+_RANDOM_MASK = (1 << _RANDOM_BITS) - 1
+
+
+def uuid7():
+    """
+    UUID version 7 (RFC 9562) : horodatage Unix en millisecondes sur les 48
+    premiers bits, puis 74 bits aléatoires. Les identifiants générés se
+    suivent dans l'ordre de création (à la milliseconde près entre processus,
+    strictement dans un même processus), ce qui garde les insertions en fin
+    d'index et rend les plages de clés primaires proches dans le temps.
+    """
+    global _last
+    timestamp = time.time_ns() // 1_000_000
+    value = (timestamp << _RANDOM_BITS) | int.from_bytes(os.urandom(10), 'big') & _RANDOM_MASK
+    with _lock:
+        # Même milliseconde (ou horloge revenue en arrière) : on incrémente la
+        # partie aléatoire du dernier identifiant pour rester monotone
+        if value <= _last:
+            value = _last + 1
+        _last = value
+    return _from_int(value)
+
+
+def uuid7_from_time(timestamp, upper=False):
+    """
+    Plus petit (ou, avec upper=True, plus grand) UUIDv7 possible pour un
+    datetime donné : bornes d'un filtre de plage sur une clé primaire UUIDv7
+    """
+    millis = int(timestamp.timestamp() * 1000)
+    return _from_int((millis << _RANDOM_BITS) | (_RANDOM_MASK if upper else 0))
+
+
+def uuid7_time(value):
+    """Milliseconde Unix encodée dans un UUIDv7"""
+    return value.int >> 80
+
+
+def _from_int(value):
+    # 48 bits d'horodatage | version (4) | 12 bits | variante (2) | 62 bits
+    timestamp = value >> _RANDOM_BITS
+    rand_a = (value >> 62) & 0xFFF
+    rand_b = value & ((1 << 62) - 1)
+    return uuid.UUID(int=(timestamp << 80) | (0x7 << 76) | (rand_a << 64) | (0b10 << 62) | rand_b)
@@ -0,0 +1,13 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """
+    Administration pour le modèle Job
+    """
+    list_display = ('name', 'status', 'attempts', 'created_by', 'created_time', 'finished_time')
+    list_filter = ('status', 'name', 'created_time')
+    search_fields = ('name',)
+    readonly_fields = ('id', 'created_time', 'updated_time', 'finished_time')
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from jobs.worker import run_worker
+
+
+class Command(BaseCommand):
+    help = "Exécute les tâches en attente (suppressions lourdes, effacements de compte...)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2, help="Nombre de tâches exécutées en parallèle")
+        parser.add_argument('--mode', choices=['thread', 'process'], default='thread', help="Pool de threads ou de processus")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Attente (secondes) quand la file est vide")
+        parser.add_argument('--burst', action='store_true', help="S'arrêter quand la file est vide")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Worker démarré ({options['mode']} x{options['concurrency']})")
+        try:
+            processed = run_worker(
+                concurrency=options['concurrency'],
+                mode=options['mode'],
+                poll_interval=options['poll_interval'],
+                burst=options['burst']
+            )
+        except KeyboardInterrupt:
+            self.stdout.write("Arrêt du worker.")
+            return
+        self.stdout.write(self.style.SUCCESS(f"{processed} tâche(s) exécutée(s)."))
@@ -0,0 +1,93 @@
+import uuid
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    Modèle représentant une tâche exécutée en dehors du cycle de requête
+    par la commande run_worker
+    """
+
+    STATUS_CHOICES = [
+        ('PENDING', 'En attente'),
+        ('RUNNING', 'En cours'),
+        ('SUCCEEDED', 'Terminée'),
+        ('FAILED', 'Échouée'),
+    ]
+
+    # Identifiant non devinable : il sert aussi de lien de suivi
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        verbose_name="Identifiant unique"
+    )
+    name = models.CharField(
+        max_length=100,
+        verbose_name="Tâche"
+    )
+    payload = models.JSONField(
+        default=dict,
+        verbose_name="Paramètres"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='PENDING',
+        verbose_name="Statut"
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Tentatives"
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=3,
+        verbose_name="Tentatives maximum"
+    )
+    progress = models.JSONField(
+        default=dict,
+        verbose_name="Avancement"
+    )
+    result = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name="Résultat"
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name="Erreur"
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='jobs',
+        verbose_name="Demandée par"
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Exécuter après"
+    )
+    created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+    finished_time = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Tâche"
+        verbose_name_plural = "Tâches"
+        ordering = ['-created_time']
+        indexes = [
+            # Recherche de la prochaine tâche à exécuter par le worker
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+    def report_progress(self, step, count):
+        """Enregistre l'avancement d'une étape, lisible via l'API pendant l'exécution"""
+        self.progress[step] = count
+        Job.objects.filter(pk=self.pk).update(progress=self.progress, updated_time=timezone.now())
@@ -0,0 +1,16 @@
+"""
+Points d'entrée des processus du pool (mode --mode process).
+
+Ce module ne doit rien importer de Django au chargement : il est importé
+par les processus fils avant django.setup().
+"""
+
+
+def init_process():
+    import django
+    django.setup()
+
+
+def execute_job(job_id):
+    from .worker import execute_job as run
+    return run(job_id)
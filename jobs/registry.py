@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job
+
+
+_tasks = {}
+
+
+def task(name):
+    """
+    Décorateur enregistrant une fonction comme tâche exécutable par le worker.
+    La fonction reçoit la tâche (Job) puis les paramètres du payload.
+    """
+    def decorator(func):
+        _tasks[name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    return _tasks[name]
+
+
+def enqueue(name, user=None, **payload):
+    """Crée une tâche en attente ; le payload doit être sérialisable en JSON"""
+    if name not in _tasks:
+        raise KeyError(f"Tâche inconnue : {name}")
+    return Job.objects.create(
+        name=name,
+        payload=payload,
+        created_by=user,
+        max_attempts=settings.JOBS_MAX_ATTEMPTS,
+        run_after=timezone.now()
+    )
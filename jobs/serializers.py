@@ -0,0 +1,16 @@
+from rest_framework import serializers
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """
+    Serializer pour le suivi d'une tâche (sans ses paramètres)
+    """
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'name', 'status', 'attempts', 'progress', 'result',
+            'created_time', 'updated_time', 'finished_time'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,60 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from .models import Job
+from .registry import enqueue, task
+from .worker import claim_next_job, run_worker
+
+
+@task('tests.echo')
+def echo(job, value):
+    return value
+
+
+class LeaseTests(TransactionTestCase):
+    """
+    Reprise des tâches dont le worker s'est arrêté pendant l'exécution
+    (TransactionTestCase : le worker exécute les tâches dans ses threads)
+    """
+
+    def crashed_job(self, attempts=1):
+        job = enqueue('tests.echo', value=42)
+        Job.objects.filter(pk=job.pk).update(
+            status='RUNNING', attempts=attempts,
+            updated_time=timezone.now() - timedelta(hours=1)
+        )
+        return job
+
+    def test_running_job_with_live_lease_is_not_claimed(self):
+        job = enqueue('tests.echo', value=42)
+        self.assertEqual(claim_next_job(), job.pk)
+        self.assertIsNone(claim_next_job())
+
+    def test_expired_lease_is_reclaimed(self):
+        job = self.crashed_job()
+        self.assertEqual(claim_next_job(), job.pk)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('RUNNING', 2))
+
+        self.assertEqual(run_worker(concurrency=1, burst=True), 0)
+        Job.objects.filter(pk=job.pk).update(updated_time=timezone.now() - timedelta(hours=1))
+        self.assertEqual(run_worker(concurrency=1, burst=True), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), ('SUCCEEDED', 42))
+
+    def test_expired_lease_without_attempts_left_fails(self):
+        job = self.crashed_job(attempts=3)
+        self.assertIsNone(claim_next_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertIsNotNone(job.finished_time)
+
+    def test_worker_survives_bookkeeping_errors(self):
+        enqueue('tests.echo', value=1)
+        enqueue('tests.echo', value=2)
+        with mock.patch('jobs.worker.Job.save', side_effect=[Exception('base indisponible'), None]), \
+                self.assertLogs('jobs.worker', 'ERROR'):
+            self.assertEqual(run_worker(concurrency=1, burst=True), 2)
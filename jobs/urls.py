@@ -0,0 +1,9 @@
+from django.urls import path
+from .views import JobStatusView, MyJobsView
+
+app_name = 'jobs'
+
+urlpatterns = [
+    path('jobs/', MyJobsView.as_view(), name='job-list'),
+    path('jobs/<uuid:pk>/', JobStatusView.as_view(), name='job-detail'),
+]
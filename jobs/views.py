@@ -0,0 +1,43 @@
+from rest_framework import generics
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from drf_spectacular.utils import extend_schema, extend_schema_view
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Suivi d'une tâche",
+        description=(
+            "Statut et avancement d'une tâche en arrière-plan. L'identifiant, non devinable, "
+            "suffit : il reste utilisable après l'effacement du compte qui l'a demandée"
+        ),
+        tags=["Tâches"]
+    )
+)
+class JobStatusView(generics.RetrieveAPIView):
+    """
+    Vue pour suivre une tâche à partir de son identifiant
+    """
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [AllowAny]
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Mes tâches",
+        description="Liste des tâches demandées par l'utilisateur connecté",
+        tags=["Tâches"]
+    )
+)
+class MyJobsView(generics.ListAPIView):
+    """
+    Vue listant les tâches de l'utilisateur connecté
+    """
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Job.objects.filter(created_by=self.request.user)
@@ -0,0 +1,166 @@
+import logging
+import multiprocessing
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, connections
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_task
+from . import process
+
+
+logger = logging.getLogger(__name__)
+
+
+def claimable_jobs():
+    """
+    Tâches exécutables : en attente et arrivées à échéance, ou en cours
+    depuis un worker arrêté sans les terminer (bail expiré). Une tâche
+    reprise compte comme une nouvelle tentative.
+    """
+    now = timezone.now()
+    expired = now - timedelta(seconds=settings.JOBS_LEASE_TIMEOUT)
+    return Job.objects.filter(
+        Q(status='PENDING', run_after__lte=now)
+        | Q(status='RUNNING', updated_time__lt=expired, attempts__lt=F('max_attempts'))
+    )
+
+
+def fail_abandoned_jobs():
+    """Les tâches au bail expiré qui ont épuisé leurs tentatives échouent"""
+    now = timezone.now()
+    expired = now - timedelta(seconds=settings.JOBS_LEASE_TIMEOUT)
+    return Job.objects.filter(
+        status='RUNNING', updated_time__lt=expired, attempts__gte=F('max_attempts')
+    ).update(
+        status='FAILED', error="Worker arrêté pendant l'exécution (bail expiré).",
+        finished_time=now, updated_time=now
+    )
+
+
+def claim_next_job():
+    """
+    Réserve la prochaine tâche exécutable. La réservation est un UPDATE
+    conditionnel sur les mêmes critères : si un autre worker l'a prise
+    entre-temps, on passe à la suivante. Retourne l'identifiant de la tâche ou None.
+    """
+    fail_abandoned_jobs()
+    while True:
+        job_id = claimable_jobs().order_by('run_after').values_list('pk', flat=True).first()
+        if job_id is None:
+            return None
+        claimed = claimable_jobs().filter(pk=job_id).update(
+            status='RUNNING', attempts=F('attempts') + 1, updated_time=timezone.now()
+        )
+        if claimed:
+            return job_id
+
+
+@contextmanager
+def lease(job_id):
+    """
+    Prolonge le bail de la tâche (updated_time) toutes les
+    JOBS_LEASE_TIMEOUT / 3 secondes, dans un thread, tant que le bloc s'exécute
+    """
+    stopped = threading.Event()
+
+    def renew():
+        try:
+            while not stopped.wait(settings.JOBS_LEASE_TIMEOUT / 3):
+                try:
+                    Job.objects.filter(pk=job_id, status='RUNNING').update(updated_time=timezone.now())
+                except DatabaseError:
+                    logger.exception("Bail de la tâche %s non prolongé", job_id)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=renew, name=f'job-lease-{job_id}', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def execute_job(job_id):
+    """Exécute une tâche réservée et enregistre son résultat, ou planifie un nouvel essai"""
+    job = Job.objects.get(pk=job_id)
+    try:
+        with lease(job_id):
+            result = get_task(job.name)(job, **job.payload)
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            # Nouvel essai avec une attente exponentielle
+            job.status = 'PENDING'
+            job.run_after = timezone.now() + timedelta(seconds=settings.JOBS_RETRY_DELAY * 2 ** (job.attempts - 1))
+        else:
+            job.status = 'FAILED'
+            job.finished_time = timezone.now()
+        logger.exception("Échec de la tâche %s (%s)", job.name, job.pk)
+    else:
+        job.status = 'SUCCEEDED'
+        job.result = result
+        job.error = ''
+        job.finished_time = timezone.now()
+    finally:
+        job.save(update_fields=['status', 'result', 'error', 'run_after', 'finished_time', 'updated_time'])
+        connection.close()
+    return job.status
+
+
+def run_worker(concurrency=2, mode='thread', poll_interval=1.0, burst=False):
+    """
+    Boucle du worker : réserve les tâches en attente et les exécute dans un
+    pool de threads ou de processus de taille concurrency. En mode burst,
+    s'arrête quand la file est vide.
+    """
+    if mode == 'process':
+        connections.close_all()
+        executor = ProcessPoolExecutor(
+            max_workers=concurrency,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=process.init_process
+        )
+        target = process.execute_job
+    else:
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        target = execute_job
+
+    running = set()
+    processed = 0
+    try:
+        while True:
+            while len(running) < concurrency:
+                job_id = claim_next_job()
+                if job_id is None:
+                    break
+                running.add(executor.submit(target, job_id))
+
+            if not running:
+                if burst:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            done, running = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    future.result()
+                except Exception:
+                    # Échec hors de la tâche (lecture ou enregistrement de son
+                    # statut) : son bail expirera et elle sera reprise
+                    logger.exception("Erreur du worker pendant l'exécution d'une tâche")
+                processed += 1
+    finally:
+        executor.shutdown(wait=True)
+    return processed
@@ -6,7 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'softdesk_api.settings')
+    # Les tests déclarent des bases supplémentaires (softdesk_api/test_settings.py)
+    default_settings = 'softdesk_api.test_settings' if sys.argv[1:2] == ['test'] else 'softdesk_api.settings'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', default_settings)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -0,0 +1,197 @@
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Count, F, Max, Q, Window
+from django.db.models.functions import RowNumber
+
+from accounts.models import User
+from core.routers import on_shard
+from core.sharding import fan_out
+from projects.models import Issue, Comment
+from projects.sharding import group_by_shard
+from .models import Notification
+
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = [
+    ('ISSUE_ASSIGNED', "Issues qui vous ont été assignées"),
+    ('COMMENT_ADDED', "Nouveaux commentaires sur vos issues"),
+]
+EXCERPT_LENGTH = 120
+
+
+def excerpt(text):
+    text = ' '.join((text or '').split())
+    return text if len(text) <= EXCERPT_LENGTH else text[:EXCERPT_LENGTH - 1] + '…'
+
+
+def load_details(events):
+    """
+    Issues (nom, projet) et commentaires (extrait) cités par les événements,
+    chargés en deux requêtes par base : {issue_id: (projet, nom)}, {comment_id: extrait}
+    """
+    project_ids = {event['project_id'] for event in events}
+    issue_ids = {event['issue_id'] for event in events}
+    comment_ids = {event['comment_id'] for event in events if event['comment_id'] is not None}
+
+    def load(alias):
+        with on_shard(alias):
+            issues = {
+                pk: (project_name, name) for pk, name, project_name in
+                Issue.objects.filter(pk__in=issue_ids).values_list('pk', 'name', 'project__name')
+            }
+            comments = dict(
+                Comment.objects.filter(pk__in=comment_ids).values_list('pk', 'description')
+            ) if comment_ids else {}
+            return issues, comments
+
+    issues, comments = {}, {}
+    for shard_issues, shard_comments in fan_out(load, group_by_shard(project_ids)).values():
+        issues.update(shard_issues)
+        comments.update(shard_comments)
+    return issues, comments
+
+
+def render_digest(user, events, totals, issues, comments, actors):
+    """Sujet et corps (texte brut) du résumé d'un utilisateur ; None si plus rien à signaler"""
+    lines = [f"Bonjour {user['first_name'] or user['username']},", ""]
+    shown = 0
+    for kind, title in SECTIONS:
+        entries = []
+        for event in events:
+            if event['kind'] != kind or event['issue_id'] not in issues:
+                continue
+            project_name, issue_name = issues[event['issue_id']]
+            entry = f"- [{project_name}] {issue_name}"
+            if event['actor_id'] in actors:
+                entry += f" (par {actors[event['actor_id']]})"
+            if event['comment_id'] in comments:
+                entry += f" : « {excerpt(comments[event['comment_id']])} »"
+            entries.append(entry)
+        if not entries:
+            continue
+        shown += len(entries)
+        lines.append(f"{title} ({totals.get(kind, len(entries))}) :")
+        lines.extend(entries)
+        if totals.get(kind, 0) > len(entries):
+            lines.append(f"  ... et {totals[kind] - len(entries)} autre(s).")
+        lines.append("")
+    if not shown:
+        return None
+
+    total = sum(totals.values())
+    lines.append(
+        "Vous recevez ce résumé car vous avez accepté d'être contacté ; "
+        "désactivez can_be_contacted dans votre profil pour ne plus le recevoir."
+    )
+    return f"SoftDesk : {total} nouveauté(s)", '\n'.join(lines)
+
+
+def deliver(messages):
+    """
+    Envoie les messages [(destinataire, EmailMessage)] par connexions de
+    DIGEST_EMAILS_PER_CONNECTION messages. Retourne les destinataires servis ;
+    ceux d'une connexion en échec seront retentés au prochain passage.
+    """
+    delivered = []
+    size = settings.DIGEST_EMAILS_PER_CONNECTION
+    for start in range(0, len(messages), size):
+        chunk = messages[start:start + size]
+        try:
+            with get_connection() as connection:
+                connection.send_messages([message for _, message in chunk])
+        except Exception:
+            logger.exception("Échec de l'envoi de %d résumé(s)", len(chunk))
+            continue
+        delivered.extend(recipient_id for recipient_id, _ in chunk)
+    return delivered
+
+
+def send_digests(batch_size=None, max_items=None, dry_run=False, progress=None):
+    """
+    Envoie à chaque utilisateur un résumé de ses événements en attente, puis
+    les supprime. Les événements arrivés pendant l'envoi attendent le passage
+    suivant. Les destinataires sont traités par lots de batch_size
+    (DIGEST_BATCH_SIZE), chacun en quelques requêtes ensemblistes : totaux par
+    type, max_items (DIGEST_MAX_ITEMS) derniers événements par destinataire
+    (fonction de fenêtre), utilisateurs, issues et commentaires cités.
+
+    Les événements des utilisateurs qui ont retiré leur consentement (ou
+    désactivé leur compte, ou sans e-mail) sont abandonnés. Avec dry_run,
+    rien n'est envoyé ni supprimé. progress(rapport) est appelé après chaque lot.
+    Retourne le nombre de résumés envoyés, d'événements traités et abandonnés.
+    """
+    batch_size = batch_size or settings.DIGEST_BATCH_SIZE
+    max_items = max_items or settings.DIGEST_MAX_ITEMS
+    report = {'digests': 0, 'events': 0, 'dropped': 0, 'failed': 0}
+    last_id = Notification.objects.aggregate(last_id=Max('pk'))['last_id']
+    if last_id is None:
+        return report
+    pending = Notification.objects.filter(pk__lte=last_id)
+
+    withdrawn = pending.filter(
+        Q(recipient__can_be_contacted=False) | Q(recipient__is_active=False) | Q(recipient__email='')
+    )
+    if not dry_run:
+        report['dropped'] = withdrawn.delete()[0]
+
+    last_recipient = 0
+    while True:
+        recipients = list(
+            pending.filter(recipient_id__gt=last_recipient).order_by('recipient_id')
+            .values_list('recipient_id', flat=True).distinct()[:batch_size]
+        )
+        if not recipients:
+            return report
+        last_recipient = recipients[-1]
+        batch = pending.filter(recipient_id__in=recipients)
+
+        totals = {}
+        for recipient_id, kind, count in (
+            batch.order_by().values('recipient_id', 'kind').annotate(count=Count('pk'))
+            .values_list('recipient_id', 'kind', 'count')
+        ):
+            totals.setdefault(recipient_id, {})[kind] = count
+        events = list(
+            batch.annotate(rank=Window(RowNumber(), partition_by=[F('recipient_id')], order_by=F('pk').desc()))
+            .filter(rank__lte=max_items)
+            .order_by('recipient_id', 'pk')
+            .values('recipient_id', 'kind', 'project_id', 'issue_id', 'comment_id', 'actor_id')
+        )
+        users = {
+            user['pk']: user for user in
+            User.objects.filter(pk__in={*recipients, *(event['actor_id'] for event in events)} - {None})
+            .values('pk', 'username', 'first_name', 'email', 'can_be_contacted', 'is_active')
+        }
+        actors = {pk: user['username'] for pk, user in users.items()}
+        issues, comments = load_details(events)
+
+        by_recipient = {}
+        for event in events:
+            by_recipient.setdefault(event['recipient_id'], []).append(event)
+        messages, empty = [], []
+        for recipient_id, recipient_events in by_recipient.items():
+            user = users.get(recipient_id)
+            if user is None or not (user['can_be_contacted'] and user['is_active'] and user['email']):
+                continue
+            digest = render_digest(user, recipient_events, totals[recipient_id], issues, comments, actors)
+            if digest is None:
+                # Issues et commentaires supprimés entre-temps
+                empty.append(recipient_id)
+                continue
+            subject, body = digest
+            messages.append((recipient_id, EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [user['email']])))
+
+        if dry_run:
+            delivered = [recipient_id for recipient_id, _ in messages]
+        else:
+            delivered = deliver(messages)
+            done = Notification.objects.filter(recipient_id__in=[*delivered, *empty], pk__lte=last_id)
+            done._raw_delete(done.db)
+        report['digests'] += len(delivered)
+        report['failed'] += len(messages) - len(delivered)
+        report['events'] += sum(sum(totals[recipient_id].values()) for recipient_id in [*delivered, *empty])
+        if progress is not None:
+            progress(report)
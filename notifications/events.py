@@ -0,0 +1,29 @@
+from django.db.models import BigIntegerField, DateTimeField, F, UUIDField, Value
+from django.utils import timezone
+
+from accounts.models import User
+from core.db import insert_select
+from .models import Notification
+
+
+def notify(kind, recipient_ids, actor_id, project_id, issue_id, comment_id=None):
+    """
+    Enregistre un événement pour chaque destinataire (sauf l'auteur de
+    l'action) actif et ayant accepté d'être contacté, en un seul
+    INSERT ... SELECT sur les utilisateurs : le consentement est vérifié sans
+    aller-retour. Retourne le nombre d'événements enregistrés.
+    """
+    recipient_ids = set(recipient_ids) - {None, actor_id}
+    if not recipient_ids:
+        return 0
+    return insert_select(
+        User.objects.filter(pk__in=recipient_ids, can_be_contacted=True, is_active=True),
+        Notification,
+        recipient=F('pk'),
+        kind=Value(kind),
+        project_id=Value(project_id, output_field=BigIntegerField()),
+        issue_id=Value(issue_id, output_field=BigIntegerField()),
+        comment_id=Value(comment_id, output_field=UUIDField()),
+        actor=Value(actor_id, output_field=BigIntegerField()),
+        created_time=Value(timezone.now(), output_field=DateTimeField()),
+    )
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from notifications.digests import send_digests
+
+
+class Command(BaseCommand):
+    help = "Envoie à chaque utilisateur le résumé de ses notifications en attente (à planifier, ex. chaque heure)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.DIGEST_BATCH_SIZE,
+                            help="Destinataires traités par lot")
+        parser.add_argument('--max-items', type=int, default=settings.DIGEST_MAX_ITEMS,
+                            help="Événements détaillés par résumé")
+        parser.add_argument('--dry-run', action='store_true', help="Compter sans envoyer ni supprimer")
+
+    def handle(self, *args, **options):
+        report = send_digests(
+            batch_size=options['batch_size'],
+            max_items=options['max_items'],
+            dry_run=options['dry_run'],
+            progress=lambda report: self.stdout.write(f"  {report['digests']} résumé(s)..."),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['digests']} résumé(s){' à envoyer' if options['dry_run'] else ' envoyé(s)'} "
+            f"({report['events']} événement(s)), {report['dropped']} abandonné(s) sans consentement, "
+            f"{report['failed']} en échec."
+        ))
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('ISSUE_ASSIGNED', 'Issue assignée'), ('COMMENT_ADDED', 'Nouveau commentaire')], max_length=20, verbose_name='Type')),
+                ('project_id', models.BigIntegerField(verbose_name='Projet')),
+                ('issue_id', models.BigIntegerField(verbose_name='Issue')),
+                ('comment_id', models.UUIDField(blank=True, null=True, verbose_name='Commentaire')),
+                ('created_time', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name="Auteur de l'action")),
+                ('recipient', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL, verbose_name='Destinataire')),
+            ],
+            options={
+                'verbose_name': 'Notification',
+                'verbose_name_plural': 'Notifications',
+                'indexes': [models.Index(fields=['recipient', 'id'], name='notification_recipient_idx')],
+            },
+        ),
+    ]
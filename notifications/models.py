@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Notification(models.Model):
+    """
+    Événement à signaler dans le prochain résumé par e-mail d'un utilisateur
+    (commande send_digests), supprimé une fois envoyé. Seuls les utilisateurs
+    ayant accepté d'être contactés en reçoivent. Issues et commentaires sont
+    référencés par identifiant : ils peuvent vivre sur une autre base
+    (DATABASE_SHARDS) et disparaître avant l'envoi.
+    """
+
+    KIND_CHOICES = [
+        ('ISSUE_ASSIGNED', 'Issue assignée'),
+        ('COMMENT_ADDED', 'Nouveau commentaire'),
+    ]
+
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        # Couvert par l'index (destinataire, identifiant)
+        db_index=False,
+        verbose_name="Destinataire"
+    )
+    kind = models.CharField(
+        max_length=20,
+        choices=KIND_CHOICES,
+        verbose_name="Type"
+    )
+    project_id = models.BigIntegerField(verbose_name="Projet")
+    issue_id = models.BigIntegerField(verbose_name="Issue")
+    comment_id = models.UUIDField(null=True, blank=True, verbose_name="Commentaire")
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Auteur de l'action"
+    )
+    created_time = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Notification"
+        verbose_name_plural = "Notifications"
+        indexes = [
+            # Événements d'un lot de destinataires, dans l'ordre d'arrivée
+            models.Index(fields=['recipient', 'id'], name='notification_recipient_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} -> {self.recipient_id}"
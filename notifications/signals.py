@@ -0,0 +1,42 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from projects.models import Issue, Comment
+from projects.signals import issue_assigned
+from .events import notify
+
+
+# Les événements sont enregistrés après la validation de l'écriture, sur la base
+# de l'issue ou du commentaire (using) : rien n'est signalé pour une écriture annulée
+
+@receiver(issue_assigned)
+def issue_assigned_notification(sender, issue_id, project_id, assignee_id, actor_id, using, **kwargs):
+    """Signale à l'assigné une issue qui vient de lui être assignée"""
+    transaction.on_commit(
+        lambda: notify('ISSUE_ASSIGNED', [assignee_id], actor_id, project_id, issue_id), using=using
+    )
+
+
+@receiver(post_save, sender=Comment)
+def comment_notification(sender, instance, created, raw=False, using=None, **kwargs):
+    """Signale un nouveau commentaire à l'auteur et à l'assigné de l'issue"""
+    if not created or raw:
+        return
+    if Comment.issue.is_cached(instance):
+        issue = instance.issue
+        row = (issue.project_id, issue.author_id, issue.assignee_id)
+    else:
+        row = (
+            Issue.objects.using(using).filter(pk=instance.issue_id)
+            .values_list('project_id', 'author_id', 'assignee_id').first()
+        )
+        if row is None:
+            return
+    project_id, author_id, assignee_id = row
+    transaction.on_commit(
+        lambda: notify(
+            'COMMENT_ADDED', [author_id, assignee_id], instance.author_id, project_id, instance.issue_id, instance.pk
+        ),
+        using=using
+    )
@@ -0,0 +1,136 @@
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from projects.models import Issue
+from projects.tests import ApiTestMixin, client_for, make_user
+from . import digests
+from .digests import send_digests
+from .models import Notification
+
+
+class NotificationTestMixin(ApiTestMixin):
+    """Les événements sont enregistrés après validation : les callbacks on_commit sont exécutés"""
+
+    def setUp(self):
+        super().setUp()
+        self.alice = make_user('alice', first_name='Alice', can_be_contacted=True)
+        self.bob = make_user('bob', can_be_contacted=True)
+        self.carol = make_user('carol', can_be_contacted=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project_id = self.create_project(self.alice, contributors=[self.bob, self.carol])
+
+    def create_issue(self, author, project_id=None, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return super().create_issue(author, project_id or self.project_id, **data)
+
+    def comment(self, user, issue, description='Je regarde'):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client_for(user).post(
+                f"/api/projects/{self.project_id}/issues/{issue['id']}/comments/",
+                {'description': description}, format='json'
+            )
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def events(self, user, kind):
+        return Notification.objects.filter(recipient=user, kind=kind).count()
+
+
+class NotificationEventTests(NotificationTestMixin, TestCase):
+    def test_assignment_notifies_consenting_assignee_only(self):
+        self.create_issue(self.alice, assignee_id=self.bob.pk)
+        self.create_issue(self.alice, assignee_id=self.carol.pk)
+        self.create_issue(self.alice, assignee_id=self.alice.pk)
+        self.assertEqual(self.events(self.bob, 'ISSUE_ASSIGNED'), 1)
+        self.assertFalse(Notification.objects.filter(recipient__in=[self.alice, self.carol]).exists())
+
+    def test_reassignment_by_update_and_transition(self):
+        issue = self.create_issue(self.alice)
+        url = f"/api/projects/{self.project_id}/issues/{issue['id']}/"
+        with self.captureOnCommitCallbacks(execute=True):
+            client_for(self.alice).patch(url, {'assignee_id': self.bob.pk}, format='json')
+            # Autre champ modifié : pas de nouvel événement
+            client_for(self.alice).patch(url, {'name': 'Renommée'}, format='json')
+        self.assertEqual(self.events(self.bob, 'ISSUE_ASSIGNED'), 1)
+
+        other = self.create_issue(self.alice)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client_for(self.alice).post(
+                f"/api/projects/{self.project_id}/issues/{other['id']}/transition/",
+                {'version': 0, 'assignee_id': self.bob.pk}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.events(self.bob, 'ISSUE_ASSIGNED'), 2)
+
+    def test_comment_notifies_issue_author_and_assignee_but_not_commenter(self):
+        issue = self.create_issue(self.alice, assignee_id=self.bob.pk)
+        self.comment(self.bob, issue)
+        self.assertEqual(self.events(self.alice, 'COMMENT_ADDED'), 1)
+        self.assertEqual(self.events(self.bob, 'COMMENT_ADDED'), 0)
+        self.comment(self.carol, issue)
+        self.assertEqual(self.events(self.alice, 'COMMENT_ADDED'), 2)
+        self.assertEqual(self.events(self.bob, 'COMMENT_ADDED'), 1)
+
+
+class SendDigestsTests(NotificationTestMixin, TestCase):
+    def test_one_digest_per_user_then_events_deleted(self):
+        issue = self.create_issue(self.alice, name='Plantage', assignee_id=self.bob.pk)
+        for index in range(5):
+            self.comment(self.bob, issue, f'Commentaire {index}')
+
+        report = send_digests(batch_size=1, max_items=3)
+
+        self.assertEqual(report, {'digests': 2, 'events': 6, 'dropped': 0, 'failed': 0})
+        messages = {message.to[0]: message for message in mail.outbox}
+        self.assertEqual(set(messages), {'alice@example.com', 'bob@example.com'})
+        body = messages['alice@example.com'].body
+        self.assertIn('Bonjour Alice', body)
+        self.assertIn('Nouveaux commentaires sur vos issues (5)', body)
+        self.assertIn('et 2 autre(s)', body)
+        self.assertIn('Commentaire 4', body)
+        self.assertIn('[Projet] Plantage', messages['bob@example.com'].body)
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(send_digests()['digests'], 0)
+
+    @override_settings(DIGEST_EMAILS_PER_CONNECTION=1)
+    def test_messages_are_sent_in_batched_connections(self):
+        issue = self.create_issue(self.alice, assignee_id=self.bob.pk)
+        self.comment(self.bob, issue)
+        with mock.patch.object(digests, 'get_connection', wraps=digests.get_connection) as get_connection:
+            self.assertEqual(send_digests()['digests'], 2)
+        self.assertEqual(get_connection.call_count, 2)
+
+    def test_withdrawn_consent_drops_events(self):
+        self.create_issue(self.alice, assignee_id=self.bob.pk)
+        self.bob.can_be_contacted = False
+        self.bob.save()
+        report = send_digests()
+        self.assertEqual((report['digests'], report['dropped']), (0, 1))
+        self.assertEqual(mail.outbox, [])
+        self.assertFalse(Notification.objects.exists())
+
+    def test_dry_run_sends_and_deletes_nothing(self):
+        self.create_issue(self.alice, assignee_id=self.bob.pk)
+        call_command('send_digests', dry_run=True, stdout=mock.Mock())
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_deleted_issue_clears_events_without_email(self):
+        issue = self.create_issue(self.alice, assignee_id=self.bob.pk)
+        Issue.objects.filter(pk=issue['id']).delete()
+        report = send_digests()
+        self.assertEqual((report['digests'], report['events']), (0, 1))
+        self.assertEqual(mail.outbox, [])
+        self.assertFalse(Notification.objects.exists())
+
+    def test_failed_connection_keeps_events_for_next_run(self):
+        self.create_issue(self.alice, assignee_id=self.bob.pk)
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError), \
+                self.assertLogs('notifications.digests', 'ERROR'):
+            report = send_digests()
+        self.assertEqual((report['digests'], report['failed']), (0, 1))
+        self.assertEqual(Notification.objects.count(), 1)
+        self.assertEqual(send_digests()['digests'], 1)
+        self.assertEqual(len(mail.outbox), 1)
@@ -1,46 +1,56 @@
 from django.contrib import admin
+from core.admin import ScalableAdminMixin
 from .models import Project, Contributor, Issue, Comment
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(ScalableAdminMixin, admin.ModelAdmin):
     """
     Administration pour le modèle Project
     """
     list_display = ('name', 'type', 'author', 'created_time')
     list_filter = ('type', 'created_time')
-    search_fields = ('name', 'description', 'author__username')
+    list_select_related = ('author',)
+    search_fields = ('^name',)
+    autocomplete_fields = ('author',)
     readonly_fields = ('created_time',)
 
 
 @admin.register(Contributor)
-class ContributorAdmin(admin.ModelAdmin):
+class ContributorAdmin(ScalableAdminMixin, admin.ModelAdmin):
     """
     Administration pour le modèle Contributor
     """
     list_display = ('user', 'project', 'created_time')
     list_filter = ('created_time',)
-    search_fields = ('user__username', 'project__name')
+    list_select_related = ('user', 'project')
+    search_fields = ('^user__username',)
+    autocomplete_fields = ('user', 'project')
     readonly_fields = ('created_time',)
 
 
 @admin.register(Issue)
-class IssueAdmin(admin.ModelAdmin):
+class IssueAdmin(ScalableAdminMixin, admin.ModelAdmin):
     """
     Administration pour le modèle Issue
     """
     list_display = ('name', 'project', 'author', 'assignee', 'priority', 'tag', 'status', 'created_time')
     list_filter = ('priority', 'tag', 'status', 'created_time')
-    search_fields = ('name', 'description', 'project__name', 'author__username')
+    list_select_related = ('project', 'author', 'assignee')
+    search_fields = ('^name',)
+    autocomplete_fields = ('project', 'author', 'assignee')
     readonly_fields = ('created_time',)
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(ScalableAdminMixin, admin.ModelAdmin):
     """
     Administration pour le modèle Comment
     """
     list_display = ('id', 'issue', 'author', 'created_time')
     list_filter = ('created_time',)
-    search_fields = ('description', 'issue__name', 'author__username')
+    # Le libellé de l'issue affiche aussi le nom de son projet
+    list_select_related = ('issue__project', 'author')
+    search_fields = ('^author__username',)
+    autocomplete_fields = ('issue', 'author')
     readonly_fields = ('id', 'created_time')
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.db import copy_rows
+from core.routers import current_shard
+from .models import Issue, Comment, ArchivedIssue, ArchivedComment, IssueSimilarityBucket
+from .similarity import index_issue
+from .stats import invalidate_project_stats
+
+
+def archivable_issues(cutoff):
+    """
+    Issues terminées sans activité depuis cutoff : dernière modification (à
+    défaut, création) et dernier commentaire antérieurs à cutoff
+    """
+    recent_comments = Comment.objects.filter(issue=OuterRef('pk'), created_time__gte=cutoff)
+    return (
+        Issue.objects.filter(status='FINISHED')
+        .annotate(last_activity=Coalesce('updated_time', 'created_time'))
+        .filter(last_activity__lt=cutoff)
+        .filter(~Exists(recent_comments))
+    )
+
+
+def archive_issues(days=None, batch_size=None, progress=None):
+    """
+    Déplace les issues terminées inactives depuis days jours (ARCHIVE_AFTER_DAYS)
+    et leurs commentaires vers les tables d'archive, par lots de batch_size
+    issues. Chaque lot est copié (INSERT ... SELECT) puis supprimé des tables
+    actives dans sa propre transaction. progress(nombre) est appelé après
+    chaque lot. Retourne le nombre d'issues et de commentaires archivés.
+    """
+    days = settings.ARCHIVE_AFTER_DAYS if days is None else days
+    batch_size = batch_size or settings.DELETION_CHUNK_SIZE
+    cutoff = timezone.now() - timedelta(days=days)
+    candidates = archivable_issues(cutoff).order_by('pk')
+    report = {'issues': 0, 'comments': 0}
+
+    last_pk = 0
+    while True:
+        batch = list(candidates.filter(pk__gt=last_pk).values_list('pk', 'project_id')[:batch_size])
+        if not batch:
+            return report
+        ids = [pk for pk, _ in batch]
+        now = timezone.now()
+        with transaction.atomic(using=current_shard()):
+            # Verrouille le lot ; une issue rouverte entre-temps n'est pas archivée
+            locked = list(
+                Issue.objects.select_for_update().filter(pk__in=ids, status='FINISHED')
+                .values_list('pk', flat=True)
+            )
+            issues = Issue.objects.filter(pk__in=locked)
+            comments = Comment.objects.filter(issue_id__in=locked)
+            # Les issues archivées sortent de l'index des doublons
+            buckets = IssueSimilarityBucket.objects.filter(issue_id__in=locked)
+            copy_rows(issues, ArchivedIssue, archived_time=now)
+            report['comments'] += copy_rows(comments, ArchivedComment)
+            comments._raw_delete(comments.db)
+            buckets._raw_delete(buckets.db)
+            report['issues'] += issues._raw_delete(issues.db)
+        invalidate_project_stats(*{project_id for _, project_id in batch})
+        last_pk = ids[-1]
+        if progress is not None:
+            progress(report['issues'])
+
+
+def restore_issue(issue_id):
+    """
+    Ramène une issue archivée et ses commentaires dans les tables actives
+    (issue rouverte ou modifiée), et la réindexe pour la détection des
+    doublons. Retourne False si elle n'est pas archivée.
+    """
+    with transaction.atomic(using=current_shard()):
+        archived = ArchivedIssue.objects.select_for_update().filter(pk=issue_id)
+        project_id = archived.values_list('project_id', flat=True).first()
+        if project_id is None:
+            return False
+        comments = ArchivedComment.objects.filter(issue_id=issue_id)
+        copy_rows(archived, Issue)
+        copy_rows(comments, Comment)
+        comments._raw_delete(comments.db)
+        archived._raw_delete(archived.db)
+        index_issue(Issue.objects.only('project_id', 'name', 'description').get(pk=issue_id))
+    invalidate_project_stats(project_id)
+    return True
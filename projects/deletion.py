@@ -0,0 +1,61 @@
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.db import transaction
+
+from core.db import delete_in_chunks
+from core.routers import on_shard
+from .models import (
+    Project, Contributor, Issue, Comment, ArchivedIssue, ArchivedComment, IssueSimilarityBucket, ProjectLocation,
+)
+from .sharding import shard_for_project, invalidate_location
+from .stats import invalidate_project_stats
+
+
+def delete_project_rows(project_id, alias, chunk_size, step=None):
+    """
+    Supprime par lots bornés les lignes d'un projet sur la base alias
+    (commentaires, index des doublons, issues, archives comprises,
+    contributeurs, projet), sans toucher à l'annuaire. step(étape, nombre)
+    est appelé après chaque étape.
+    """
+    step = step or (lambda name, count: None)
+    with on_shard(alias):
+        step('comments', delete_in_chunks(Comment.objects.filter(issue__project_id=project_id), chunk_size))
+        step('similarity_buckets', delete_in_chunks(
+            IssueSimilarityBucket.objects.filter(project_id=project_id), chunk_size
+        ))
+        step('issues', delete_in_chunks(Issue.objects.filter(project_id=project_id), chunk_size))
+        step('archived_comments', delete_in_chunks(
+            ArchivedComment.objects.filter(issue__project_id=project_id), chunk_size
+        ))
+        step('archived_issues', delete_in_chunks(ArchivedIssue.objects.filter(project_id=project_id), chunk_size))
+        step('contributors', delete_in_chunks(Contributor.objects.filter(project_id=project_id), chunk_size))
+        step('projects', delete_in_chunks(Project.objects.filter(pk=project_id), chunk_size))
+
+
+def delete_project_data(project_id, chunk_size=None, progress=None, atomic=True):
+    """
+    Supprime un projet et toute sa cascade (commentaires, issues, archives
+    comprises, contributeurs) par lots bornés, sans charger les objets en mémoire,
+    dans une transaction (sauf atomic=False, où chaque lot est validé séparément). progress(étape, nombre) est appelé après chaque étape.
+    Le projet est supprimé sur sa partition, puis retiré de l'annuaire.
+
+    Retourne le nombre de lignes supprimées par étape.
+    """
+    chunk_size = chunk_size or settings.DELETION_CHUNK_SIZE
+    alias = shard_for_project(project_id)
+    report = {}
+
+    def step(name, count):
+        report[name] = count
+        if progress is not None:
+            progress(name, count)
+
+    with transaction.atomic(using=alias) if atomic else nullcontext():
+        delete_project_rows(project_id, alias, chunk_size, step)
+
+    ProjectLocation.objects.filter(pk=project_id).delete()
+    invalidate_location(project_id)
+    invalidate_project_stats(project_id)
+    return report
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.routers import on_shard
+from projects.archive import archive_issues, archivable_issues
+from projects.sharding import shard_aliases
+
+
+class Command(BaseCommand):
+    help = "Archive les issues terminées inactives et leurs commentaires (à planifier, ex. chaque nuit)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                            help="Inactivité minimale (jours) d'une issue terminée")
+        parser.add_argument('--batch-size', type=int, default=settings.DELETION_CHUNK_SIZE,
+                            help="Issues archivées par transaction")
+        parser.add_argument('--dry-run', action='store_true', help="Compter sans archiver")
+
+    def handle(self, *args, **options):
+        # Les commentaires des 30 derniers jours alimentent les statistiques des projets
+        if options['days'] < 30:
+            raise CommandError("--days doit valoir au moins 30.")
+
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        for alias in shard_aliases():
+            with on_shard(alias):
+                if options['dry_run']:
+                    self.stdout.write(f"{alias} : {archivable_issues(cutoff).count()} issue(s) à archiver.")
+                    continue
+
+                report = archive_issues(
+                    days=options['days'],
+                    batch_size=options['batch_size'],
+                    progress=lambda count: self.stdout.write(f"  {count} issue(s) archivée(s)...")
+                )
+                self.stdout.write(self.style.SUCCESS(
+                    f"{alias} : {report['issues']} issue(s) et {report['comments']} commentaire(s) archivés."
+                ))
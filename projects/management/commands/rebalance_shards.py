@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.models import ProjectLocation
+from projects.sharding import move_project, plan_rebalance, project_weights, rebuild_directory
+
+
+class Command(BaseCommand):
+    help = (
+        "Répartit les projets entre les partitions (DB_SHARDS) d'après leur nombre d'issues, "
+        "ou déplace un projet donné"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild-directory', action='store_true',
+                            help="Reconstruire l'annuaire depuis les bases (activation du partitionnement)")
+        parser.add_argument('--project', type=int, help="Projet à déplacer (avec --to)")
+        parser.add_argument('--to', help="Partition cible du projet")
+        parser.add_argument('--batch-size', type=int, default=settings.DELETION_CHUNK_SIZE,
+                            help="Lignes copiées ou supprimées par requête")
+        parser.add_argument('--dry-run', action='store_true', help="Afficher les déplacements sans les faire")
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_SHARDS:
+            raise CommandError("Aucune partition configurée (DB_SHARDS).")
+
+        if options['rebuild_directory']:
+            rebuild_directory(progress=lambda alias, count: self.stdout.write(f"  {alias} : {count} projet(s)"))
+            self.stdout.write(self.style.SUCCESS("Annuaire reconstruit."))
+            return
+
+        if options['project'] is not None or options['to'] is not None:
+            if options['project'] is None or options['to'] not in settings.DATABASE_SHARDS:
+                raise CommandError(f"--project et --to (parmi {', '.join(settings.DATABASE_SHARDS)}) sont requis.")
+            source = ProjectLocation.objects.filter(pk=options['project']).values_list('shard', flat=True).first()
+            if source is None:
+                raise CommandError(f"Projet {options['project']} absent de l'annuaire.")
+            moves = [(options['project'], source, options['to'])]
+        else:
+            weights = project_weights()
+            for alias, projects in weights.items():
+                self.stdout.write(f"{alias} : {len(projects)} projet(s), charge {sum(projects.values())}")
+            moves = plan_rebalance(weights)
+
+        for project_id, source, target in moves:
+            self.stdout.write(f"Projet {project_id} : {source} -> {target}")
+            if not options['dry_run']:
+                copied = move_project(project_id, target, batch_size=options['batch_size'])
+                self.stdout.write(f"  {copied} ligne(s) copiée(s)")
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(moves)} déplacement(s){' prévu(s)' if options['dry_run'] else ''}."
+        ))
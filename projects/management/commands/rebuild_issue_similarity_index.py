@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.routers import on_shard
+from projects.sharding import group_by_shard, shard_aliases
+from projects.similarity import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruit l'index de détection des doublons d'issues (après un import ou une mise à jour en masse)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', dest='projects',
+                            help="Projet à réindexer (répétable ; tous par défaut)")
+        parser.add_argument('--batch-size', type=int, default=settings.DELETION_CHUNK_SIZE,
+                            help="Issues indexées par requête")
+
+    def handle(self, *args, **options):
+        if options['projects']:
+            targets = group_by_shard(options['projects'])
+        else:
+            targets = {alias: None for alias in shard_aliases()}
+
+        indexed = 0
+        for alias, project_ids in targets.items():
+            with on_shard(alias):
+                indexed += rebuild_index(
+                    project_ids, batch_size=options['batch_size'],
+                    progress=lambda count: self.stdout.write(f"  {alias} : {count} issue(s) indexée(s)...")
+                )
+        self.stdout.write(self.style.SUCCESS(f"Index des doublons reconstruit ({indexed} issues)."))
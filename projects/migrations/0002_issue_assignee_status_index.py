@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['assignee', 'status', 'created_time'], name='issue_assignee_status_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('projects', '0003_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ArchivedIssue',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255, verbose_name="Nom de l'issue")),
+                ('description', models.TextField(blank=True, verbose_name='Description')),
+                ('priority', models.CharField(choices=[('LOW', 'Faible'), ('MEDIUM', 'Moyenne'), ('HIGH', 'Élevée')], max_length=10, verbose_name='Priorité')),
+                ('tag', models.CharField(choices=[('BUG', 'Bug'), ('FEATURE', 'Fonctionnalité'), ('TASK', 'Tâche')], max_length=10, verbose_name='Étiquette')),
+                ('status', models.CharField(choices=[('TO_DO', 'À faire'), ('IN_PROGRESS', 'En cours'), ('FINISHED', 'Terminé')], max_length=15, verbose_name='Statut')),
+                ('created_time', models.DateTimeField()),
+                ('updated_time', models.DateTimeField(null=True)),
+                ('archived_time', models.DateTimeField(auto_now_add=True)),
+                ('assignee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assigned_archived_issues', to=settings.AUTH_USER_MODEL, verbose_name='Assigné à')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='authored_archived_issues', to=settings.AUTH_USER_MODEL, verbose_name='Auteur')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_issues', to='projects.project', verbose_name='Projet')),
+            ],
+            options={
+                'verbose_name': 'Issue archivée',
+                'verbose_name_plural': 'Issues archivées',
+                'ordering': ['-created_time'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedComment',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('description', models.TextField(verbose_name='Commentaire')),
+                ('created_time', models.DateTimeField()),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='authored_archived_comments', to=settings.AUTH_USER_MODEL, verbose_name='Auteur')),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='projects.archivedissue', verbose_name='Issue')),
+            ],
+            options={
+                'verbose_name': 'Commentaire archivé',
+                'verbose_name_plural': 'Commentaires archivés',
+                'ordering': ['-created_time'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedissue',
+            index=models.Index(fields=['project', 'created_time'], name='archived_issue_project_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:36
+
+from django.db import migrations, models
+import projects.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_issue_archive'),
+    ]
+
+    # Le défaut est calculé côté Python : rien ne change dans le schéma, on évite
+    # la reconstruction complète de la table des commentaires sous SQLite.
+    # Les identifiants existants (UUIDv4) sont conservés tels quels.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='comment',
+                    name='id',
+                    field=models.UUIDField(default=projects.models.new_comment_id, editable=False, primary_key=True, serialize=False, verbose_name='Identifiant unique'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_comment_time_ordered_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedissue',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('projects', '0006_issue_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectLocation',
+            fields=[
+                ('project_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('shard', models.CharField(max_length=100, verbose_name='Base')),
+                ('moving', models.BooleanField(default=False, verbose_name='En cours de déplacement')),
+                ('created_time', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Emplacement de projet',
+                'verbose_name_plural': 'Emplacements de projets',
+            },
+        ),
+        migrations.CreateModel(
+            name='Membership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='projects.projectlocation', verbose_name='Projet')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_memberships', to=settings.AUTH_USER_MODEL, verbose_name='Utilisateur')),
+            ],
+            options={
+                'verbose_name': 'Appartenance',
+                'verbose_name_plural': 'Appartenances',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='membership',
+            constraint=models.UniqueConstraint(fields=('user', 'location'), name='membership_user_location_uniq'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_shard_directory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueSimilarityBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField(verbose_name='Seau')),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarity_buckets', to='projects.issue', verbose_name='Issue')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarity_buckets', to='projects.project', verbose_name='Projet')),
+            ],
+            options={
+                'verbose_name': 'Seau de similarité',
+                'verbose_name_plural': 'Seaux de similarité',
+                'indexes': [models.Index(fields=['project', 'bucket'], name='issue_similarity_bucket_idx')],
+            },
+        ),
+    ]
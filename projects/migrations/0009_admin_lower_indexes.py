@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:48
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0008_issue_similarity_bucket'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_name_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='project',
+            name='project_name_idx',
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='issue_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='project_name_lower_idx'),
+        ),
+    ]
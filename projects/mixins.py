@@ -0,0 +1,163 @@
+from django.db.models import Exists, OuterRef
+from django.http import Http404
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+
+from core.routers import use_shard, reset_shard
+from .archive import restore_issue
+from .models import Project, Contributor, Issue, ArchivedIssue
+from .sharding import project_location
+
+
+class ProjectMoving(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Le projet est en cours de déplacement : réessayez dans quelques instants."
+    default_code = 'project_moving'
+
+    def __init__(self, wait):
+        super().__init__()
+        # Repris dans l'en-tête Retry-After par le gestionnaire d'exceptions de DRF
+        self.wait = wait
+
+
+class ShardedViewMixin:
+    """
+    Mixin pour les vues d'un projet (DATABASE_SHARDS) : les requêtes des
+    modèles partitionnés partent sur la base du projet de l'URL
+    (project_url_kwarg), lue dans l'annuaire, pendant toute la requête.
+    Les écritures sont refusées (503) pendant le déplacement du projet.
+    Les vues peuvent surcharger get_location() (création d'un projet).
+    """
+    project_url_kwarg = 'project_pk'
+    moving_retry_after = 5
+
+    def get_location(self):
+        """(base, en déplacement) pour cette requête ; base None : base principale"""
+        try:
+            project_id = int(self.kwargs[self.project_url_kwarg])
+        except (KeyError, TypeError, ValueError):
+            return None, False
+        return project_location(project_id)
+
+    def initial(self, request, *args, **kwargs):
+        shard, moving = self.get_location()
+        self._shard_token = use_shard(shard)
+        super().initial(request, *args, **kwargs)
+        if moving and request.method not in SAFE_METHODS:
+            raise ProjectMoving(wait=self.moving_retry_after)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_shard_token', None)
+        if token is not None:
+            reset_shard(token)
+            self._shard_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ProjectNestedMixin:
+    """
+    Mixin pour les vues imbriquées sous /projects/<project_pk>/.
+
+    Résout une seule fois par requête la chaîne parente (projet, issue) à
+    partir des paramètres d'URL, avec l'appartenance de l'utilisateur au
+    projet, en une seule requête jointe. Sur les routes de détail, l'objet
+    demandé est chargé dans cette même requête. Le résultat est partagé par
+    les permissions, get_object(), le queryset et le contexte du serializer.
+
+    Les vues définissent get_detail_queryset(), filtré sur toute la chaîne
+    parente, et get_parents(obj) qui retourne (projet, issue) depuis l'objet.
+
+    Une issue absente des tables actives est cherchée dans les archives
+    (get_archived_detail_queryset() pour l'objet de l'URL) : elle est servie
+    en lecture, et restaurée avant toute écriture que l'utilisateur est
+    autorisé à faire (contributeur, et auteur de l'objet sur les routes de
+    détail).
+    """
+
+    def _membership(self, project_ref):
+        return Contributor.objects.filter(project=OuterRef(project_ref), user=self.request.user)
+
+    def get_detail_queryset(self):
+        raise NotImplementedError
+
+    def get_archived_detail_queryset(self):
+        """Équivalent de get_detail_queryset() dans les archives ; None si la vue n'en a pas"""
+        return None
+
+    def get_parents(self, obj):
+        raise NotImplementedError
+
+    def resolve_parents(self):
+        """Retourne le tuple (projet, issue, objet) ; issue et objet peuvent valoir None"""
+        if hasattr(self, '_parents'):
+            return self._parents
+
+        project, issue, obj = self._resolve_parents()
+        archived_issue = issue if issue is not None else obj
+        if (
+            getattr(archived_issue, 'is_archived', False)
+            and self.request.method not in SAFE_METHODS
+            and project.is_contributor
+            and (obj is None or obj.author_id == self.request.user.id)
+        ):
+            restore_issue(archived_issue.pk)
+            project, issue, obj = self._resolve_parents()
+
+        self._parents = (project, issue, obj)
+        return self._parents
+
+    def _resolve_parents(self):
+        project_pk = self.kwargs.get('project_pk')
+        issue_pk = self.kwargs.get('issue_pk')
+        object_pk = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        issue = obj = None
+
+        if object_pk is not None:
+            # Route de détail : objet + parents + appartenance en une requête
+            obj = self.get_detail_queryset().filter(pk=object_pk).first()
+            if obj is None and self.get_archived_detail_queryset() is not None:
+                obj = self.get_archived_detail_queryset().filter(pk=object_pk).first()
+            if obj is None:
+                raise Http404("Ressource introuvable dans ce projet.")
+            project, issue = self.get_parents(obj)
+            project.is_contributor = obj.is_contributor
+        elif issue_pk is not None:
+            # L'issue doit appartenir au projet de l'URL
+            for model in (Issue, ArchivedIssue):
+                issue = (
+                    model.objects.select_related('project')
+                    .annotate(is_contributor=Exists(self._membership('project_id')))
+                    .filter(pk=issue_pk, project_id=project_pk)
+                    .first()
+                )
+                if issue is not None:
+                    break
+            else:
+                raise Http404("Issue introuvable dans ce projet.")
+            project = issue.project
+            project.is_contributor = issue.is_contributor
+        else:
+            project = (
+                Project.objects.annotate(is_contributor=Exists(self._membership('pk')))
+                .filter(pk=project_pk)
+                .first()
+            )
+            if project is None:
+                raise Http404("Projet introuvable.")
+
+        return project, issue, obj
+
+    def get_parent_project(self):
+        return self.resolve_parents()[0]
+
+    def get_parent_issue(self):
+        return self.resolve_parents()[1]
+
+    def get_object(self):
+        """Réutilise l'objet chargé avec ses parents au lieu d'une nouvelle requête"""
+        obj = self.resolve_parents()[2]
+        if obj is None:
+            return super().get_object()
+        self.check_object_permissions(self.request, obj)
+        return obj
@@ -1,7 +1,10 @@
 import uuid
 from django.db import models
+from django.db.models.functions import Lower
 from django.conf import settings
 
+from core.uuids import uuid7
+
 
 class Project(models.Model):
     """
@@ -40,6 +43,10 @@ class Project(models.Model):
         verbose_name = "Projet"
         verbose_name_plural = "Projets"
         ordering = ['-created_time']
+        indexes = [
+            # Recherche par préfixe sans casse de l'administration
+            models.Index(Lower('name'), name='project_name_lower_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -70,6 +77,10 @@ class Contributor(models.Model):
         verbose_name_plural = "Contributeurs"
         unique_together = ('user', 'project')  # Un utilisateur ne peut contribuer qu'une fois au même projet
         ordering = ['-created_time']
+        indexes = [
+            # Tri par défaut et filtres de date de l'administration
+            models.Index(fields=['created_time', 'id'], name='contributor_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.project.name}"
@@ -144,16 +155,40 @@ class Issue(models.Model):
         verbose_name="Statut"
     )
     created_time = models.DateTimeField(auto_now_add=True)
+    # Nul pour les issues antérieures à son ajout (voir projects/archive.py)
+    updated_time = models.DateTimeField(auto_now=True, null=True)
+    # Incrémentée à chaque modification (concurrence optimiste, voir projects/transitions.py)
+    version = models.PositiveIntegerField(default=0)
+
+    is_archived = False
     
     class Meta:
         verbose_name = "Issue"
         verbose_name_plural = "Issues"
         ordering = ['-created_time']
+        indexes = [
+            # Liste "mon travail" : issues assignées filtrées par statut, triées par date
+            models.Index(fields=['assignee', 'status', 'created_time'], name='issue_assignee_status_idx'),
+            # Tri par défaut et filtres de date de l'administration, recherche par préfixe
+            models.Index(fields=['created_time', 'id'], name='issue_created_idx'),
+            models.Index(Lower('name'), name='issue_name_lower_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.project.name}"
 
 
+def new_comment_id():
+    """
+    Identifiant d'un nouveau commentaire : UUIDv7 ordonné dans le temps
+    (COMMENT_TIME_ORDERED_IDS), UUIDv4 aléatoire sinon. Les deux formes
+    cohabitent dans la table et les URLs.
+    """
+    if settings.COMMENT_TIME_ORDERED_IDS:
+        return uuid7()
+    return uuid.uuid4()
+
+
 class Comment(models.Model):
     """
     Modèle représentant un commentaire sur une issue
@@ -161,7 +196,7 @@ class Comment(models.Model):
     
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        default=new_comment_id,
         editable=False,
         verbose_name="Identifiant unique"
     )
@@ -181,11 +216,176 @@ class Comment(models.Model):
         verbose_name="Auteur"
     )
     created_time = models.DateTimeField(auto_now_add=True)
+
+    is_archived = False
     
     class Meta:
         verbose_name = "Commentaire"
         verbose_name_plural = "Commentaires"
         ordering = ['-created_time']
+        indexes = [
+            # Tri par défaut et filtres de date de l'administration
+            models.Index(fields=['created_time', 'id'], name='comment_created_idx'),
+        ]
     
     def __str__(self):
         return f"Commentaire de {self.author.username} sur {self.issue.name}"
+
+
+class ArchivedIssue(models.Model):
+    """
+    Issue terminée déplacée hors de la table des issues par la commande
+    archive_issues (voir projects/archive.py). Mêmes colonnes et même
+    identifiant que l'issue d'origine ; elle est restaurée si on la modifie.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=255, verbose_name="Nom de l'issue")
+    description = models.TextField(verbose_name="Description", blank=True)
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='archived_issues',
+        verbose_name="Projet"
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='authored_archived_issues',
+        verbose_name="Auteur"
+    )
+    assignee = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='assigned_archived_issues',
+        verbose_name="Assigné à"
+    )
+    priority = models.CharField(max_length=10, choices=Issue.PRIORITY_CHOICES, verbose_name="Priorité")
+    tag = models.CharField(max_length=10, choices=Issue.TAG_CHOICES, verbose_name="Étiquette")
+    status = models.CharField(max_length=15, choices=Issue.STATUS_CHOICES, verbose_name="Statut")
+    created_time = models.DateTimeField()
+    updated_time = models.DateTimeField(null=True)
+    version = models.PositiveIntegerField(default=0)
+    archived_time = models.DateTimeField(auto_now_add=True)
+
+    is_archived = True
+
+    class Meta:
+        verbose_name = "Issue archivée"
+        verbose_name_plural = "Issues archivées"
+        ordering = ['-created_time']
+        indexes = [
+            # Liste d'un projet avec ?include_archived=1
+            models.Index(fields=['project', 'created_time'], name='archived_issue_project_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} - {self.project.name} (archivée)"
+
+
+class ArchivedComment(models.Model):
+    """
+    Commentaire d'une issue archivée, archivé avec elle
+    """
+    id = models.UUIDField(primary_key=True, editable=False)
+    description = models.TextField(verbose_name="Commentaire")
+    issue = models.ForeignKey(
+        ArchivedIssue,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        verbose_name="Issue"
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='authored_archived_comments',
+        verbose_name="Auteur"
+    )
+    created_time = models.DateTimeField()
+
+    is_archived = True
+
+    class Meta:
+        verbose_name = "Commentaire archivé"
+        verbose_name_plural = "Commentaires archivés"
+        ordering = ['-created_time']
+
+    def __str__(self):
+        return f"Commentaire de {self.author.username} sur {self.issue.name} (archivé)"
+
+
+class IssueSimilarityBucket(models.Model):
+    """
+    Index de détection des doublons : un seau LSH par bande de la signature
+    MinHash (nom + description) de chaque issue active, voir
+    projects/similarity.py. Deux issues d'un projet qui partagent un seau
+    sont candidates.
+    """
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='similarity_buckets',
+        verbose_name="Projet"
+    )
+    issue = models.ForeignKey(
+        Issue,
+        on_delete=models.CASCADE,
+        related_name='similarity_buckets',
+        verbose_name="Issue"
+    )
+    bucket = models.BigIntegerField(verbose_name="Seau")
+
+    class Meta:
+        verbose_name = "Seau de similarité"
+        verbose_name_plural = "Seaux de similarité"
+        indexes = [
+            # Recherche des candidats : seaux de la nouvelle issue dans son projet
+            models.Index(fields=['project', 'bucket'], name='issue_similarity_bucket_idx'),
+        ]
+
+
+class ProjectLocation(models.Model):
+    """
+    Annuaire du partitionnement (base principale) : base de chaque projet,
+    voir projects/sharding.py. moving bloque les écritures pendant un
+    déplacement (commande rebalance_shards).
+    """
+    project_id = models.BigIntegerField(primary_key=True)
+    shard = models.CharField(max_length=100, verbose_name="Base")
+    moving = models.BooleanField(default=False, verbose_name="En cours de déplacement")
+    created_time = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Emplacement de projet"
+        verbose_name_plural = "Emplacements de projets"
+
+    def __str__(self):
+        return f"Projet {self.project_id} -> {self.shard}"
+
+
+class Membership(models.Model):
+    """
+    Annuaire utilisateur -> projets (base principale) : liste des projets d'un
+    utilisateur sans interroger toutes les partitions. Tenu à jour avec les
+    contributeurs (voir projects/signals.py).
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='project_memberships',
+        verbose_name="Utilisateur"
+    )
+    location = models.ForeignKey(
+        ProjectLocation,
+        on_delete=models.CASCADE,
+        related_name='memberships',
+        verbose_name="Projet"
+    )
+
+    class Meta:
+        verbose_name = "Appartenance"
+        verbose_name_plural = "Appartenances"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'location'], name='membership_user_location_uniq'),
+        ]
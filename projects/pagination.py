@@ -0,0 +1,13 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedTimeCursorPagination(CursorPagination):
+    """
+    Pagination par curseur (keyset) sur la date de création :
+    le coût d'une page ne dépend pas de sa position dans la liste.
+    L'identifiant départage les ex aequo (fusion des partitions).
+    """
+    ordering = ('-created_time', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
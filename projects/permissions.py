@@ -1,5 +1,5 @@
 from rest_framework import permissions
-from .models import Contributor
+from .models import Project, Contributor
 
 
 class IsAuthorOrReadOnly(permissions.BasePermission):
@@ -25,21 +25,20 @@ class IsProjectContributor(permissions.BasePermission):
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
             return False
-        
-        # Pour les vues de projets
-        if hasattr(view, 'get_object'):
-            try:
-                project = view.get_object()
-                return Contributor.objects.filter(
-                    project=project,
-                    user=request.user
-                ).exists()
-            except:
-                return True  # Laisse passer pour les autres validations
-        
+
+        # Pour les vues imbriquées (issues, commentaires) : le projet parent
+        # est résolu une seule fois par la vue, appartenance comprise
+        if hasattr(view, 'get_parent_project'):
+            return view.get_parent_project().is_contributor
+
+        # Les autres vues sont vérifiées au niveau de l'objet
         return True
 
     def has_object_permission(self, request, view, obj):
+        # Objet issu d'une vue imbriquée : déjà vérifié via le projet parent
+        if hasattr(view, 'get_parent_project'):
+            return view.get_parent_project().is_contributor
+
         # Pour les objets Project
         if hasattr(obj, 'contributors'):
             return Contributor.objects.filter(
@@ -100,6 +99,10 @@ class CanManageContributors(permissions.BasePermission):
         return True
 
     def has_object_permission(self, request, view, obj):
+        # Pour les actions sur un projet (ajout de contributeur)
+        if isinstance(obj, Project):
+            return obj.author == request.user
+
         # Pour les objets Contributor, vérifier que l'utilisateur est l'auteur du projet
         if hasattr(obj, 'project'):
             return obj.project.author == request.user
@@ -0,0 +1,27 @@
+from rest_framework.routers import SimpleRouter
+
+
+class NestedRouter(SimpleRouter):
+    """
+    Routeur pour des ressources imbriquées sous une ressource parente.
+
+    NestedRouter('projects', 'project') enregistre ses viewsets sous
+    projects/<project_pk>/ ; nested() permet de descendre d'un niveau
+    (projects/<project_pk>/issues/<issue_pk>/...).
+    Les identifiants parents sont transmis à la vue via self.kwargs.
+    """
+
+    def __init__(self, parent_prefix, parent_lookup, lookup_value_regex=r'\d+', **kwargs):
+        super().__init__(**kwargs)
+        self.parent_regex = f'{parent_prefix}/(?P<{parent_lookup}_pk>{lookup_value_regex})'
+
+    def register(self, prefix, viewset, basename=None):
+        super().register(f'{self.parent_regex}/{prefix}', viewset, basename)
+
+    def nested(self, prefix, lookup, lookup_value_regex=r'\d+'):
+        """Retourne un routeur enfant imbriqué sous <prefix>/<lookup>_pk/"""
+        return NestedRouter(
+            f'{self.parent_regex}/{prefix}', lookup,
+            lookup_value_regex=lookup_value_regex,
+            trailing_slash=self.trailing_slash == '/'
+        )
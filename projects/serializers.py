@@ -1,17 +1,21 @@
 from rest_framework import serializers
-from .models import Project, Contributor, Issue, Comment
-from accounts.serializers import UserSerializer
+from .models import Project, Contributor, Issue, Comment, ArchivedIssue, ArchivedComment
+from accounts.models import User
+from accounts.serializers import UserSummaryField, UserSummaryListSerializer
+from .signals import issue_assigned
+from .similarity import find_similar, fingerprint
 
 
 class ProjectSerializer(serializers.ModelSerializer):
     """
     Serializer pour les projets
     """
-    author = UserSerializer(read_only=True)
+    author = UserSummaryField()
     contributors_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
+        list_serializer_class = UserSummaryListSerializer
         fields = [
             'id', 'name', 'description', 'type', 'author', 
             'contributors_count', 'created_time'
@@ -20,6 +24,8 @@ class ProjectSerializer(serializers.ModelSerializer):
 
     def get_contributors_count(self, obj):
         """Retourne le nombre de contributeurs du projet"""
+        if hasattr(obj, 'num_contributors'):
+            return obj.num_contributors
         return obj.contributors.count()
 
     def create(self, validated_data):
@@ -35,17 +41,17 @@ class ContributorSerializer(serializers.ModelSerializer):
     """
     Serializer pour les contributeurs
     """
-    user = UserSerializer(read_only=True)
+    user = UserSummaryField()
     user_id = serializers.IntegerField(write_only=True)
 
     class Meta:
         model = Contributor
+        list_serializer_class = UserSummaryListSerializer
         fields = ['id', 'user', 'user_id', 'project', 'created_time']
         read_only_fields = ['id', 'project', 'created_time']
 
     def validate_user_id(self, value):
         """Valide que l'utilisateur existe"""
-        from accounts.models import User
         try:
             User.objects.get(id=value)
         except User.DoesNotExist:
@@ -67,32 +73,63 @@ class ContributorSerializer(serializers.ModelSerializer):
         """Crée un nouveau contributeur"""
         project = self.context['project']
         user_id = validated_data.pop('user_id')
-        from accounts.models import User
         user = User.objects.get(id=user_id)
         return Contributor.objects.create(user=user, project=project)
 
 
+def send_issue_assigned(issue, user):
+    issue_assigned.send(
+        sender=Issue, issue_id=issue.pk, project_id=issue.project_id,
+        assignee_id=issue.assignee_id, actor_id=user.pk, using=issue._state.db
+    )
+
+
+class SimilarIssueSerializer(serializers.ModelSerializer):
+    """
+    Serializer des issues proches d'un texte (détection des doublons), avec
+    leur similarité de Jaccard (0 à 1)
+    """
+    similarity = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Issue
+        fields = ['id', 'name', 'status', 'similarity']
+        read_only_fields = fields
+
+
+class SimilarIssuesQuerySerializer(serializers.Serializer):
+    """Paramètres de la recherche d'issues proches"""
+    name = serializers.CharField(max_length=255)
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+    limit = serializers.IntegerField(min_value=1, max_value=50, required=False)
+    threshold = serializers.FloatField(min_value=0, max_value=1, required=False)
+
+
 class IssueSerializer(serializers.ModelSerializer):
     """
     Serializer pour les issues
     """
-    author = UserSerializer(read_only=True)
-    assignee = UserSerializer(read_only=True)
+    author = UserSummaryField()
+    assignee = UserSummaryField()
     assignee_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
     project_name = serializers.CharField(source='project.name', read_only=True)
     comments_count = serializers.SerializerMethodField()
+    archived = serializers.BooleanField(source='is_archived', read_only=True)
 
     class Meta:
         model = Issue
+        list_serializer_class = UserSummaryListSerializer
         fields = [
             'id', 'name', 'description', 'project', 'project_name',
             'author', 'assignee', 'assignee_id', 'priority', 'tag', 
-            'status', 'comments_count', 'created_time'
+            'status', 'comments_count', 'archived', 'version', 'created_time'
         ]
-        read_only_fields = ['id', 'project', 'author', 'created_time']
+        read_only_fields = ['id', 'project', 'author', 'version', 'created_time']
 
     def get_comments_count(self, obj):
         """Retourne le nombre de commentaires de l'issue"""
+        if hasattr(obj, 'num_comments'):
+            return obj.num_comments
         return obj.comments.count()
 
     def validate_assignee_id(self, value):
@@ -106,32 +143,74 @@ class IssueSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
-        """Crée une nouvelle issue"""
+        """
+        Crée une nouvelle issue, avec les issues du projet dont le texte est
+        proche (doublons probables, renvoyés dans similar_issues)
+        """
         user = self.context['request'].user
         project = self.context['project']
         assignee_id = validated_data.pop('assignee_id', None)
         
-        issue = Issue.objects.create(
+        issue = Issue(
             author=user,
             project=project,
             assignee_id=assignee_id,
             **validated_data
         )
+        issue_fingerprint = fingerprint(issue.name, issue.description)
+        issue.similar_issues = find_similar(project.pk, issue_fingerprint)
+        # Déjà calculée, reprise par l'indexation (projects/signals.py)
+        issue.similarity_fingerprint = issue_fingerprint
+        issue.save(force_insert=True)
+        if assignee_id is not None:
+            send_issue_assigned(issue, user)
+        return issue
+
+    def update(self, instance, validated_data):
+        previous_assignee_id = instance.assignee_id
+        issue = super().update(instance, validated_data)
+        if issue.assignee_id is not None and issue.assignee_id != previous_assignee_id:
+            send_issue_assigned(issue, self.context['request'].user)
         return issue
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        similar_issues = getattr(instance, 'similar_issues', None)
+        if similar_issues is not None:
+            data['similar_issues'] = SimilarIssueSerializer(similar_issues, many=True).data
+        return data
+
+
+class IssueTransitionSerializer(serializers.Serializer):
+    """
+    Serializer des transitions d'issue : nouveau statut et/ou nouvel assigné,
+    appliqués seulement si l'issue est encore à la version indiquée
+    """
+    # Bornes d'un BIGINT : au-delà, la requête SQL lèverait OverflowError
+    version = serializers.IntegerField(min_value=0, max_value=2 ** 63 - 1)
+    status = serializers.ChoiceField(choices=Issue.STATUS_CHOICES, required=False)
+    assignee_id = serializers.IntegerField(required=False, allow_null=True, min_value=1, max_value=2 ** 63 - 1)
+
+    def validate(self, attrs):
+        if 'status' not in attrs and 'assignee_id' not in attrs:
+            raise serializers.ValidationError("Indiquez un nouveau statut et/ou un nouvel assigné.")
+        return attrs
+
 
 class CommentSerializer(serializers.ModelSerializer):
     """
     Serializer pour les commentaires
     """
-    author = UserSerializer(read_only=True)
+    author = UserSummaryField()
     issue_name = serializers.CharField(source='issue.name', read_only=True)
+    archived = serializers.BooleanField(source='is_archived', read_only=True)
 
     class Meta:
         model = Comment
+        list_serializer_class = UserSummaryListSerializer
         fields = [
             'id', 'description', 'issue', 'issue_name',
-            'author', 'created_time'
+            'author', 'archived', 'created_time'
         ]
         read_only_fields = ['id', 'issue', 'author', 'created_time']
 
@@ -144,3 +223,23 @@ class CommentSerializer(serializers.ModelSerializer):
             issue=issue,
             **validated_data
         )
+
+
+class ArchivedIssueSerializer(IssueSerializer):
+    """
+    Serializer en lecture seule des issues archivées (même représentation)
+    """
+
+    class Meta(IssueSerializer.Meta):
+        model = ArchivedIssue
+        read_only_fields = IssueSerializer.Meta.fields
+
+
+class ArchivedCommentSerializer(CommentSerializer):
+    """
+    Serializer en lecture seule des commentaires archivés (même représentation)
+    """
+
+    class Meta(CommentSerializer.Meta):
+        model = ArchivedComment
+        read_only_fields = CommentSerializer.Meta.fields
@@ -0,0 +1,240 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from accounts.models import User
+from core.db import copy_rows_to
+from core.routers import on_shard
+from core.sharding import fan_out, sharding_enabled
+from .models import (
+    Project, Contributor, Issue, Comment, ArchivedIssue, ArchivedComment,
+    ProjectLocation, Membership,
+)
+from .similarity import rebuild_index as rebuild_similarity_index
+
+
+LOCATION_CACHE_PREFIX = 'project-location'
+LOCATION_CACHE_TIMEOUT = 3600
+
+# Tables d'un projet, dans l'ordre des clés étrangères, et leur filtre sur le projet
+PROJECT_TABLES = [
+    (Project, 'pk'),
+    (Contributor, 'project_id'),
+    (Issue, 'project_id'),
+    (Comment, 'issue__project_id'),
+    (ArchivedIssue, 'project_id'),
+    (ArchivedComment, 'issue__project_id'),
+]
+# Colonnes utilisateur des mêmes tables : ces utilisateurs doivent exister sur la base cible
+USER_COLUMNS = {
+    Project: ['author_id'],
+    Contributor: ['user_id'],
+    Issue: ['author_id', 'assignee_id'],
+    Comment: ['author_id'],
+    ArchivedIssue: ['author_id', 'assignee_id'],
+    ArchivedComment: ['author_id'],
+}
+
+
+def shard_aliases():
+    """Bases contenant des données de projets (la base principale seule sans partitionnement)"""
+    return settings.DATABASE_SHARDS or ['default']
+
+
+def location_cache_key(project_id):
+    return f'{LOCATION_CACHE_PREFIX}:{project_id}'
+
+
+def project_location(project_id):
+    """
+    (base, en déplacement) d'un projet, d'après l'annuaire mis en cache. Un
+    projet absent de l'annuaire (antérieur au partitionnement) est sur la
+    base principale.
+    """
+    if not sharding_enabled():
+        return 'default', False
+    key = location_cache_key(project_id)
+    location = cache.get(key)
+    if location is None:
+        row = ProjectLocation.objects.filter(pk=project_id).values_list('shard', 'moving').first()
+        if row is None:
+            return 'default', False
+        location = tuple(row)
+        cache.set(key, location, timeout=LOCATION_CACHE_TIMEOUT)
+    return location
+
+
+def shard_for_project(project_id):
+    return project_location(project_id)[0]
+
+
+def invalidate_location(*project_ids):
+    cache.delete_many([location_cache_key(project_id) for project_id in project_ids])
+
+
+def group_by_shard(project_ids):
+    """{base: [identifiants]} pour des projets de bases diverses"""
+    project_ids = list(project_ids)
+    if not sharding_enabled():
+        return {'default': project_ids} if project_ids else {}
+    shards = dict(ProjectLocation.objects.filter(pk__in=project_ids).values_list('pk', 'shard'))
+    grouped = {}
+    for project_id in project_ids:
+        grouped.setdefault(shards.get(project_id, 'default'), []).append(project_id)
+    return grouped
+
+
+def choose_shard():
+    """Base d'un nouveau projet : celle qui en compte le moins"""
+    counts = dict(ProjectLocation.objects.values('shard').annotate(count=Count('pk')).values_list('shard', 'count'))
+    return min(settings.DATABASE_SHARDS, key=lambda alias: counts.get(alias, 0))
+
+
+def user_shards(user_id):
+    """Bases où l'utilisateur contribue à au moins un projet"""
+    return set(
+        Membership.objects.filter(user_id=user_id)
+        .values_list('location__shard', flat=True).distinct()
+    )
+
+
+def mirror_users(user_ids, alias):
+    """
+    Recopie (ou met à jour) les utilisateurs sur une partition, pour les clés
+    étrangères et les jointures des données de projets. Le mot de passe n'est
+    pas recopié : l'authentification se fait sur la base principale.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if alias == 'default' or not user_ids:
+        return
+    users = list(User.objects.using('default').filter(pk__in=user_ids))
+    for user in users:
+        user.password = '!'
+    User.objects.using(alias).bulk_create(
+        users,
+        update_conflicts=True,
+        unique_fields=['id'],
+        update_fields=[field.name for field in User._meta.concrete_fields if not field.primary_key],
+    )
+
+
+def rebuild_directory(progress=None):
+    """
+    Reconstruit l'annuaire (emplacements et appartenances) à partir des
+    projets et contributeurs présents sur chaque base, et recopie les
+    contributeurs sur leurs partitions. À lancer à l'activation du
+    partitionnement sur une base existante.
+    """
+    report = {}
+    for alias in shard_aliases():
+        projects = list(Project.objects.using(alias).values_list('pk', 'created_time'))
+        ProjectLocation.objects.bulk_create(
+            [ProjectLocation(project_id=pk, shard=alias, created_time=created) for pk, created in projects],
+            update_conflicts=True, unique_fields=['project_id'], update_fields=['shard', 'created_time'],
+        )
+        members = list(Contributor.objects.using(alias).values_list('user_id', 'project_id'))
+        Membership.objects.bulk_create(
+            [Membership(user_id=user_id, location_id=project_id) for user_id, project_id in members],
+            ignore_conflicts=True,
+        )
+        mirror_users({user_id for user_id, _ in members}, alias)
+        report[alias] = len(projects)
+        if progress is not None:
+            progress(alias, len(projects))
+    invalidate_location(*ProjectLocation.objects.values_list('pk', flat=True))
+    return report
+
+
+def project_weights():
+    """{base: {projet: nombre d'issues}} ; un projet sans issue pèse 1"""
+    def weights(alias):
+        counts = dict(
+            Issue.objects.using(alias).order_by().values('project_id')
+            .annotate(count=Count('pk')).values_list('project_id', 'count')
+        )
+        return {pk: counts.get(pk, 0) or 1 for pk in Project.objects.using(alias).values_list('pk', flat=True)}
+    return fan_out(weights, shard_aliases())
+
+
+def plan_rebalance(weights):
+    """
+    Déplacements [(projet, source, cible)] qui rapprochent chaque base de la
+    charge moyenne : tant que c'est possible, le plus gros projet de la base
+    la plus chargée qui réduit l'écart avec la moins chargée est déplacé
+    """
+    loads = {alias: sum(projects.values()) for alias, projects in weights.items()}
+    placement = {alias: dict(projects) for alias, projects in weights.items()}
+    moves = []
+    while True:
+        source = max(loads, key=loads.get)
+        target = min(loads, key=loads.get)
+        gap = loads[source] - loads[target]
+        candidates = [(weight, pk) for pk, weight in placement[source].items() if weight < gap]
+        if not candidates:
+            return moves
+        weight, project_id = max(candidates)
+        del placement[source][project_id]
+        placement[target][project_id] = weight
+        loads[source] -= weight
+        loads[target] += weight
+        moves.append((project_id, source, target))
+
+
+def move_project(project_id, target, batch_size=None, progress=None):
+    """
+    Déplace un projet et toutes ses lignes vers la base target : les
+    écritures sur le projet sont refusées pendant la copie (moving), puis
+    l'annuaire bascule et les lignes de la base d'origine sont supprimées.
+    Une copie interrompue peut être relancée : les lignes déjà copiées sur
+    la cible sont d'abord effacées. Retourne le nombre de lignes copiées.
+    """
+    from .deletion import delete_project_rows
+
+    batch_size = batch_size or settings.DELETION_CHUNK_SIZE
+    location = ProjectLocation.objects.get(pk=project_id)
+    source = location.shard
+    if source == target:
+        return 0
+
+    ProjectLocation.objects.filter(pk=project_id).update(moving=True)
+    invalidate_location(project_id)
+
+    delete_project_rows(project_id, target, batch_size)
+    user_ids = set()
+    for model, lookup in PROJECT_TABLES:
+        for columns in model.objects.using(source).filter(**{lookup: project_id}).values_list(*USER_COLUMNS[model]):
+            user_ids.update(columns)
+    mirror_users(user_ids, target)
+
+    copied = 0
+    with transaction.atomic(using=target):
+        for model, lookup in PROJECT_TABLES:
+            count = copy_rows_to(model.objects.using(source).filter(**{lookup: project_id}), target, batch_size)
+            copied += count
+            if progress is not None:
+                progress(model._meta.model_name, count)
+        # Index des doublons : recalculé sur la cible (identifiants propres à chaque base)
+        with on_shard(target):
+            rebuild_similarity_index([project_id], batch_size)
+
+    ProjectLocation.objects.filter(pk=project_id).update(shard=target, moving=False)
+    invalidate_location(project_id)
+    delete_project_rows(project_id, source, batch_size)
+    return copied
+
+
+def load_projects(project_ids, queryset_for):
+    """
+    Charge en parallèle, sur chaque base, les projets demandés :
+    queryset_for(alias, identifiants) construit la requête d'une base.
+    Retourne {identifiant: projet}.
+    """
+    grouped = group_by_shard(project_ids)
+    results = fan_out(lambda alias: list(queryset_for(alias, grouped[alias])), grouped)
+    return {project.pk: project for projects in results.values() for project in projects}
+
+
+def on_project_shard(project_id):
+    """Contexte qui route les requêtes sur la base du projet"""
+    return on_shard(shard_for_project(project_id))
@@ -0,0 +1,100 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from accounts.models import User
+from core.sharding import allocate_id, sharding_enabled
+from .models import Project, Contributor, Issue, Comment, ArchivedIssue, ProjectLocation, Membership
+from .sharding import USER_COLUMNS, invalidate_location, mirror_users, user_shards
+from .similarity import index_issue
+from .stats import invalidate_project_stats
+
+
+# Champs dont dépend l'index des doublons
+SIMILARITY_FIELDS = {'name', 'description'}
+
+# Issue (ré)assignée à un utilisateur (création, modification ou transition) ;
+# arguments : issue_id, project_id, assignee_id, actor_id, using (base de l'issue)
+issue_assigned = Signal()
+
+
+@receiver([post_save, post_delete], sender=Issue)
+def issue_changed(sender, instance, **kwargs):
+    """Invalide les statistiques du projet lorsqu'une issue change"""
+    invalidate_project_stats(instance.project_id)
+
+
+@receiver(post_save, sender=Issue)
+def issue_indexed(sender, instance, raw=False, update_fields=None, using=None, **kwargs):
+    """Tient à jour l'index de détection des doublons lorsque le texte d'une issue change"""
+    if raw or (update_fields is not None and not SIMILARITY_FIELDS.intersection(update_fields)):
+        return
+    issue_fingerprint = vars(instance).pop('similarity_fingerprint', None)
+    index_issue(instance, issue_fingerprint and issue_fingerprint[1], using=using)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    """Invalide les statistiques du projet lorsqu'un commentaire change"""
+    if Comment.issue.is_cached(instance):
+        project_id = instance.issue.project_id
+    else:
+        # Évite de charger l'issue complète (suppressions en cascade notamment)
+        project_id = Issue.objects.filter(pk=instance.issue_id).values_list('project_id', flat=True).first()
+    if project_id is not None:
+        invalidate_project_stats(project_id)
+
+
+# Partitionnement (DATABASE_SHARDS) : identifiants globaux, annuaire et copies des utilisateurs
+
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=Contributor)
+@receiver(pre_save, sender=Issue)
+def allocate_shard_id(sender, instance, raw=False, using=None, **kwargs):
+    """
+    Attribue aux nouveaux objets un identifiant unique sur toutes les
+    partitions ; un nouvel auteur de projet ou contributeur est recopié sur la
+    partition (les auteurs et assignés d'issues sont des contributeurs)
+    """
+    if raw or not sharding_enabled() or not instance._state.adding:
+        return
+    if instance.pk is None:
+        instance.pk = allocate_id(sender, shared_with=[ArchivedIssue] if sender is Issue else [])
+    if sender is not Issue:
+        mirror_users([getattr(instance, column) for column in USER_COLUMNS[sender]], using)
+
+
+@receiver(post_save, sender=Project)
+def project_located(sender, instance, created, raw=False, using=None, **kwargs):
+    """Enregistre un nouveau projet dans l'annuaire"""
+    if created and not raw and sharding_enabled():
+        ProjectLocation.objects.create(project_id=instance.pk, shard=using, created_time=instance.created_time)
+        invalidate_location(instance.pk)
+
+
+@receiver(post_delete, sender=Project)
+def project_unlocated(sender, instance, **kwargs):
+    if sharding_enabled():
+        ProjectLocation.objects.filter(pk=instance.pk).delete()
+        invalidate_location(instance.pk)
+
+
+@receiver(post_save, sender=Contributor)
+def membership_added(sender, instance, created, raw=False, **kwargs):
+    """Reporte la contribution dans l'annuaire (projets d'un utilisateur)"""
+    if created and not raw and sharding_enabled():
+        Membership.objects.get_or_create(user_id=instance.user_id, location_id=instance.project_id)
+
+
+@receiver(post_delete, sender=Contributor)
+def membership_removed(sender, instance, **kwargs):
+    if sharding_enabled():
+        Membership.objects.filter(user_id=instance.user_id, location_id=instance.project_id).delete()
+
+
+@receiver(post_save, sender=User)
+def user_mirrored(sender, instance, raw=False, using=None, **kwargs):
+    """Répercute les modifications d'un utilisateur sur les partitions où il contribue"""
+    if raw or using != 'default' or not sharding_enabled():
+        return
+    for alias in user_shards(instance.pk):
+        mirror_users([instance.pk], alias)
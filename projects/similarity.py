@@ -0,0 +1,158 @@
+import hashlib
+import re
+import struct
+import unicodedata
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+
+from core.routers import current_shard
+from .models import Issue, IssueSimilarityBucket
+
+
+# Signature MinHash de BANDS × ROWS valeurs, découpée en BANDS seaux LSH : deux
+# textes de similarité de Jaccard s partagent un seau avec une probabilité
+# 1 - (1 - s^ROWS)^BANDS (≈ 42 % à 0,3, 93 % à 0,5, 99,9 % à 0,7).
+# Changer ces valeurs impose de reconstruire l'index.
+SHINGLE_SIZE = 2
+BANDS = 20
+ROWS = 3
+# Candidats (les plus de seaux communs) dont la similarité exacte est calculée
+MAX_CANDIDATES = 50
+
+# BANDS × ROWS fonctions de hachage indépendantes d'un shingle : les tranches de
+# 64 bits d'une seule sortie SHAKE-128
+_SIGNATURE = struct.Struct(f'>{BANDS * ROWS}Q')
+_WORD = re.compile(r'\w+')
+
+
+def words(text):
+    """Mots en minuscules, sans accents"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _WORD.findall(text.lower())
+
+
+def shingles(name, description):
+    """Suites de SHINGLE_SIZE mots consécutifs du nom et de la description"""
+    tokens = words(name) + words(description)
+    if len(tokens) < SHINGLE_SIZE:
+        return set(tokens)
+    return {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+
+def buckets(shingle_set):
+    """Seaux LSH (entiers signés sur 64 bits, un par bande) d'un ensemble de shingles"""
+    if not shingle_set:
+        return []
+    hashes = [
+        _SIGNATURE.unpack(hashlib.shake_128(shingle.encode()).digest(_SIGNATURE.size))
+        for shingle in shingle_set
+    ]
+    # Minimum de chaque fonction sur les shingles (colonne par colonne, en C)
+    signature = list(map(min, zip(*hashes)))
+    return [
+        int.from_bytes(hashlib.blake2b(
+            struct.pack(f'>H{ROWS}Q', band, *signature[band * ROWS:(band + 1) * ROWS]), digest_size=8
+        ).digest(), 'big', signed=True)
+        for band in range(BANDS)
+    ]
+
+
+def fingerprint(name, description):
+    """(shingles, seaux) d'un texte d'issue, calculés une fois pour la recherche et l'indexation"""
+    shingle_set = shingles(name, description)
+    return shingle_set, buckets(shingle_set)
+
+
+def jaccard(first, second):
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def index_issue(issue, issue_buckets=None, using=None):
+    """
+    Remplace les seaux d'une issue s'ils ont changé (création, modification
+    de son texte), sur la base using (à défaut, celle du contexte)
+    """
+    using = using or current_shard()
+    if issue_buckets is None:
+        issue_buckets = fingerprint(issue.name, issue.description)[1]
+    existing = IssueSimilarityBucket.objects.using(using).filter(issue_id=issue.pk)
+    # Texte inchangé (autre champ modifié) : une seule lecture
+    if set(existing.values_list('bucket', flat=True)) == set(issue_buckets):
+        return
+    with transaction.atomic(using=using):
+        existing.delete()
+        IssueSimilarityBucket.objects.using(using).bulk_create([
+            IssueSimilarityBucket(project_id=issue.project_id, issue_id=issue.pk, bucket=bucket)
+            for bucket in issue_buckets
+        ])
+
+
+def rebuild_index(project_ids=None, batch_size=None, progress=None):
+    """
+    Reconstruit l'index des issues actives (de project_ids, ou de tous les
+    projets) de la base courante, par lots. Retourne le nombre d'issues indexées.
+    """
+    batch_size = batch_size or settings.DELETION_CHUNK_SIZE
+    issues = Issue.objects.order_by('pk')
+    existing = IssueSimilarityBucket.objects.all()
+    if project_ids is not None:
+        issues = issues.filter(project_id__in=project_ids)
+        existing = existing.filter(project_id__in=project_ids)
+    existing.delete()
+
+    indexed = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            issues.filter(pk__gt=last_pk).values_list('pk', 'project_id', 'name', 'description')[:batch_size]
+        )
+        if not batch:
+            return indexed
+        IssueSimilarityBucket.objects.bulk_create([
+            IssueSimilarityBucket(project_id=project_id, issue_id=pk, bucket=bucket)
+            for pk, project_id, name, description in batch
+            for bucket in fingerprint(name, description)[1]
+        ], batch_size=batch_size)
+        indexed += len(batch)
+        last_pk = batch[-1][0]
+        if progress is not None:
+            progress(indexed)
+
+
+def find_similar(project_id, issue_fingerprint, exclude=None, limit=None, threshold=None):
+    """
+    Issues actives du projet proches d'un texte (fingerprint()) : les
+    MAX_CANDIDATES issues qui partagent le plus de seaux sont lues (deux
+    requêtes indexées, quelle que soit la taille du projet), puis classées
+    par similarité de Jaccard exacte de leurs shingles. Retourne au plus
+    limit (ISSUE_SIMILARITY_MAX_RESULTS) issues, annotées de leur score
+    (similarity) d'au moins threshold (ISSUE_SIMILARITY_THRESHOLD).
+    """
+    limit = settings.ISSUE_SIMILARITY_MAX_RESULTS if limit is None else limit
+    threshold = settings.ISSUE_SIMILARITY_THRESHOLD if threshold is None else threshold
+    shingle_set, issue_buckets = issue_fingerprint
+    if not issue_buckets or limit <= 0:
+        return []
+
+    candidates = IssueSimilarityBucket.objects.filter(project_id=project_id, bucket__in=issue_buckets)
+    if exclude is not None:
+        candidates = candidates.exclude(issue_id=exclude)
+    candidate_ids = list(
+        candidates.values('issue_id').annotate(shared=Count('pk'))
+        .order_by('-shared', 'issue_id').values_list('issue_id', flat=True)[:MAX_CANDIDATES]
+    )
+    if not candidate_ids:
+        return []
+
+    scored = []
+    for issue in Issue.objects.filter(pk__in=candidate_ids).only('id', 'name', 'description', 'status'):
+        issue.similarity = jaccard(shingle_set, shingles(issue.name, issue.description))
+        if issue.similarity >= threshold:
+            scored.append(issue)
+    scored.sort(key=lambda issue: (-issue.similarity, issue.pk))
+    return scored[:limit]
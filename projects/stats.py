@@ -0,0 +1,144 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.routers import on_shard
+from core.sharding import fan_out
+from .models import Issue, Comment, ArchivedIssue
+from .sharding import group_by_shard
+
+
+STATS_CACHE_PREFIX = 'project-stats'
+COMMENT_ACTIVITY_DAYS = 30
+
+
+def stats_cache_key(project_id):
+    """Clé de cache des statistiques d'un projet"""
+    return f'{STATS_CACHE_PREFIX}:{project_id}'
+
+
+def invalidate_project_stats(*project_ids):
+    """Supprime les statistiques en cache des projets indiqués"""
+    cache.delete_many([stats_cache_key(project_id) for project_id in project_ids])
+
+
+def _empty_stats(project_id):
+    return {
+        'project': project_id,
+        'issues_total': 0,
+        'open_issues_total': 0,
+        'issues': [],
+        'open_issues_by_assignee': [],
+        'comments_last_30_days': 0,
+        'comment_activity': [],
+    }
+
+
+def compute_projects_stats(project_ids):
+    """
+    Calcule les statistiques de plusieurs projets en trois requêtes :
+    une agrégation groupée des issues actives, une des issues archivées
+    et une des commentaires récents.
+    """
+    stats = {project_id: _empty_stats(project_id) for project_id in project_ids}
+    if not stats:
+        return stats
+
+    # Issues groupées par statut × priorité × étiquette × assigné
+    issue_rows = (
+        Issue.objects.filter(project_id__in=stats.keys())
+        .order_by()
+        .values('project_id', 'status', 'priority', 'tag', 'assignee_id', 'assignee__username')
+        .annotate(count=Count('id'))
+    )
+    matrix = {}
+    open_by_assignee = {}
+    for row in issue_rows:
+        project_id = row['project_id']
+        project_stats = stats[project_id]
+        project_stats['issues_total'] += row['count']
+
+        key = (project_id, row['status'], row['priority'], row['tag'])
+        matrix[key] = matrix.get(key, 0) + row['count']
+
+        if row['status'] != 'FINISHED':
+            project_stats['open_issues_total'] += row['count']
+            assignee_key = (project_id, row['assignee_id'])
+            entry = open_by_assignee.setdefault(assignee_key, {
+                'assignee_id': row['assignee_id'],
+                'assignee_username': row['assignee__username'],
+                'count': 0,
+            })
+            entry['count'] += row['count']
+
+    # Issues archivées : toutes terminées, elles ne comptent que dans les totaux
+    archived_rows = (
+        ArchivedIssue.objects.filter(project_id__in=stats.keys())
+        .order_by()
+        .values('project_id', 'status', 'priority', 'tag')
+        .annotate(count=Count('id'))
+    )
+    for row in archived_rows:
+        stats[row['project_id']]['issues_total'] += row['count']
+        key = (row['project_id'], row['status'], row['priority'], row['tag'])
+        matrix[key] = matrix.get(key, 0) + row['count']
+
+    for (project_id, status, priority, tag), count in sorted(matrix.items()):
+        stats[project_id]['issues'].append({
+            'status': status, 'priority': priority, 'tag': tag, 'count': count,
+        })
+    for (project_id, _), entry in open_by_assignee.items():
+        stats[project_id]['open_issues_by_assignee'].append(entry)
+    for project_stats in stats.values():
+        project_stats['open_issues_by_assignee'].sort(key=lambda entry: -entry['count'])
+
+    # Activité des commentaires sur les 30 derniers jours
+    since = timezone.now() - timedelta(days=COMMENT_ACTIVITY_DAYS)
+    comment_rows = (
+        Comment.objects.filter(issue__project_id__in=stats.keys(), created_time__gte=since)
+        .annotate(day=TruncDate('created_time'))
+        .order_by()
+        .values('issue__project_id', 'day')
+        .annotate(count=Count('id'))
+        .order_by('day')
+    )
+    for row in comment_rows:
+        project_stats = stats[row['issue__project_id']]
+        project_stats['comments_last_30_days'] += row['count']
+        project_stats['comment_activity'].append({'date': row['day'], 'count': row['count']})
+
+    return stats
+
+
+def get_projects_stats(project_ids):
+    """
+    Retourne les statistiques des projets demandés en utilisant le cache.
+    Seuls les projets absents du cache sont recalculés, en une seule passe.
+    """
+    project_ids = list(project_ids)
+    keys = {stats_cache_key(project_id): project_id for project_id in project_ids}
+    cached = cache.get_many(keys.keys())
+    stats = {keys[key]: value for key, value in cached.items()}
+
+    missing = [project_id for project_id in project_ids if project_id not in stats]
+    if missing:
+        # Un calcul par partition, en parallèle
+        grouped = group_by_shard(missing)
+
+        def compute(alias):
+            with on_shard(alias):
+                return compute_projects_stats(grouped[alias])
+
+        computed = {}
+        for shard_stats in fan_out(compute, grouped).values():
+            computed.update(shard_stats)
+        cache.set_many(
+            {stats_cache_key(project_id): value for project_id, value in computed.items()},
+            timeout=settings.PROJECT_STATS_CACHE_TIMEOUT
+        )
+        stats.update(computed)
+    return stats
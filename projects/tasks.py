@@ -0,0 +1,11 @@
+from jobs.registry import task
+from .deletion import delete_project_data
+
+
+@task('projects.delete_project')
+def delete_project(job, project_id):
+    """
+    Supprime un projet volumineux et sa cascade en arrière-plan, lot par lot
+    (une nouvelle tentative reprend là où la précédente s'est arrêtée)
+    """
+    return delete_project_data(project_id, progress=job.report_progress, atomic=False)
@@ -1,3 +1,433 @@
-from django.test import TestCase
+from datetime import date
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import router
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from core.routers import on_shard
+from .models import Project, Contributor, Issue, Comment, IssueSimilarityBucket, ProjectLocation, Membership
+from .archive import archive_issues
+from .sharding import plan_rebalance
+from .stats import stats_cache_key
+from .views import SNAPSHOT_MAX_ISSUES
+
+SHARDS = ['default', 'shard_1', 'shard_2']
+
+
+def make_user(username, **extra):
+    """Utilisateur sans mot de passe utilisable (les tests s'authentifient sans)"""
+    return User.objects.create_user(
+        username=username, password=None, email=f'{username}@example.com',
+        birth_date=date(1990, 1, 1), **extra
+    )
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+class ApiTestMixin:
+    """Création de projets, contributeurs et issues par l'API"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def create_project(self, author, name='Projet', contributors=()):
+        response = client_for(author).post(
+            '/api/projects/', {'name': name, 'description': 'd', 'type': 'BACKEND'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        project_id = response.data['id']
+        for user in contributors:
+            response = client_for(author).post(
+                f'/api/projects/{project_id}/add_contributor/', {'user_id': user.pk}, format='json'
+            )
+            self.assertEqual(response.status_code, 201, response.data)
+        return project_id
+
+    def create_issue(self, author, project_id, **data):
+        data = {
+            'name': 'Bug', 'description': 'd', 'tag': 'BUG', 'priority': 'LOW', 'status': 'TO_DO', **data,
+        }
+        response = client_for(author).post(f'/api/projects/{project_id}/issues/', data, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data
+
+
+class IssueTransitionTests(ApiTestMixin, TestCase):
+    """Transition d'une issue par UPDATE conditionnel (statut, assigné, version)"""
+
+    def setUp(self):
+        super().setUp()
+        self.author, self.assignee, self.other, self.outsider = [
+            make_user(name) for name in ('author', 'assignee', 'other', 'outsider')
+        ]
+        self.project_id = self.create_project(self.author, contributors=[self.assignee, self.other])
+        self.issue = self.create_issue(self.author, self.project_id, assignee_id=self.assignee.pk)
+        self.url = f"/api/projects/{self.project_id}/issues/{self.issue['id']}/transition/"
+
+    def transition(self, user, **data):
+        return client_for(user).post(self.url, data, format='json')
+
+    def test_transition_increments_version(self):
+        response = self.transition(self.assignee, version=0, status='IN_PROGRESS')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['version'], 1)
+        issue = Issue.objects.get(pk=self.issue['id'])
+        self.assertEqual((issue.status, issue.version), ('IN_PROGRESS', 1))
+
+    def test_stale_version_conflicts_with_current_state(self):
+        self.assertEqual(self.transition(self.author, version=0, status='IN_PROGRESS').status_code, 200)
+        response = self.transition(self.assignee, version=0, status='IN_PROGRESS')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            response.data['current'], {'status': 'IN_PROGRESS', 'assignee_id': self.assignee.pk, 'version': 1}
+        )
+        self.assertEqual(Issue.objects.get(pk=self.issue['id']).version, 1)
+
+    def test_only_author_and_assignee_may_transition(self):
+        self.assertEqual(self.transition(self.other, version=0, status='IN_PROGRESS').status_code, 403)
+        self.assertEqual(self.transition(self.outsider, version=0, status='IN_PROGRESS').status_code, 403)
+        self.assertEqual(Issue.objects.get(pk=self.issue['id']).version, 0)
+
+    def test_invalid_transition_is_rejected(self):
+        response = self.transition(self.author, version=0, status='FINISHED')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.data)
+
+    def test_assignee_must_be_contributor(self):
+        response = self.transition(self.author, version=0, assignee_id=self.outsider.pk)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('assignee_id', response.data)
+
+        response = self.transition(self.author, version=0, assignee_id=self.other.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Issue.objects.get(pk=self.issue['id']).assignee_id, self.other.pk)
+
+    def test_out_of_range_ids_are_rejected(self):
+        for data in ({'assignee_id': 2 ** 63}, {'assignee_id': 0}, {'version': 2 ** 63, 'status': 'IN_PROGRESS'}):
+            response = self.transition(self.author, **{'version': 0, **data})
+            self.assertEqual(response.status_code, 400, data)
+            self.assertIn(next(iter(data)), response.data)
+        self.assertEqual(Issue.objects.get(pk=self.issue['id']).version, 0)
+
+    def test_unknown_issue_is_not_found(self):
+        url = f'/api/projects/{self.project_id}/issues/999999/transition/'
+        response = client_for(self.author).post(url, {'version': 0, 'status': 'IN_PROGRESS'}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+
+class ProjectStatsTests(ApiTestMixin, TestCase):
+    """Agrégats groupés des statistiques et invalidation de leur cache"""
+
+    def setUp(self):
+        super().setUp()
+        self.author, self.assignee = make_user('author'), make_user('assignee')
+        self.project_id = self.create_project(self.author, contributors=[self.assignee])
+        self.url = f'/api/projects/{self.project_id}/stats/'
+
+    def totals(self, stats, field):
+        counts = {}
+        for row in stats['issues']:
+            counts[row[field]] = counts.get(row[field], 0) + row['count']
+        return counts
+
+    def test_counts_by_status_and_priority(self):
+        for status, priority in [('TO_DO', 'LOW'), ('TO_DO', 'HIGH'), ('IN_PROGRESS', 'HIGH'), ('FINISHED', 'LOW')]:
+            self.create_issue(self.author, self.project_id, status=status, priority=priority,
+                              assignee_id=self.assignee.pk)
+        stats = client_for(self.author).get(self.url).data
+
+        self.assertEqual((stats['issues_total'], stats['open_issues_total']), (4, 3))
+        self.assertEqual(self.totals(stats, 'status'), {'TO_DO': 2, 'IN_PROGRESS': 1, 'FINISHED': 1})
+        self.assertEqual(self.totals(stats, 'priority'), {'LOW': 2, 'HIGH': 2})
+        self.assertEqual(
+            [(row['assignee_id'], row['count']) for row in stats['open_issues_by_assignee']],
+            [(self.assignee.pk, 3)]
+        )
+
+    def test_issue_writes_clear_cached_stats(self):
+        client = client_for(self.author)
+        self.assertEqual(client.get(self.url).data['issues_total'], 0)
+        self.assertIsNotNone(cache.get(stats_cache_key(self.project_id)))
+
+        issue = self.create_issue(self.author, self.project_id)
+        self.assertIsNone(cache.get(stats_cache_key(self.project_id)))
+        self.assertEqual(client.get(self.url).data['issues_total'], 1)
+
+        response = client.delete(f"/api/projects/{self.project_id}/issues/{issue['id']}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertIsNone(cache.get(stats_cache_key(self.project_id)))
+        self.assertEqual(client.get(self.url).data['issues_total'], 0)
+
+
+
+class BatchRetrieveTests(ApiTestMixin, TestCase):
+    """Récupération groupée : statut par identifiant, identifiants invalides refusés"""
+
+    def setUp(self):
+        super().setUp()
+        self.author, self.outsider = make_user('author'), make_user('outsider')
+        self.project_id = self.create_project(self.author)
+        self.issue = self.create_issue(self.author, self.project_id)
+
+    def test_status_per_id(self):
+        other_project = self.create_project(self.outsider, name='Autre')
+        hidden = self.create_issue(self.outsider, other_project)
+        response = client_for(self.author).get(
+            '/api/issues/batch/', {'ids': f"{self.issue['id']},{hidden['id']},999999"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {pk: result['status'] for pk, result in response.data['results'].items()},
+            {str(self.issue['id']): 200, str(hidden['id']): 403, '999999': 404}
+        )
+
+    def test_out_of_range_ids_are_rejected(self):
+        client = client_for(self.author)
+        for ids in (str(2 ** 63), '0', '-1', 'abc'):
+            response = client.get('/api/issues/batch/', {'ids': ids})
+            self.assertEqual(response.status_code, 400, ids)
+            self.assertEqual(response.data['ids'], "Identifiant invalide.")
+
+        response = client.get('/api/comments/batch/', {'ids': '12345'})
+        self.assertEqual(response.status_code, 400)
+
+
+class ProjectSnapshotTests(ApiTestMixin, TestCase):
+    """Instantané d'un projet : parties choisies, page d'issues, nombre fixe de requêtes"""
+
+    def setUp(self):
+        super().setUp()
+        self.author, self.contributor = make_user('author'), make_user('contributor')
+        self.project_id = self.create_project(self.author, contributors=[self.contributor])
+        self.url = f'/api/projects/{self.project_id}/snapshot/'
+
+    def snapshot(self, **params):
+        return client_for(self.author).get(self.url, params)
+
+    def test_all_sections_by_default(self):
+        self.create_issue(self.author, self.project_id)
+        data = self.snapshot().data
+        self.assertEqual(set(data), {'project', 'contributors', 'issues', 'issue_counts'})
+        self.assertEqual(data['project']['id'], self.project_id)
+        self.assertEqual(len(data['contributors']), 2)
+        self.assertEqual(len(data['issues']['results']), 1)
+
+    def test_sections_selects_parts(self):
+        data = self.snapshot(sections='project, counts').data
+        self.assertEqual(set(data), {'project', 'issue_counts'})
+
+        response = self.snapshot(sections='project,secret')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', response.data['sections'])
+
+    def test_issues_page_size_bounds(self):
+        for value in ('0', str(SNAPSHOT_MAX_ISSUES + 1), 'abc'):
+            response = self.snapshot(issues_page_size=value)
+            self.assertEqual(response.status_code, 400, value)
+            self.assertIn('issues_page_size', response.data)
+        self.assertEqual(self.snapshot(issues_page_size=SNAPSHOT_MAX_ISSUES).status_code, 200)
+
+    def test_has_more(self):
+        for index in range(3):
+            self.create_issue(self.author, self.project_id, name=f'Bug {index}')
+        issues = self.snapshot(sections='issues', issues_page_size=2).data['issues']
+        self.assertEqual([issue['name'] for issue in issues['results']], ['Bug 2', 'Bug 1'])
+        self.assertTrue(issues['has_more'])
+        self.assertFalse(self.snapshot(sections='issues', issues_page_size=3).data['issues']['has_more'])
+
+    def test_counts_include_archived_issues(self):
+        self.create_issue(self.author, self.project_id, status='TO_DO')
+        self.create_issue(self.author, self.project_id, status='FINISHED')
+        self.create_issue(self.author, self.project_id, status='FINISHED')
+        self.assertEqual(archive_issues(days=0)['issues'], 2)
+        self.create_issue(self.author, self.project_id, status='FINISHED')
+
+        counts = self.snapshot(sections='counts').data['issue_counts']
+        self.assertEqual(counts, {'TO_DO': 1, 'IN_PROGRESS': 0, 'FINISHED': 3, 'archived': 2})
+
+    def test_query_count_does_not_grow(self):
+        client = client_for(self.author)
+        self.create_issue(self.author, self.project_id)
+        with self.assertNumQueries(5):
+            client.get(self.url)
+
+        for index in range(5):
+            self.create_issue(self.author, self.project_id, name=f'Bug {index}', assignee_id=self.contributor.pk)
+        self.create_project(self.author, name='Autre', contributors=[make_user('other')])
+        with self.assertNumQueries(5):
+            self.assertEqual(len(client.get(self.url).data['issues']['results']), 6)
+
+
+class IssueSimilarityTests(ApiTestMixin, TestCase):
+    """Détection des doublons : index MinHash/LSH tenu à jour, issues archivées exclues"""
+
+    CRASH = {
+        'name': "Crash au démarrage de l'application mobile",
+        'description': "L'application se ferme juste après l'écran de chargement sur Android 14 "
+                       "lorsque le mode sombre est activé dans les réglages du téléphone",
+    }
+    EXPORT = {
+        'name': "Export CSV des factures",
+        'description': "Les comptables veulent télécharger les factures du mois au format CSV "
+                       "pour les importer dans leur logiciel de comptabilité",
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.author = make_user('author')
+        self.project_id = self.create_project(self.author)
+        self.crash = self.create_issue(self.author, self.project_id, **self.CRASH)
+        self.export = self.create_issue(self.author, self.project_id, **self.EXPORT)
+
+    def similar(self, **text):
+        response = client_for(self.author).get(f'/api/projects/{self.project_id}/issues/similar/', text)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [issue['id'] for issue in response.data]
+
+    def near_duplicate(self):
+        return dict(self.CRASH, description=self.CRASH['description'].replace('téléphone', 'smartphone'))
+
+    def test_near_duplicate_is_found_unrelated_is_not(self):
+        self.assertEqual(self.similar(**self.near_duplicate()), [self.crash['id']])
+
+    def test_create_response_lists_similar_issues(self):
+        issue = self.create_issue(self.author, self.project_id, **self.near_duplicate())
+        self.assertEqual([similar['id'] for similar in issue['similar_issues']], [self.crash['id']])
+        self.assertGreaterEqual(issue['similar_issues'][0]['similarity'], 0.5)
+
+    def test_editing_text_moves_buckets(self):
+        def issue_buckets():
+            return set(IssueSimilarityBucket.objects.filter(issue_id=self.crash['id']).values_list('bucket', flat=True))
+
+        before = issue_buckets()
+        response = client_for(self.author).patch(
+            f"/api/projects/{self.project_id}/issues/{self.crash['id']}/", self.EXPORT, format='json'
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertNotEqual(issue_buckets(), before)
+        self.assertEqual(self.similar(**self.near_duplicate()), [])
+        self.assertEqual(set(self.similar(**self.EXPORT)), {self.crash['id'], self.export['id']})
+
+    def test_archived_issues_are_excluded(self):
+        Issue.objects.filter(pk=self.crash['id']).update(status='FINISHED')
+        self.assertEqual(archive_issues(days=0)['issues'], 1)
+        self.assertFalse(IssueSimilarityBucket.objects.filter(issue_id=self.crash['id']).exists())
+        self.assertEqual(self.similar(**self.near_duplicate()), [])
+
+@override_settings(DATABASE_SHARDS=SHARDS, ASYNC_DELETION_THRESHOLD=0)
+class ShardingTests(ApiTestMixin, TransactionTestCase):
+    """
+    Partitionnement sur trois bases de test (TransactionTestCase : les
+    lectures réparties sont faites dans des threads, qui doivent voir les
+    données validées)
+    """
+    databases = {'default', 'shard_1', 'shard_2'}
+
+    def setUp(self):
+        super().setUp()
+        self.alice, self.bob = make_user('alice'), make_user('bob')
+        # Chaque nouveau projet va sur la base qui en compte le moins : un par base
+        self.project_ids = [
+            self.create_project(self.alice, name=f'Projet {index}', contributors=[self.bob]) for index in range(3)
+        ]
+        self.shards = dict(ProjectLocation.objects.values_list('project_id', 'shard'))
+
+    def test_projects_spread_over_shards(self):
+        self.assertEqual(sorted(self.shards.values()), sorted(SHARDS))
+        for project_id, alias in self.shards.items():
+            issue = self.create_issue(self.alice, project_id)
+            for other in SHARDS:
+                self.assertEqual(Project.objects.using(other).filter(pk=project_id).exists(), other == alias)
+                self.assertEqual(Issue.objects.using(other).filter(pk=issue['id']).exists(), other == alias)
+            # Les contributeurs sont recopiés sur la partition du projet
+            self.assertTrue(User.objects.using(alias).filter(pk=self.bob.pk).exists())
+        self.assertEqual(Membership.objects.filter(user=self.bob).count(), 3)
+        self.assertEqual(router.db_for_write(Issue), 'default')
+        with on_shard('shard_2'):
+            self.assertEqual(router.db_for_read(Issue), 'shard_2')
+            self.assertEqual(router.db_for_read(ProjectLocation), 'default')
+
+        response = client_for(self.bob).get('/api/projects/')
+        self.assertEqual(sorted(project['id'] for project in response.data['results']), sorted(self.project_ids))
+
+    def test_my_issues_merges_all_shards(self):
+        issue_ids = []
+        for _ in range(2):
+            for project_id in self.project_ids:
+                issue_ids.append(self.create_issue(self.alice, project_id, assignee_id=self.bob.pk)['id'])
+        # Issue d'un projet quitté : exclue
+        left = self.create_issue(self.alice, self.project_ids[0], assignee_id=self.bob.pk)['id']
+        with on_shard(self.shards[self.project_ids[0]]):
+            Issue.objects.filter(pk=left).update(assignee=None)
+        expected = sorted(
+            (
+                issue for alias in SHARDS
+                for issue in Issue.objects.using(alias).filter(pk__in=issue_ids).values('id', 'created_time')
+            ),
+            key=lambda issue: (issue['created_time'], issue['id']), reverse=True
+        )
+
+        seen, url = [], '/api/me/issues/?role=assigned&page_size=4'
+        while url:
+            response = client_for(self.bob).get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(issue['id'] for issue in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, [issue['id'] for issue in expected])
+
+    def test_rebalance_moves_project(self):
+        project_id = self.project_ids[0]
+        source = self.shards[project_id]
+        target = next(alias for alias in SHARDS if alias != source)
+        issue = self.create_issue(self.alice, project_id, name='Plantage au démarrage', assignee_id=self.bob.pk)
+        comment = client_for(self.bob).post(
+            f"/api/projects/{project_id}/issues/{issue['id']}/comments/", {'description': 'Reproduit'}, format='json'
+        )
+        self.assertEqual(comment.status_code, 201)
+
+        call_command('rebalance_shards', project=project_id, to=target, stdout=StringIO())
+
+        self.assertEqual(ProjectLocation.objects.get(pk=project_id).shard, target)
+        for model, lookup in [
+            (Project, 'pk'), (Contributor, 'project_id'), (Issue, 'project_id'),
+            (Comment, 'issue__project_id'), (IssueSimilarityBucket, 'project_id'),
+        ]:
+            self.assertTrue(model.objects.using(target).filter(**{lookup: project_id}).exists(), model)
+            self.assertFalse(model.objects.using(source).filter(**{lookup: project_id}).exists(), model)
+
+        response = client_for(self.bob).get(f"/api/projects/{project_id}/issues/{issue['id']}/comments/")
+        self.assertEqual(response.data['count'], 1)
+        response = client_for(self.bob).get('/api/me/issues/')
+        self.assertEqual([row['id'] for row in response.data['results']], [issue['id']])
+
+    @override_settings(ASYNC_DELETION_THRESHOLD=4)
+    def test_account_erasure_threshold_counts_all_shards(self):
+        for project_id in self.project_ids[1:]:
+            for _ in range(2):
+                self.create_issue(self.alice, project_id)
+        response = client_for(self.alice).delete('/api/delete-account/', {'confirm_deletion': True}, format='json')
+        self.assertEqual(response.status_code, 202, response.data)
+
+
+class PlanRebalanceTests(SimpleTestCase):
+    def test_moves_bring_shards_closer_to_the_mean(self):
+        weights = {'default': {1: 50, 2: 30, 3: 20}, 'shard_1': {4: 1}, 'shard_2': {}}
+        loads = {alias: sum(projects.values()) for alias, projects in weights.items()}
+        for project_id, source, target in plan_rebalance(weights):
+            loads[source] -= weights[source][project_id]
+            loads[target] += weights[source][project_id]
+        # Le plus gros projet (50) borne l'écart atteignable
+        self.assertLessEqual(max(loads.values()), 50)
+        self.assertEqual(sum(loads.values()), 101)
+
+    def test_balanced_shards_do_not_move(self):
+        self.assertEqual(plan_rebalance({'default': {1: 10}, 'shard_1': {2: 10}}), [])
@@ -0,0 +1,109 @@
+from django.db import router
+from django.db.models import BooleanField, Exists, F, OuterRef, Q, Value
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound, PermissionDenied, ValidationError
+
+from .archive import restore_issue
+from .models import Contributor, Issue, ArchivedIssue
+from .signals import issue_assigned
+from .stats import invalidate_project_stats
+
+
+# Statut courant -> statuts accessibles (FINISHED -> IN_PROGRESS : réouverture)
+TRANSITIONS = {
+    'TO_DO': {'IN_PROGRESS'},
+    'IN_PROGRESS': {'TO_DO', 'FINISHED'},
+    'FINISHED': {'IN_PROGRESS'},
+}
+
+_UNSET = object()
+
+
+class IssueVersionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "L'issue a été modifiée entre-temps : rechargez-la puis réessayez."
+    default_code = 'issue_version_conflict'
+
+    def __init__(self, current):
+        super().__init__()
+        # État actuel (status, assignee_id, version), renvoyé au client
+        self.current = current
+
+
+def _membership(user_ref):
+    return Contributor.objects.filter(project=OuterRef('project_id'), user=user_ref)
+
+
+def transition_issue(issue_id, project_id, user, version, status=None, assignee_id=_UNSET):
+    """
+    Change le statut et/ou l'assigné d'une issue en un seul UPDATE
+    conditionnel, sans verrou ni lecture préalable : il ne s'applique que si
+    l'issue est encore à la version attendue, que le statut courant permet la
+    transition, que l'utilisateur en est l'auteur ou l'assigné (et contributeur
+    du projet) et que le nouvel assigné est contributeur.
+
+    En cas d'échec, une seule requête détermine la cause : NotFound,
+    PermissionDenied, IssueVersionConflict ou ValidationError. Une issue
+    archivée est d'abord restaurée. Retourne la nouvelle version.
+    """
+    values = {'version': F('version') + 1, 'updated_time': timezone.now()}
+    conditions = [
+        Q(pk=issue_id, project_id=project_id, version=version),
+        Q(author=user) | Q(assignee=user),
+        Exists(_membership(user)),
+    ]
+    if status is not None:
+        values['status'] = status
+        conditions.append(Q(status__in=[source for source, targets in TRANSITIONS.items() if status in targets]))
+    if assignee_id is not _UNSET:
+        values['assignee_id'] = assignee_id
+        if assignee_id is not None:
+            conditions.append(Exists(_membership(assignee_id)))
+
+    if Issue.objects.filter(*conditions).update(**values):
+        invalidate_project_stats(project_id)
+        if assignee_id not in (_UNSET, None):
+            issue_assigned.send(
+                sender=Issue, issue_id=issue_id, project_id=project_id,
+                assignee_id=assignee_id, actor_id=user.pk, using=router.db_for_write(Issue)
+            )
+        return version + 1
+
+    if assignee_id in (_UNSET, None):
+        assignee_is_contributor = Value(True, output_field=BooleanField())
+    else:
+        assignee_is_contributor = Exists(_membership(assignee_id))
+    current = (
+        Issue.objects.filter(pk=issue_id, project_id=project_id)
+        .annotate(is_contributor=Exists(_membership(user)), assignee_is_contributor=assignee_is_contributor)
+        .values('status', 'assignee_id', 'version', 'author_id', 'is_contributor', 'assignee_is_contributor')
+        .first()
+    )
+    if current is None:
+        archived = (
+            ArchivedIssue.objects.filter(pk=issue_id, project_id=project_id)
+            .annotate(is_contributor=Exists(_membership(user)))
+            .values('author_id', 'assignee_id', 'is_contributor')
+            .first()
+        )
+        if archived is None:
+            raise NotFound("Issue introuvable dans ce projet.")
+        if archived['is_contributor'] and user.id in (archived['author_id'], archived['assignee_id']):
+            restore_issue(issue_id)
+            return transition_issue(issue_id, project_id, user, version, status, assignee_id)
+        current = {**archived, 'status': None, 'version': None, 'assignee_is_contributor': None}
+
+    if not current['is_contributor']:
+        raise PermissionDenied("Vous devez être contributeur de ce projet.")
+    if user.id not in (current['author_id'], current['assignee_id']):
+        raise PermissionDenied("Seuls l'auteur et l'assigné de l'issue peuvent la faire évoluer.")
+    if current['version'] != version:
+        raise IssueVersionConflict({
+            'status': current['status'], 'assignee_id': current['assignee_id'], 'version': current['version'],
+        })
+    if not current['assignee_is_contributor']:
+        raise ValidationError({'assignee_id': "L'utilisateur assigné doit être un contributeur du projet."})
+    raise ValidationError({
+        'status': f"Transition impossible de {current['status']} vers {status}."
+    })
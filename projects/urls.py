@@ -1,6 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ProjectViewSet, IssueViewSet, CommentViewSet
+from .routers import NestedRouter
+from .views import (
+    ProjectViewSet, IssueViewSet, CommentViewSet, MyIssuesView,
+    IssueBatchView, CommentBatchView
+)
 
 app_name = 'projects'
 
@@ -8,14 +12,19 @@ app_name = 'projects'
 router = DefaultRouter()
 router.register(r'projects', ProjectViewSet, basename='project')
 
-# Pour le moment, on va créer des URLs simples pour les issues et commentaires
-# Plus tard on pourra les imbriquer avec rest_framework_nested
+# Issues imbriquées : /projects/<project_pk>/issues/<pk>/
+issues_router = NestedRouter(r'projects', 'project')
+issues_router.register(r'issues', IssueViewSet, basename='project-issues')
+
+# Commentaires imbriqués : /projects/<project_pk>/issues/<issue_pk>/comments/<uuid>/
+comments_router = issues_router.nested(r'issues', 'issue')
+comments_router.register(r'comments', CommentViewSet, basename='issue-comments')
 
 urlpatterns = [
     path('', include(router.urls)),
-    # URLs temporaires pour les issues et commentaires
-    path('projects/<int:project_pk>/issues/', IssueViewSet.as_view({'get': 'list', 'post': 'create'}), name='project-issues-list'),
-    path('projects/<int:project_pk>/issues/<int:pk>/', IssueViewSet.as_view({'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}), name='project-issues-detail'),
-    path('projects/<int:project_pk>/issues/<int:issue_pk>/comments/', CommentViewSet.as_view({'get': 'list', 'post': 'create'}), name='issue-comments-list'),
-    path('projects/<int:project_pk>/issues/<int:issue_pk>/comments/<uuid:pk>/', CommentViewSet.as_view({'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}), name='issue-comments-detail'),
+    path('', include(issues_router.urls)),
+    path('', include(comments_router.urls)),
+    path('me/issues/', MyIssuesView.as_view(), name='my-issues'),
+    path('issues/batch/', IssueBatchView.as_view(), name='issues-batch'),
+    path('comments/batch/', CommentBatchView.as_view(), name='comments-batch'),
 ]
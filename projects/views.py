@@ -1,19 +1,43 @@
-from rest_framework import viewsets, status
+import uuid
+
+from rest_framework import generics, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiResponse
+from django.conf import settings
+from django.db.models import BooleanField, Count, Exists, F, OuterRef, Q, Value
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+
+from core.idempotency import idempotent
+from core.sharding import MergedQuerySet, fan_out, sharding_enabled
+from core.throttling import IPTokenBucketThrottle, UserTokenBucketThrottle
+from jobs.registry import enqueue
 
-from .models import Project, Contributor, Issue, Comment
+from .models import Project, Contributor, Issue, Comment, ArchivedIssue, ArchivedComment, Membership
 from .serializers import (
     ProjectSerializer, ContributorSerializer, 
-    IssueSerializer, CommentSerializer
+    IssueSerializer, CommentSerializer, IssueTransitionSerializer,
+    ArchivedIssueSerializer, ArchivedCommentSerializer,
+    SimilarIssueSerializer, SimilarIssuesQuerySerializer
 )
 from .permissions import (
     IsAuthorOrReadOnly, IsProjectContributor,
     IsProjectAuthorOrContributorReadOnly, CanManageContributors
 )
+from .stats import get_projects_stats
+from .transitions import IssueVersionConflict, transition_issue
+from .pagination import CreatedTimeCursorPagination
+from .similarity import find_similar, fingerprint
+from .sharding import choose_shard, group_by_shard, load_projects, user_shards
+from .mixins import ProjectNestedMixin, ShardedViewMixin
+
+
+SNAPSHOT_SECTIONS = ('project', 'contributors', 'issues', 'counts')
+SNAPSHOT_MAX_ISSUES = 100
 
 
 @extend_schema_view(
@@ -43,12 +67,24 @@ from .permissions import (
         tags=["Projets"]
     )
 )
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ShardedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les projets
     """
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated, IsProjectAuthorOrContributorReadOnly]
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    throttle_scope = 'writes'
+    project_url_kwarg = 'pk'
+
+    def get_location(self):
+        """Un nouveau projet est créé sur la partition la moins remplie"""
+        if self.action == 'create' and sharding_enabled():
+            return choose_shard(), False
+        return super().get_location()
+
+    def annotate_projects(self, queryset):
+        return queryset.select_related('author').annotate(num_contributors=Count('contributors'))
 
     def get_queryset(self):
         """
@@ -56,7 +92,191 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """
         user = self.request.user
         contributed_projects = Contributor.objects.filter(user=user).values_list('project', flat=True)
-        return Project.objects.filter(id__in=contributed_projects)
+        return self.annotate_projects(
+            Project.objects.filter(id__in=contributed_projects)
+        ).order_by('-created_time')
+
+    def get_project_ids(self):
+        """
+        Identifiants des projets de l'utilisateur, du plus récent au plus
+        ancien ; lus dans l'annuaire lorsque les projets sont partitionnés
+        """
+        if not sharding_enabled():
+            return self.get_queryset().values_list('id', flat=True)
+        return (
+            Membership.objects.filter(user=self.request.user)
+            .order_by('-location__created_time', '-location_id')
+            .values_list('location_id', flat=True)
+        )
+
+    def list(self, request, *args, **kwargs):
+        """
+        Projets partitionnés : la page est découpée dans l'annuaire, puis ses
+        projets sont chargés en parallèle sur leurs partitions
+        """
+        if not sharding_enabled():
+            return super().list(request, *args, **kwargs)
+        page = self.paginate_queryset(self.get_project_ids())
+        projects = load_projects(
+            page, lambda alias, ids: self.annotate_projects(Project.objects.using(alias).filter(pk__in=ids))
+        )
+        serializer = self.get_serializer([projects[pk] for pk in page if pk in projects], many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def destroy(self, request, *args, **kwargs):
+        """
+        Les projets volumineux sont retirés immédiatement (suppression des
+        contributeurs) puis supprimés en arrière-plan par le worker
+        """
+        project = self.get_object()
+        threshold = settings.ASYNC_DELETION_THRESHOLD
+        if threshold and project.issues.count() >= threshold:
+            Contributor.objects.filter(project=project).delete()
+            job = enqueue('projects.delete_project', user=request.user, project_id=project.id)
+            return Response({
+                'message': "Le projet est en cours de suppression.",
+                'job': job.id,
+                'status_url': reverse('jobs:job-detail', args=[job.id])
+            }, status=status.HTTP_202_ACCEPTED)
+        return super().destroy(request, *args, **kwargs)
+
+    @extend_schema(
+        summary="Statistiques d'un projet",
+        description=(
+            "Nombre d'issues par statut × priorité × étiquette, issues ouvertes par assigné "
+            "et activité des commentaires sur les 30 derniers jours"
+        ),
+        tags=["Projets"]
+    )
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """
+        Action personnalisée retournant les statistiques agrégées d'un projet
+        """
+        project = self.get_object()
+        return Response(get_projects_stats([project.id])[project.id])
+
+    @extend_schema(
+        summary="Instantané d'un projet",
+        description=(
+            "Projet, contributeurs, première page d'issues et nombre d'issues par statut "
+            "(archivées comprises) en une seule réponse, construite en un nombre fixe de requêtes. "
+            "sections choisit les parties renvoyées (project,contributors,issues,counts) ; "
+            "issues_page_size la taille de la page d'issues."
+        ),
+        parameters=[
+            OpenApiParameter(
+                'sections', OpenApiTypes.STR, OpenApiParameter.QUERY,
+                description="Parties à inclure, séparées par des virgules (toutes par défaut)"
+            ),
+            OpenApiParameter(
+                'issues_page_size', OpenApiTypes.INT, OpenApiParameter.QUERY,
+                description=f"Nombre d'issues (au plus {SNAPSHOT_MAX_ISSUES})"
+            ),
+        ],
+        responses=OpenApiTypes.OBJECT,
+        tags=["Projets"]
+    )
+    @action(detail=True, methods=['get'])
+    def snapshot(self, request, pk=None):
+        """
+        Tout ce qu'il faut pour ouvrir un projet, en une réponse : une requête
+        par partie demandée, en plus du projet et de la vérification d'accès
+        """
+        sections = self.get_snapshot_sections()
+        page_size = self.get_snapshot_page_size()
+        project = self.get_object()
+        data = {}
+
+        if 'project' in sections:
+            data['project'] = self.get_serializer(project).data
+        if 'contributors' in sections:
+            contributors = Contributor.objects.filter(project=project).select_related('user').order_by('created_time')
+            data['contributors'] = ContributorSerializer(contributors, many=True).data
+        if 'issues' in sections:
+            # Une issue de plus que la page pour savoir s'il y en a d'autres, sans COUNT
+            issues = list(
+                Issue.objects.filter(project=project)
+                .select_related('project', 'author', 'assignee')
+                .annotate(num_comments=Count('comments'))
+                .order_by('-created_time', '-id')[:page_size + 1]
+            )
+            data['issues'] = {
+                'results': IssueSerializer(
+                    issues[:page_size], many=True, context=self.get_serializer_context()
+                ).data,
+                'has_more': len(issues) > page_size,
+                'url': request.build_absolute_uri(
+                    reverse('projects:project-issues-list', kwargs={'project_pk': project.pk})
+                ),
+            }
+        if 'counts' in sections:
+            data['issue_counts'] = self.get_issue_counts(project)
+        return Response(data)
+
+    def get_snapshot_sections(self):
+        """Parties demandées par ?sections= ; ValidationError si l'une est inconnue"""
+        raw = self.request.query_params.get('sections')
+        if not raw:
+            return set(SNAPSHOT_SECTIONS)
+        sections = {value.strip() for value in raw.split(',') if value.strip()}
+        unknown = sections - set(SNAPSHOT_SECTIONS)
+        if unknown:
+            raise ValidationError({
+                'sections': f"Parties inconnues : {', '.join(sorted(unknown))} "
+                            f"(disponibles : {', '.join(SNAPSHOT_SECTIONS)})."
+            })
+        return sections
+
+    def get_snapshot_page_size(self):
+        raw = self.request.query_params.get('issues_page_size')
+        if raw is None:
+            return settings.REST_FRAMEWORK['PAGE_SIZE']
+        try:
+            page_size = int(raw)
+        except ValueError:
+            raise ValidationError({'issues_page_size': "Nombre entier attendu."})
+        if not 1 <= page_size <= SNAPSHOT_MAX_ISSUES:
+            raise ValidationError({'issues_page_size': f"Entre 1 et {SNAPSHOT_MAX_ISSUES}."})
+        return page_size
+
+    def get_issue_counts(self, project):
+        """Nombre d'issues par statut, actives et archivées, en une requête (UNION ALL)"""
+        active = (
+            Issue.objects.filter(project=project).order_by()
+            .values('status').annotate(count=Count('id'), archived=Value(False, output_field=BooleanField()))
+            .values_list('status', 'count', 'archived')
+        )
+        archived = (
+            ArchivedIssue.objects.filter(project=project).order_by()
+            .values('status').annotate(count=Count('id'), archived=Value(True, output_field=BooleanField()))
+            .values_list('status', 'count', 'archived')
+        )
+        counts = {status_value: 0 for status_value, _ in Issue.STATUS_CHOICES}
+        counts['archived'] = 0
+        for status_value, count, is_archived in active.union(archived, all=True):
+            counts[status_value] += count
+            if is_archived:
+                counts['archived'] += count
+        return counts
+
+    @extend_schema(
+        summary="Statistiques de tous mes projets",
+        description="Statistiques agrégées de chacun des projets auxquels l'utilisateur contribue",
+        operation_id="projects_stats_overview",
+        tags=["Projets"]
+    )
+    @action(detail=False, methods=['get'], url_path='stats', url_name='stats-overview')
+    def stats_overview(self, request):
+        """
+        Action personnalisée retournant les statistiques de tous les projets de l'utilisateur
+        """
+        project_ids = list(self.get_project_ids())
+        stats = get_projects_stats(project_ids)
+        return Response({
+            'count': len(project_ids),
+            'results': [stats[project_id] for project_id in project_ids],
+        })
 
     @extend_schema(
         summary="Liste des contributeurs",
@@ -79,6 +299,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         tags=["Projets"]
     )
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated, CanManageContributors])
+    @idempotent
     def add_contributor(self, request, pk=None):
         """
         Action personnalisée pour ajouter un contributeur à un projet
@@ -119,22 +340,37 @@ class ProjectViewSet(viewsets.ModelViewSet):
 @extend_schema_view(
     list=extend_schema(
         summary="Liste des issues",
-        description="Récupérer la liste des issues d'un projet",
+        description=(
+            "Récupérer la liste des issues d'un projet. Les issues archivées "
+            "(terminées et inactives) n'y figurent qu'avec include_archived=1."
+        ),
+        parameters=[
+            OpenApiParameter(
+                'include_archived', OpenApiTypes.BOOL, OpenApiParameter.QUERY,
+                description="Inclure les issues archivées"
+            ),
+        ],
         tags=["Issues"]
     ),
     create=extend_schema(
         summary="Créer une issue",
-        description="Créer une nouvelle issue dans un projet",
+        description=(
+            "Créer une nouvelle issue dans un projet. La réponse liste dans similar_issues "
+            "les issues actives du projet au texte proche (doublons probables)."
+        ),
         tags=["Issues"]
     ),
     retrieve=extend_schema(
         summary="Détails d'une issue",
-        description="Récupérer les détails d'une issue spécifique",
+        description="Récupérer les détails d'une issue spécifique, archivée ou non",
         tags=["Issues"]
     ),
     update=extend_schema(
         summary="Modifier une issue",
-        description="Modifier une issue (seul l'auteur peut modifier)",
+        description=(
+            "Modifier une issue (seul l'auteur peut modifier). "
+            "Une issue archivée est d'abord restaurée."
+        ),
         tags=["Issues"]
     ),
     destroy=extend_schema(
@@ -143,28 +379,167 @@ class ProjectViewSet(viewsets.ModelViewSet):
         tags=["Issues"]
     )
 )
-class IssueViewSet(viewsets.ModelViewSet):
+class IssueViewSet(ShardedViewMixin, ProjectNestedMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les issues d'un projet
     """
     serializer_class = IssueSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor, IsAuthorOrReadOnly]
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    throttle_scope = 'writes'
+    lookup_value_regex = r'\d+'
+
+    def _issues(self):
+        """Issues avec les relations affichées par le serializer (évite les N+1)"""
+        return (
+            Issue.objects.select_related('project', 'author', 'assignee')
+            .annotate(num_comments=Count('comments'))
+            .order_by('-created_time')
+        )
 
     def get_queryset(self):
         """
         Retourne les issues du projet spécifié
         """
-        project_id = self.kwargs.get('project_pk')
-        return Issue.objects.filter(project_id=project_id)
+        if getattr(self, 'swagger_fake_view', False):
+            return Issue.objects.none()
+        return self._issues().filter(project=self.get_parent_project())
+
+    def get_detail_queryset(self):
+        """Issue de l'URL, vérifiée dans le projet, avec l'appartenance de l'utilisateur"""
+        return self._issues().annotate(
+            is_contributor=Exists(self._membership('project_id'))
+        ).filter(project_id=self.kwargs.get('project_pk'))
+
+    def get_archived_detail_queryset(self):
+        """Issue archivée de l'URL, avec les mêmes annotations que get_detail_queryset()"""
+        return (
+            ArchivedIssue.objects.select_related('project', 'author', 'assignee')
+            .annotate(
+                num_comments=Count('comments'),
+                is_contributor=Exists(self._membership('project_id'))
+            )
+            .filter(project_id=self.kwargs.get('project_pk'))
+        )
+
+    def get_parents(self, obj):
+        return obj.project, None
+
+    def get_serializer_class(self):
+        if self.kwargs.get('pk') is not None and self.resolve_parents()[2].is_archived:
+            return ArchivedIssueSerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        """
+        Avec include_archived=1, pagine l'union des identifiants actifs et
+        archivés (triés par date de création) puis charge la page depuis
+        chacune des deux tables.
+        """
+        if request.query_params.get('include_archived') not in ('1', 'true'):
+            return super().list(request, *args, **kwargs)
+
+        project = self.get_parent_project()
+        hot = (
+            Issue.objects.filter(project=project)
+            .annotate(archived=Value(False, output_field=BooleanField()))
+            .values_list('id', 'created_time', 'archived')
+            .order_by()
+        )
+        cold = (
+            ArchivedIssue.objects.filter(project=project)
+            .annotate(archived=Value(True, output_field=BooleanField()))
+            .values_list('id', 'created_time', 'archived')
+            .order_by()
+        )
+        page = self.paginate_queryset(hot.union(cold, all=True).order_by('-created_time', '-id'))
+
+        hot_ids = [pk for pk, _, archived in page if not archived]
+        cold_ids = [pk for pk, _, archived in page if archived]
+        issues = self._issues().in_bulk(hot_ids) if hot_ids else {}
+        archived_issues = (
+            ArchivedIssue.objects.select_related('project', 'author', 'assignee')
+            .annotate(num_comments=Count('comments'))
+            .in_bulk(cold_ids)
+        ) if cold_ids else {}
+
+        context = self.get_serializer_context()
+        data = [
+            ArchivedIssueSerializer(archived_issues[pk], context=context).data if archived
+            else IssueSerializer(issues[pk], context=context).data
+            for pk, _, archived in page
+            if pk in (archived_issues if archived else issues)
+        ]
+        return self.get_paginated_response(data)
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        """Incrémente la version, comme les transitions"""
+        serializer.save(version=F('version') + 1)
+        serializer.instance.refresh_from_db(fields=['version'])
+
+    @extend_schema(
+        summary="Faire évoluer une issue",
+        description=(
+            "Change le statut (TO_DO → IN_PROGRESS → FINISHED, retour possible d'un cran) "
+            "et/ou l'assigné en une seule requête conditionnelle, sans relire l'issue. "
+            "Réservé à l'auteur et à l'assigné. Renvoie 409 avec l'état actuel si "
+            "l'issue n'est plus à la version indiquée."
+        ),
+        request=IssueTransitionSerializer,
+        responses={
+            200: IssueTransitionSerializer,
+            409: OpenApiResponse(description="Version périmée : l'état actuel est renvoyé dans current"),
+        },
+        tags=["Issues"]
+    )
+    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
+    def transition(self, request, project_pk=None, pk=None):
+        # Les droits sont vérifiés par l'UPDATE conditionnel lui-même (transition_issue)
+        serializer = IssueTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            version = transition_issue(int(pk), int(project_pk), request.user, **serializer.validated_data)
+        except IssueVersionConflict as conflict:
+            return Response(
+                {'detail': conflict.detail, 'current': conflict.current},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response({'id': int(pk), **serializer.validated_data, 'version': version})
+
+    @extend_schema(
+        summary="Issues similaires",
+        description=(
+            "Issues actives du projet dont le nom et la description sont proches du texte "
+            "indiqué (doublons probables), de la plus proche à la moins proche, avec leur "
+            "similarité (0 à 1). La création d'une issue renvoie la même liste dans similar_issues."
+        ),
+        parameters=[SimilarIssuesQuerySerializer],
+        responses={200: SimilarIssueSerializer(many=True)},
+        tags=["Issues"]
+    )
+    @action(detail=False, methods=['get'])
+    def similar(self, request, project_pk=None):
+        query = SimilarIssuesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        issues = find_similar(
+            self.get_parent_project().pk,
+            fingerprint(query.validated_data['name'], query.validated_data['description']),
+            limit=query.validated_data.get('limit'),
+            threshold=query.validated_data.get('threshold'),
+        )
+        return Response(SimilarIssueSerializer(issues, many=True).data)
 
     def get_serializer_context(self):
         """
-        Ajoute le projet au contexte du serializer
+        Ajoute le projet (déjà résolu) au contexte du serializer
         """
         context = super().get_serializer_context()
-        project_id = self.kwargs.get('project_pk')
-        if project_id:
-            context['project'] = get_object_or_404(Project, id=project_id)
+        if self.kwargs.get('project_pk'):
+            context['project'] = self.get_parent_project()
         return context
 
 
@@ -195,26 +570,258 @@ class IssueViewSet(viewsets.ModelViewSet):
         tags=["Commentaires"]
     )
 )
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ShardedViewMixin, ProjectNestedMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les commentaires d'une issue
     """
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor, IsAuthorOrReadOnly]
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    throttle_scope = 'writes'
+    lookup_value_regex = (
+        r'[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}'
+    )
 
     def get_queryset(self):
         """
-        Retourne les commentaires de l'issue spécifiée
+        Retourne les commentaires de l'issue spécifiée (archivés si elle l'est)
         """
-        issue_id = self.kwargs.get('issue_pk')
-        return Comment.objects.filter(issue_id=issue_id)
+        if getattr(self, 'swagger_fake_view', False):
+            return Comment.objects.none()
+        issue = self.get_parent_issue()
+        model = ArchivedComment if issue.is_archived else Comment
+        return model.objects.filter(issue=issue).select_related('author', 'issue')
+
+    def get_detail_queryset(self):
+        """Chaîne complète Commentaire → Issue → Projet + appartenance en une requête"""
+        return (
+            Comment.objects.select_related('issue__project', 'author')
+            .annotate(is_contributor=Exists(self._membership('issue__project_id')))
+            .filter(
+                issue_id=self.kwargs.get('issue_pk'),
+                issue__project_id=self.kwargs.get('project_pk')
+            )
+        )
+
+    def get_archived_detail_queryset(self):
+        """Commentaire archivé de l'URL, vérifié sur la même chaîne parente"""
+        return (
+            ArchivedComment.objects.select_related('issue__project', 'author')
+            .annotate(is_contributor=Exists(self._membership('issue__project_id')))
+            .filter(
+                issue_id=self.kwargs.get('issue_pk'),
+                issue__project_id=self.kwargs.get('project_pk')
+            )
+        )
+
+    def get_parents(self, obj):
+        return obj.issue.project, obj.issue
+
+    def get_serializer_class(self):
+        if self.kwargs.get('issue_pk') is not None and self.get_parent_issue().is_archived:
+            return ArchivedCommentSerializer
+        return super().get_serializer_class()
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
 
     def get_serializer_context(self):
         """
-        Ajoute l'issue au contexte du serializer
+        Ajoute l'issue (déjà résolue et vérifiée dans le projet) au contexte du serializer
         """
         context = super().get_serializer_context()
-        issue_id = self.kwargs.get('issue_pk')
-        if issue_id:
-            context['issue'] = get_object_or_404(Issue, id=issue_id)
+        if self.kwargs.get('issue_pk'):
+            context['issue'] = self.get_parent_issue()
         return context
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Mes issues",
+        description=(
+            "Issues assignées à l'utilisateur ou dont il est l'auteur, "
+            "dans tous les projets auxquels il contribue encore"
+        ),
+        parameters=[
+            OpenApiParameter('role', str, enum=['assigned', 'authored'],
+                             description="Limiter aux issues assignées ou créées (par défaut : les deux)"),
+            OpenApiParameter('status', str, description="Filtrer par statut"),
+            OpenApiParameter('priority', str, description="Filtrer par priorité"),
+        ],
+        tags=["Issues"]
+    )
+)
+class MyIssuesView(generics.ListAPIView):
+    """
+    Vue listant le travail de l'utilisateur connecté sur l'ensemble de ses projets
+    """
+    serializer_class = IssueSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = CreatedTimeCursorPagination
+
+    def get_queryset(self):
+        """
+        Une seule requête : jointure sur les contributeurs pour exclure
+        les projets que l'utilisateur a quittés. Avec des partitions, la même
+        requête est lancée sur chaque base où l'utilisateur contribue (d'après
+        l'annuaire), et les pages fusionnées par date de création et identifiant.
+        """
+        user = self.request.user
+        role = self.request.query_params.get('role')
+        if role == 'assigned':
+            ownership = Q(assignee=user)
+        elif role == 'authored':
+            ownership = Q(author=user)
+        else:
+            ownership = Q(assignee=user) | Q(author=user)
+
+        queryset = Issue.objects.filter(
+            ownership,
+            project__contributors__user=user
+        ).select_related('project', 'author', 'assignee').annotate(num_comments=Count('comments'))
+
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+        priority = self.request.query_params.get('priority')
+        if priority:
+            queryset = queryset.filter(priority=priority)
+
+        if not sharding_enabled():
+            return queryset
+        grouped = group_by_shard(Membership.objects.filter(user=user).values_list('location_id', flat=True))
+        return MergedQuerySet({
+            alias: queryset.using(alias).filter(project_id__in=project_ids)
+            for alias, project_ids in grouped.items()
+        })
+
+
+class BatchRetrieveView(generics.GenericAPIView):
+    """
+    Récupération groupée d'objets par identifiants (?ids=1,2,3) : une seule
+    requête charge les objets, leurs relations et l'appartenance de
+    l'utilisateur au projet de chacun. La réponse est indexée par
+    identifiant ; les objets absents ou hors des projets de l'utilisateur
+    sont signalés individuellement (404 / 403) sans faire échouer le lot.
+
+    Les sous-classes définissent get_queryset(), project_field (chemin vers
+    le projet) et parse_id().
+    """
+    permission_classes = [IsAuthenticated]
+    project_field = None
+
+    def parse_id(self, value):
+        raise NotImplementedError
+
+    def get_ids(self):
+        """Identifiants demandés, dédoublonnés et dans l'ordre ; ValidationError si invalides"""
+        raw = [
+            value.strip()
+            for param in self.request.query_params.getlist('ids')
+            for value in param.split(',') if value.strip()
+        ]
+        if not raw:
+            raise ValidationError({'ids': "Paramètre requis (identifiants séparés par des virgules)."})
+        if len(raw) > settings.BATCH_MAX_IDS:
+            raise ValidationError({'ids': f"Au plus {settings.BATCH_MAX_IDS} identifiants par requête."})
+        try:
+            return list(dict.fromkeys(self.parse_id(value) for value in raw))
+        except (TypeError, ValueError):
+            raise ValidationError({'ids': "Identifiant invalide."})
+
+    def load_objects(self, ids):
+        """
+        {identifiant: objet} annoté de l'appartenance de l'utilisateur ; avec
+        des partitions, la requête part en parallèle sur celles où il contribue
+        """
+        membership = Contributor.objects.filter(project=OuterRef(self.project_field), user=self.request.user)
+        queryset = self.get_queryset().annotate(is_contributor=Exists(membership)).filter(pk__in=ids)
+        if not sharding_enabled():
+            return {obj.pk: obj for obj in queryset}
+        results = fan_out(lambda alias: list(queryset.using(alias)), user_shards(self.request.user.id))
+        return {obj.pk: obj for objects in results.values() for obj in objects}
+
+    def get(self, request, *args, **kwargs):
+        ids = self.get_ids()
+        objects = self.load_objects(ids)
+
+        readable = [objects[pk] for pk in ids if pk in objects and objects[pk].is_contributor]
+        data = dict(zip(
+            (obj.pk for obj in readable),
+            self.get_serializer(readable, many=True).data
+        ))
+
+        results = {}
+        for pk in ids:
+            if pk in data:
+                results[str(pk)] = {'status': status.HTTP_200_OK, 'data': data[pk]}
+            elif pk in objects:
+                results[str(pk)] = {
+                    'status': status.HTTP_403_FORBIDDEN,
+                    'detail': "Vous n'êtes pas contributeur de ce projet."
+                }
+            else:
+                results[str(pk)] = {'status': status.HTTP_404_NOT_FOUND, 'detail': "Ressource introuvable."}
+        return Response({'results': results})
+
+
+BATCH_IDS_PARAMETER = OpenApiParameter(
+    'ids', str, required=True,
+    description="Identifiants séparés par des virgules (au plus BATCH_MAX_IDS)"
+)
+BATCH_RESPONSE_DESCRIPTION = (
+    "{'results': {id: {'status': 200, 'data': {...}} | {'status': 403|404, 'detail': '...'}}}"
+)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Issues par lot",
+        description="Récupérer plusieurs issues, tous projets confondus, en une requête",
+        parameters=[BATCH_IDS_PARAMETER],
+        responses={200: OpenApiResponse(OpenApiTypes.OBJECT, description=BATCH_RESPONSE_DESCRIPTION)},
+        tags=["Issues"]
+    )
+)
+class IssueBatchView(BatchRetrieveView):
+    """
+    Vue de récupération groupée des issues
+    """
+    serializer_class = IssueSerializer
+    project_field = 'project_id'
+
+    def parse_id(self, value):
+        pk = int(value)
+        # Hors des bornes d'un BIGINT, la requête SQL lèverait OverflowError
+        if not 1 <= pk <= 2 ** 63 - 1:
+            raise ValueError(value)
+        return pk
+
+    def get_queryset(self):
+        return Issue.objects.select_related('project', 'author', 'assignee').annotate(
+            num_comments=Count('comments')
+        )
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Commentaires par lot",
+        description="Récupérer plusieurs commentaires, tous projets confondus, en une requête",
+        parameters=[BATCH_IDS_PARAMETER],
+        responses={200: OpenApiResponse(OpenApiTypes.OBJECT, description=BATCH_RESPONSE_DESCRIPTION)},
+        tags=["Commentaires"]
+    )
+)
+class CommentBatchView(BatchRetrieveView):
+    """
+    Vue de récupération groupée des commentaires
+    """
+    serializer_class = CommentSerializer
+    project_field = 'issue__project_id'
+
+    def parse_id(self, value):
+        return uuid.UUID(value)
+
+    def get_queryset(self):
+        return Comment.objects.select_related('issue', 'author')
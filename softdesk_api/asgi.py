@@ -14,3 +14,11 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'softdesk_api.settings')
 
 application = get_asgi_application()
+
+# Mode préchargement (PRELOAD_APP, ex. gunicorn --preload) : voir core/startup.py
+from django.conf import settings  # noqa: E402
+
+if settings.PRELOAD_APP:
+    from core.startup import preload
+
+    preload()
@@ -10,8 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -29,11 +30,20 @@ DEBUG = True
 
 ALLOWED_HOSTS = []
 
+# Démarrage : l'administration et les routes de documentation de l'API (schéma,
+# Swagger, Redoc) ne sont chargées que si elles sont activées. drf-spectacular reste
+# importé par les annotations des vues (extend_schema) ; sans documentation, seuls
+# ses vues et la génération du schéma sont évitées. PRELOAD_APP charge tout au
+# démarrage du processus (gunicorn --preload) au lieu de la première requête
+ENABLE_ADMIN = config('ENABLE_ADMIN', default=True, cast=bool)
+ENABLE_API_DOCS = config('ENABLE_API_DOCS', default=DEBUG, cast=bool)
+PRELOAD_APP = config('PRELOAD_APP', default=False, cast=bool)
+
 
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    *(['django.contrib.admin'] if ENABLE_ADMIN else []),
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -44,20 +54,26 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
     'corsheaders',
-    'drf_spectacular',
+    *(['drf_spectacular'] if ENABLE_API_DOCS else []),
     
     # Local apps
+    'core',
+    'jobs',
     'accounts',
     'projects',
+    'notifications',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'core.middleware.LoadSheddingMiddleware',
+    'core.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -86,12 +102,83 @@ WSGI_APPLICATION = 'softdesk_api.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Profil choisi par DB_ENGINE : 'sqlite' (par défaut) ou 'postgresql'.
+# Les connexions sont persistantes (CONN_MAX_AGE) et vérifiées avant réutilisation.
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+DB_CONN_HEALTH_CHECKS = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='softdesk'),
+            'USER': config('DB_USER', default='softdesk'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+            'OPTIONS': {
+                'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+            },
+        }
     }
-}
+    # Connexions mutualisées via PgBouncer (pool en mode transaction) :
+    # DB_HOST/DB_PORT pointent vers PgBouncer, les curseurs serveur sont désactivés
+    if config('DB_POOL', default=False, cast=bool):
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+        }
+    }
+
+# Réplicas en lecture (DB_REPLICAS : fichiers SQLite ou hôtes PostgreSQL séparés par des virgules).
+# Les lectures des applications accounts et projects y sont routées (core/routers.py).
+DATABASE_REPLICAS = []
+for index, replica in enumerate(config('DB_REPLICAS', default='', cast=Csv()), start=1):
+    alias = f'replica_{index}'
+    location = {'HOST': replica} if DB_ENGINE == 'postgresql' else {'NAME': replica}
+    DATABASES[alias] = dict(DATABASES['default'], **location, TEST={'MIRROR': 'default'})
+    DATABASE_REPLICAS.append(alias)
+
+# Partitionnement horizontal (DB_SHARDS : fichiers SQLite ou hôtes PostgreSQL séparés
+# par des virgules). Les données d'un projet (projet, contributeurs, issues,
+# commentaires) vivent sur une seule base, choisie à sa création et déplaçable par
+# la commande rebalance_shards ; l'annuaire projet -> base et utilisateur -> projets
+# reste sur la base principale, qui est elle-même la première partition.
+DATABASE_SHARDS = []
+for index, shard in enumerate(config('DB_SHARDS', default='', cast=Csv()), start=1):
+    alias = f'shard_{index}'
+    location = {'HOST': shard} if DB_ENGINE == 'postgresql' else {'NAME': shard}
+    DATABASES[alias] = dict(DATABASES['default'], **location)
+    DATABASE_SHARDS.append(alias)
+if DATABASE_SHARDS:
+    DATABASE_SHARDS.insert(0, 'default')
+
+DATABASE_ROUTERS = ['core.routers.ShardRouter', 'core.routers.ReplicaRouter']
+
+# Identifiants réservés par bloc (projets, issues, contributeurs) quand les données
+# sont partitionnées, et nombre de bases interrogées en parallèle
+SHARD_ID_BLOCK_SIZE = config('SHARD_ID_BLOCK_SIZE', default=100, cast=int)
+SHARD_FANOUT_WORKERS = config('SHARD_FANOUT_WORKERS', default=8, cast=int)
+
+# Après une écriture, l'utilisateur lit sur la base principale pendant ce délai (secondes).
+# Le marqueur vit dans le cache : avec DB_REPLICAS, REDIS_URL est exigé (core/checks.py)
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=5, cast=int)
+
+# PRAGMA appliqués à chaque connexion SQLite (voir core/db.py)
+SQLITE_PRAGMAS = {
+    'journal_mode': config('SQLITE_JOURNAL_MODE', default='WAL'),
+    'synchronous': config('SQLITE_SYNCHRONOUS', default='NORMAL'),
+    'busy_timeout': config('SQLITE_BUSY_TIMEOUT_MS', default=5000, cast=int),
+    'mmap_size': config('SQLITE_MMAP_SIZE', default=134217728, cast=int),
+} if config('SQLITE_TUNING', default=True, cast=bool) else {}
 
 
 # Password validation
@@ -113,6 +200,82 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Cache
+# Cache partagé Redis si REDIS_URL est défini (limitation de débit, statistiques,
+# lecture de ses écritures), sinon cache mémoire propre à chaque processus
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Durée de cache des statistiques de projets (secondes). Elles sont invalidées à
+# chaque écriture, mais seulement dans un cache partagé : sans REDIS_URL, les autres
+# processus servent leur copie jusqu'à expiration, d'où une durée courte par défaut
+PROJECT_STATS_CACHE_TIMEOUT = config('PROJECT_STATS_CACHE_TIMEOUT', default=300 if REDIS_URL else 10, cast=int)
+
+# Cache, propre à chaque processus, des utilisateurs imbriqués dans les réponses
+# (accounts/summaries.py) : nombre d'entrées et durée de validité (secondes) quand
+# la ligne de l'utilisateur n'est pas relue
+USER_SUMMARY_CACHE_SIZE = config('USER_SUMMARY_CACHE_SIZE', default=2048, cast=int)
+USER_SUMMARY_CACHE_TTL = config('USER_SUMMARY_CACHE_TTL', default=60, cast=int)
+
+# Délestage (core/middleware.py) : requêtes simultanées par processus, latence SQL
+# moyenne tolérée (ms) et délai Retry-After (secondes) des réponses 503
+LOAD_SHEDDING_ENABLED = config('LOAD_SHEDDING_ENABLED', default=True, cast=bool)
+LOAD_SHEDDING_MAX_IN_FLIGHT = config('LOAD_SHEDDING_MAX_IN_FLIGHT', default=64, cast=int)
+LOAD_SHEDDING_MAX_DB_LATENCY_MS = config('LOAD_SHEDDING_MAX_DB_LATENCY_MS', default=250, cast=float)
+LOAD_SHEDDING_RETRY_AFTER = config('LOAD_SHEDDING_RETRY_AFTER', default=5, cast=int)
+
+# Compression des réponses (core/compression.py) : encodages par ordre de préférence
+# (br et zstd nécessitent les paquets optionnels brotli et zstandard), taille
+# minimale en octets et niveaux de compression
+COMPRESSION_ENCODINGS = config('COMPRESSION_ENCODINGS', default='br,zstd,gzip', cast=Csv())
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=512, cast=int)
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=4, cast=int)
+COMPRESSION_ZSTD_LEVEL = config('COMPRESSION_ZSTD_LEVEL', default=3, cast=int)
+
+
+# Password hashing
+# PASSWORD_HASHER choisit le hacheur des nouveaux mots de passe : pbkdf2, scrypt ou
+# argon2 (pip install argon2-cffi). Les autres restent acceptés pour la vérification
+# et les mots de passe sont rehachés à la connexion si l'algorithme ou ses paramètres changent.
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='pbkdf2')
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'accounts.hashers.TunedPBKDF2PasswordHasher',
+    'scrypt': 'accounts.hashers.TunedScryptPasswordHasher',
+    'argon2': 'accounts.hashers.TunedArgon2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+PASSWORD_PBKDF2_ITERATIONS = config('PASSWORD_PBKDF2_ITERATIONS', default=600000, cast=int)
+PASSWORD_SCRYPT_WORK_FACTOR = config('PASSWORD_SCRYPT_WORK_FACTOR', default=2 ** 14, cast=int)
+PASSWORD_SCRYPT_BLOCK_SIZE = config('PASSWORD_SCRYPT_BLOCK_SIZE', default=8, cast=int)
+PASSWORD_SCRYPT_PARALLELISM = config('PASSWORD_SCRYPT_PARALLELISM', default=1, cast=int)
+PASSWORD_ARGON2_TIME_COST = config('PASSWORD_ARGON2_TIME_COST', default=2, cast=int)
+PASSWORD_ARGON2_MEMORY_COST = config('PASSWORD_ARGON2_MEMORY_COST', default=19456, cast=int)
+PASSWORD_ARGON2_PARALLELISM = config('PASSWORD_ARGON2_PARALLELISM', default=1, cast=int)
+
+# Limiteur du hachage (accounts/hashing.py) : calculs simultanés par processus,
+# calculs en attente tolérés, et attente maximale (secondes) avant une réponse 503
+PASSWORD_HASHING_WORKERS = config('PASSWORD_HASHING_WORKERS', default=os.cpu_count() or 1, cast=int)
+PASSWORD_HASHING_MAX_PENDING = config('PASSWORD_HASHING_MAX_PENDING', default=16, cast=int)
+PASSWORD_HASHING_WAIT = config('PASSWORD_HASHING_WAIT', default=5, cast=float)
+
+AUTHENTICATION_BACKENDS = ['accounts.backends.PooledHashingBackend']
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -149,6 +312,12 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Seaux à jetons (core/throttling.py) par throttle_scope des vues
+    'DEFAULT_THROTTLE_RATES': {
+        'login': config('THROTTLE_LOGIN', default='10/min'),
+        'register': config('THROTTLE_REGISTER', default='5/hour'),
+        'writes': config('THROTTLE_WRITES', default='120/min'),
+    },
 }
 
 # JWT Configuration
@@ -171,6 +340,61 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:3000",
 ]
 
+# Nombre maximal d'identifiants par requête des endpoints de lecture groupée
+BATCH_MAX_IDS = config('BATCH_MAX_IDS', default=100, cast=int)
+
+# Administration (core/admin.py) : au-delà de ce nombre de lignes, les listes
+# affichent un nombre de résultats estimé au lieu d'un COUNT(*) exact
+ADMIN_EXACT_COUNT_LIMIT = config('ADMIN_EXACT_COUNT_LIMIT', default=10000, cast=int)
+
+# Clés d'idempotence (core/idempotency.py) : durée de conservation des réponses,
+# délai au-delà duquel une requête en cours est considérée comme abandonnée, et
+# attente maximale d'une requête concurrente portant la même clé (secondes)
+IDEMPOTENCY_TTL = config('IDEMPOTENCY_TTL', default=86400, cast=int)
+IDEMPOTENCY_LOCK_TIMEOUT = config('IDEMPOTENCY_LOCK_TIMEOUT', default=60, cast=int)
+IDEMPOTENCY_WAIT = config('IDEMPOTENCY_WAIT', default=10, cast=int)
+
+# Taille des lots de suppression (effacement de compte, suppression de projet)
+DELETION_CHUNK_SIZE = config('DELETION_CHUNK_SIZE', default=1000, cast=int)
+
+# Identifiants des nouveaux commentaires : UUIDv7 (ordonnés dans le temps, insertions
+# en fin d'index) ou UUIDv4 aléatoires. Les identifiants existants restent valides.
+COMMENT_TIME_ORDERED_IDS = config('COMMENT_TIME_ORDERED_IDS', default=True, cast=bool)
+
+# Archivage (commande archive_issues) : les issues terminées sans activité depuis
+# ce nombre de jours sont déplacées, avec leurs commentaires, vers les tables d'archive
+ARCHIVE_AFTER_DAYS = config('ARCHIVE_AFTER_DAYS', default=180, cast=int)
+
+# Détection des doublons (projects/similarity.py) : similarité de Jaccard minimale
+# entre les textes de deux issues, et nombre d'issues proches renvoyées
+ISSUE_SIMILARITY_THRESHOLD = config('ISSUE_SIMILARITY_THRESHOLD', default=0.5, cast=float)
+ISSUE_SIMILARITY_MAX_RESULTS = config('ISSUE_SIMILARITY_MAX_RESULTS', default=5, cast=int)
+
+# E-mails (résumés de notifications, commande send_digests) : backend console par
+# défaut ; django.core.mail.backends.smtp.EmailBackend avec EMAIL_HOST... en production
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=25, cast=int)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=False, cast=bool)
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='SoftDesk <noreply@softdesk.local>')
+
+# Résumés : destinataires par lot (quelques requêtes chacun), événements détaillés
+# par résumé (les autres sont comptés) et messages envoyés par connexion
+DIGEST_BATCH_SIZE = config('DIGEST_BATCH_SIZE', default=500, cast=int)
+DIGEST_MAX_ITEMS = config('DIGEST_MAX_ITEMS', default=20, cast=int)
+DIGEST_EMAILS_PER_CONNECTION = config('DIGEST_EMAILS_PER_CONNECTION', default=100, cast=int)
+
+# File de tâches (commande run_worker) : au-delà de ce nombre d'issues dans la
+# cascade, la suppression d'un projet ou d'un compte part en arrière-plan (0 : jamais)
+ASYNC_DELETION_THRESHOLD = config('ASYNC_DELETION_THRESHOLD', default=500, cast=int)
+JOBS_MAX_ATTEMPTS = config('JOBS_MAX_ATTEMPTS', default=3, cast=int)
+JOBS_RETRY_DELAY = config('JOBS_RETRY_DELAY', default=30, cast=int)
+# Bail d'une tâche en cours (secondes) : prolongé pendant l'exécution, il expire si
+# le worker s'arrête brutalement et la tâche est alors reprise par un autre worker
+JOBS_LEASE_TIMEOUT = config('JOBS_LEASE_TIMEOUT', default=300, cast=int)
+
 # DRF Spectacular Configuration
 SPECTACULAR_SETTINGS = {
     'TITLE': 'SoftDesk Support API',
@@ -178,3 +402,8 @@ SPECTACULAR_SETTINGS = {
     'VERSION': '1.0.0',
     'SERVE_INCLUDE_SCHEMA': False,
 }
+
+# Schéma OpenAPI précalculé (core/schema.py, commande build_schema), régénéré
+# quand SCHEMA_CODE_VERSION (ou l'empreinte des sources) change
+SCHEMA_CACHE_DIR = config('SCHEMA_CACHE_DIR', default=str(BASE_DIR / '.schema_cache'))
+SCHEMA_CODE_VERSION = config('SCHEMA_CODE_VERSION', default='')
@@ -0,0 +1,16 @@
+"""
+Réglages des tests (python manage.py test) : ceux du projet, plus des bases
+déclarées mais inactives. Les tests du routage et du partitionnement les
+activent avec override_settings (DATABASE_REPLICAS, DATABASE_SHARDS) sans
+changer le routage des autres tests.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, DB_ENGINE
+
+# Réplica : miroir de la base de test principale (mêmes données, autre connexion)
+DATABASES.setdefault('replica_1', dict(DATABASES['default'], TEST={'MIRROR': 'default'}))
+
+# Partitions : bases de test distinctes (SQLite en mémoire, nommées d'après l'alias)
+for alias in ('shard_1', 'shard_2'):
+    test = {'NAME': f'test_softdesk_{alias}'} if DB_ENGINE == 'postgresql' else {}
+    DATABASES.setdefault(alias, dict(DATABASES['default'], TEST=test))
@@ -14,21 +14,29 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
-from drf_spectacular.views import (
-    SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
-)
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
-    
-    # API Documentation
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
-    
     # API endpoints
     path('api/', include('accounts.urls')),
     path('api/', include('projects.urls')),
+    path('api/', include('jobs.urls')),
 ]
+
+# Administration et documentation importées seulement si elles sont activées
+if settings.ENABLE_ADMIN:
+    from django.contrib import admin
+
+    urlpatterns.append(path('admin/', admin.site.urls))
+
+if settings.ENABLE_API_DOCS:
+    from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+    from core.schema import CachedSchemaView
+
+    urlpatterns += [
+        # API Documentation
+        path('api/schema/', CachedSchemaView.as_view(), name='schema'),
+        path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+        path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    ]